@@ -2,7 +2,7 @@
 API 모델 정의 (Pydantic)
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -13,7 +13,9 @@ class SlideModel(BaseModel):
     title: Optional[str] = None
     content: str
     imageUrls: List[str] = Field(default_factory=list)
+    frameUrls: Dict[str, str] = Field(default_factory=dict)  # 1080p/720p/thumbnail 래스터 프레임
     notes: Optional[str] = None
+    contentHash: Optional[str] = None  # 슬라이드 XML + 관련 파트 해시 (증분 재파싱용)
 
 
 class MetadataModel(BaseModel):
@@ -23,6 +25,22 @@ class MetadataModel(BaseModel):
     createdAt: Optional[str] = None
 
 
+class DeckChangesModel(BaseModel):
+    """이전 버전 덱 대비 슬라이드 변경 내역"""
+    previousProjectId: str
+    slides: Dict[str, str] = Field(default_factory=dict)  # slideId -> unchanged/changed/added
+    reused: Dict[str, str] = Field(default_factory=dict)  # 새 slideId -> 이전 slideId
+    removed: List[str] = Field(default_factory=list)  # 이전 덱에만 있던 slideId
+
+
+class ImageReportModel(BaseModel):
+    """파싱 시 이미지 정규화 통계"""
+    converted: int = 0  # sRGB PNG/JPEG로 변환/축소된 이미지 수
+    passthrough: int = 0  # 변환 없이 그대로 저장된 이미지 수
+    cached: int = 0  # 이전 변환 결과를 재사용한 이미지 수
+    skipped: List[Dict[str, str]] = Field(default_factory=list)  # 지원하지 않는 형식 등 (source, reason)
+
+
 class ParsePptResponse(BaseModel):
     """PPT 파싱 응답"""
     projectId: str
@@ -30,6 +48,9 @@ class ParsePptResponse(BaseModel):
     slides: List[SlideModel]
     extractedText: str
     metadata: MetadataModel
+    changes: Optional[DeckChangesModel] = None
+    imageReport: Optional[ImageReportModel] = None  # 전체 파싱 모드에서만
+    rasterizeFailed: List[int] = Field(default_factory=list)  # 프레임 생성에 실패한 슬라이드 번호
 
 
 class HealthCheckResponse(BaseModel):
@@ -5,28 +5,103 @@ PPT 파싱 라우터
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from fastapi.responses import JSONResponse
 import uuid
-from app.services.ppt_parser import parse_ppt_file
-from app.models import ParsePptResponse, SlideModel, MetadataModel
+from pathlib import Path
+from app.services.upload_spool import spool_upload, UploadTooLargeError
+from app.services.disk_cache import get_disk_cache, make_cache_key
+from app.services.ppt_parser import PARSER_VERSION, PARSE_MODES
+from app.services.parse_engine import (
+    get_parse_engine,
+    ParseTimeoutError,
+    ParseWorkerCrashedError,
+)
+from app.models import ParsePptResponse, SlideModel, MetadataModel, DeckChangesModel, ImageReportModel
 from datetime import datetime
+from typing import Any, Dict, List, Optional
 
 
 router = APIRouter(prefix="/api", tags=["ppt"])
 
+# 업로드 허용 크기 (main.py의 UploadSizeLimitMiddleware도 이 값으로 본문을 제한)
+MAX_UPLOAD_SIZE = 100 * 1024 * 1024
+
 
 def _log(level: str, step: str, message: str):
     timestamp = datetime.utcnow().isoformat()
     print(f"[{timestamp}] [PPT] [{level}] [{step}] {message}")
 
 
+def _diff_slides(
+    previous_project_id: str,
+    previous_slides: List[Dict[str, Any]],
+    slides: List[SlideModel],
+) -> DeckChangesModel:
+    """내용 해시로 이전 버전 덱과 슬라이드별 변경 여부 비교"""
+    # 해시 -> 아직 짝지어지지 않은 이전 slideId 목록 (같은 슬라이드가 여러 장일 수 있음)
+    previous_by_hash: Dict[str, List[str]] = {}
+    for previous in previous_slides:
+        content_hash = previous.get("contentHash")
+        if content_hash:
+            previous_by_hash.setdefault(content_hash, []).append(previous["slideId"])
+    previous_numbers = {previous.get("slideNumber") for previous in previous_slides}
+
+    changes = DeckChangesModel(previousProjectId=previous_project_id)
+    matched = set()
+    for slide in slides:
+        candidates = previous_by_hash.get(slide.contentHash or "", [])
+        if candidates:
+            previous_slide_id = candidates.pop(0)
+            matched.add(previous_slide_id)
+            changes.slides[slide.slideId] = "unchanged"
+            changes.reused[slide.slideId] = previous_slide_id
+        elif slide.slideNumber in previous_numbers:
+            changes.slides[slide.slideId] = "changed"
+        else:
+            changes.slides[slide.slideId] = "added"
+
+    # 재사용되지도, 같은 위치의 새 슬라이드로 대체되지도 않은 이전 슬라이드
+    current_numbers = {slide.slideNumber for slide in slides}
+    changes.removed = [
+        previous["slideId"]
+        for previous in previous_slides
+        if previous["slideId"] not in matched and previous.get("slideNumber") not in current_numbers
+    ]
+    return changes
+
+
 @router.post("/parse-ppt")
-async def parse_ppt(file: UploadFile = File(...)) -> JSONResponse:
+async def parse_ppt(
+    file: UploadFile = File(...),
+    mode: str = "full",
+    previousProjectId: Optional[str] = None,
+) -> JSONResponse:
     """
     PPT 파일 파싱 엔드포인트
     
     파일을 업로드하면 슬라이드, 텍스트, 이미지를 추출합니다.
+    mode=text 이면 이미지 없이 제목/본문/노트만 빠르게 추출합니다.
+    previousProjectId를 주면 이전 버전 덱과 비교하여 변경되지 않은 슬라이드의
+    스크립트/음성을 새 프로젝트에서 재사용할 수 있도록 변경 내역을 기록합니다.
     """
     try:
-        _log("MINOR", "START", f"filename={file.filename or 'unknown'}")
+        _log("MINOR", "START", f"filename={file.filename or 'unknown'} mode={mode}")
+
+        if mode not in PARSE_MODES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"유효하지 않은 파싱 모드입니다. {', '.join(PARSE_MODES)} 중 선택해주세요"
+            )
+
+        # 이전 버전 프로젝트 확인 (증분 재파싱)
+        previous_slides: List[Dict[str, Any]] = []
+        if previousProjectId:
+            from main import get_stage_result
+            previous_parsing = get_stage_result(previousProjectId, "parsing")
+            if not previous_parsing or previous_parsing.get("status") != "completed":
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"이전 프로젝트의 파싱 결과를 찾을 수 없습니다: {previousProjectId}"
+                )
+            previous_slides = (previous_parsing.get("data") or {}).get("slides", [])
 
         # 파일 타입 검증
         if not file.filename:
@@ -38,16 +113,15 @@ async def parse_ppt(file: UploadFile = File(...)) -> JSONResponse:
                 detail="PPT 파일만 업로드 가능합니다"
             )
         
-        # 파일 읽기
-        file_content = await file.read()
-        
-        # 파일 크기 검증 (100MB)
-        max_size = 100 * 1024 * 1024
-        if len(file_content) > max_size:
-            raise HTTPException(
-                status_code=413,
-                detail=f"파일이 너무 큽니다 (최대 {max_size / 1024 / 1024}MB)"
+        # 파일을 임시 파일로 스트리밍 저장 (크기 초과 시 즉시 중단, 100MB)
+        try:
+            upload = await spool_upload(
+                file,
+                MAX_UPLOAD_SIZE,
+                suffix=Path(file.filename).suffix.lower(),
             )
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
         
         # 프로젝트 ID 생성 (파싱 전에 생성하여 진행도 추적 가능)
         project_id = f"proj_{uuid.uuid4().hex[:12]}"
@@ -62,14 +136,69 @@ async def parse_ppt(file: UploadFile = File(...)) -> JSONResponse:
             details="PPT 파일 분석 중..."
         )
         
-        # PPT 파싱
-        parse_result = parse_ppt_file(file_content)
+        # 같은 파일을 이미 파싱했다면 캐시된 결과 사용 (내용 해시 기준)
+        parse_cache = get_disk_cache("parse", default_max_mb=256)
+        cache_key = make_cache_key(upload.sha256, mode, PARSER_VERSION)
+        parse_result = parse_cache.get_json(cache_key)
+        cache_hit = parse_result is not None
+
+        if cache_hit:
+            upload.cleanup()
+            _log("MINOR", "CACHE_HIT", f"sha256={upload.sha256[:12]}")
+        else:
+            # PPT 파싱 (프로세스 풀에서 실행하여 이벤트 루프 블로킹 방지)
+            try:
+                parse_result = await get_parse_engine().parse(
+                    str(upload.path),
+                    mode=mode,
+                    on_progress=lambda current, total, details: update_project_progress(
+                        project_id, "parsing", current=current, total=total, details=details
+                    ),
+                )
+            except ParseTimeoutError as e:
+                raise HTTPException(status_code=504, detail=str(e))
+            except ParseWorkerCrashedError as e:
+                raise HTTPException(status_code=500, detail=str(e))
+            finally:
+                upload.cleanup()
         
         if not parse_result.get("success"):
             raise HTTPException(
                 status_code=400,
                 detail=f"PPT 파싱 실패: {parse_result.get('error', 'Unknown error')}"
             )
+
+        # 슬라이드 래스터화 (프로세스 풀, 같은 내용의 슬라이드는 기존 프레임 재사용)
+        # 프레임 URL은 파싱 결과와 함께 캐시되므로 캐시 적중 시에는 프레임이 없는 슬라이드만 다시 시도
+        parsed_slides = parse_result.get("slides", [])
+        rasterized = False
+        rasterize_failed: List[int] = []
+        if mode == "full" and any(
+            s.get("layout") and not s.get("frameUrls") for s in parsed_slides
+        ):
+            update_project_progress(
+                project_id,
+                "parsing",
+                current=0,
+                total=len(parsed_slides),
+                details="슬라이드 이미지 생성 중..."
+            )
+            frame_urls, failed = await get_parse_engine().rasterize(
+                [None if s.get("frameUrls") else s.get("layout") for s in parsed_slides],
+                on_progress=lambda current, total, details: update_project_progress(
+                    project_id, "parsing", current=current, total=total, details=details
+                ),
+            )
+            for slide_data, frames in zip(parsed_slides, frame_urls):
+                if frames:
+                    slide_data["frameUrls"] = frames
+            rasterize_failed = [parsed_slides[index]["slideNumber"] for index in failed]
+            if rasterize_failed:
+                _log("WARNING", "RASTERIZE", f"failed slides={rasterize_failed} (imageUrls로 대체)")
+            rasterized = True
+
+        if not cache_hit or rasterized:
+            parse_cache.put_json(cache_key, parse_result)
         
         # 슬라이드 모델 생성
         slides = [
@@ -79,10 +208,18 @@ async def parse_ppt(file: UploadFile = File(...)) -> JSONResponse:
                 title=s.get("title"),
                 content=s.get("content", ""),
                 imageUrls=s.get("imageUrls", []),
+                frameUrls=s.get("frameUrls", {}),
                 notes=s.get("notes"),
+                contentHash=s.get("contentHash"),
             )
-            for s in parse_result.get("slides", [])
+            for s in parsed_slides
         ]
+
+        changes = None
+        if previousProjectId:
+            changes = _diff_slides(previousProjectId, previous_slides, slides)
+            unchanged = sum(1 for status in changes.slides.values() if status == "unchanged")
+            _log("MINOR", "DIFF", f"previous={previousProjectId} unchanged={unchanged}/{len(slides)}")
         
         # 파싱 완료 상태 업데이트
         update_project_progress(
@@ -98,6 +235,12 @@ async def parse_ppt(file: UploadFile = File(...)) -> JSONResponse:
             **parse_result.get("metadata", {})
         )
         
+        image_report = None
+        if parse_result.get("image_report") is not None:
+            image_report = ImageReportModel(**parse_result["image_report"])
+            if image_report.skipped:
+                _log("MINOR", "IMAGES", f"skipped={len(image_report.skipped)} (unsupported format)")
+        
         # 응답 생성
         response = ParsePptResponse(
             projectId=project_id,
@@ -105,6 +248,9 @@ async def parse_ppt(file: UploadFile = File(...)) -> JSONResponse:
             slides=slides,
             extractedText=parse_result.get("extracted_text", ""),
             metadata=metadata,
+            changes=changes,
+            imageReport=image_report,
+            rasterizeFailed=rasterize_failed,
         )
         
         # 파싱 결과 저장 (재개 시 사용)
@@ -116,13 +262,14 @@ async def parse_ppt(file: UploadFile = File(...)) -> JSONResponse:
             data=response.model_dump()
         )
         
-        _log("MAJOR", "DONE", f"projectId={project_id} slides={len(slides)}")
+        _log("MAJOR", "DONE", f"projectId={project_id} slides={len(slides)} cached={cache_hit}")
 
         return JSONResponse(
             status_code=200,
             content={
                 "success": True,
                 "data": response.model_dump(),
+                "cached": cache_hit,
                 "timestamp": __import__("datetime").datetime.utcnow().isoformat(),
             }
         )
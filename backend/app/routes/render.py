@@ -6,7 +6,7 @@ import os
 import asyncio
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import JSONResponse
@@ -30,6 +30,7 @@ class SlideItem(BaseModel):
     title: Optional[str] = None
     content: str
     imageUrls: List[str] = Field(default_factory=list)
+    frameUrls: Dict[str, str] = Field(default_factory=dict)
 
 
 class AudioItem(BaseModel):
@@ -2,13 +2,24 @@
 AI 스크립트 생성 라우터
 """
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from typing import List, Optional
+import json
+import os
 import uuid
 import asyncio
-from app.services.script_generator import generate_scripts
+from app.services.keyword_extractor import extract_keywords
+from app.services.llm_clients import get_provider_concurrency
+from app.services.script_generator import (
+    DEFAULT_SCRIPT_SOURCE,
+    SCRIPT_SOURCES,
+    create_deck_session,
+    generate_scripts,
+    resolve_script_provider,
+    resolve_slide_source,
+)
 from app.models import SlideModel
 from datetime import datetime
 
@@ -28,6 +39,12 @@ class GenerateScriptRequest(BaseModel):
     toneOfVoice: Optional[str] = Field(default="professional")
     language: Optional[str] = Field(default="ko")
     customInstructions: Optional[str] = None
+    # True이면 스크립트 캐시/이전 결과를 사용하지 않고 새로 생성
+    bypassCache: bool = False
+    # 한 번의 LLM 요청으로 생성할 슬라이드 수 (기본값 SCRIPT_BATCH_SIZE, 1이면 슬라이드별 요청)
+    batchSize: Optional[int] = Field(default=None, ge=1, le=20)
+    # 스크립트 출처 정책 (llm, notes, notes-then-llm, polish-notes, 기본값 SCRIPT_SOURCE)
+    scriptSource: Optional[str] = None
 
 
 class GeneratedScript(BaseModel):
@@ -37,6 +54,8 @@ class GeneratedScript(BaseModel):
     scriptText: str
     duration: Optional[int] = None
     keywords: Optional[List[str]] = None
+    # 실제 출처 (notes: 발표자 노트, polish: 노트 다듬기, llm: 새로 생성)
+    source: Optional[str] = None
 
 
 class GenerateScriptResponse(BaseModel):
@@ -44,30 +63,188 @@ class GenerateScriptResponse(BaseModel):
     projectId: str
     scripts: List[GeneratedScript]
     totalDuration: Optional[int] = None
+    toneOfVoice: Optional[str] = None
+    language: Optional[str] = None
+    scriptSource: Optional[str] = None
+    # 덱 전체 스크립트 기준 주요 키워드 (슬라이드별 키워드는 scripts[].keywords)
+    deckKeywords: List[str] = Field(default_factory=list)
+    reusedSlideIds: List[str] = Field(default_factory=list)
     generatedAt: str
 
 
+VALID_TONES = ["professional", "friendly", "casual"]
+VALID_LANGUAGES = ["ko", "en"]
+
+
+def _script_source(request: GenerateScriptRequest) -> str:
+    return request.scriptSource or os.getenv("SCRIPT_SOURCE") or DEFAULT_SCRIPT_SOURCE
+
+
+def _validate_request(request: GenerateScriptRequest) -> None:
+    """요청 검증 (실패 시 HTTPException)"""
+    if not request.projectId:
+        raise HTTPException(status_code=400, detail="projectId가 필요합니다")
+    
+    if not request.slides or len(request.slides) == 0:
+        raise HTTPException(status_code=400, detail="최소 1개 이상의 슬라이드가 필요합니다")
+    
+    # 톤 검증
+    if request.toneOfVoice not in VALID_TONES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"유효하지 않은 톤입니다. {', '.join(VALID_TONES)} 중 선택해주세요"
+        )
+    
+    # 언어 검증
+    if request.language not in VALID_LANGUAGES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"유효하지 않은 언어입니다. {', '.join(VALID_LANGUAGES)} 중 선택해주세요"
+        )
+    
+    # 스크립트 출처 검증
+    if _script_source(request) not in SCRIPT_SOURCES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"유효하지 않은 스크립트 출처입니다. {', '.join(SCRIPT_SOURCES)} 중 선택해주세요"
+        )
+
+
+def _completed_result(request: GenerateScriptRequest) -> Optional[dict]:
+    """이미 완료된 scripting 단계 결과 (재개 로직, bypassCache이면 무시)"""
+    from main import get_stage_result
+    cached_result = get_stage_result(request.projectId, "scripting")
+    if not request.bypassCache and cached_result and cached_result.get("status") == "completed":
+        return cached_result.get("data", {})
+    return None
+
+
+def _slide_data(request: GenerateScriptRequest) -> List[dict]:
+    """슬라이드 데이터 변환 (Pydantic 모델 -> Dictionary)"""
+    return [
+        {
+            "slideId": slide.slideId,
+            "slideNumber": slide.slideNumber,
+            "title": slide.title or f"Slide {slide.slideNumber}",
+            "content": slide.content,
+            "notes": slide.notes,
+        }
+        for slide in request.slides
+    ]
+
+
+def _reusable_scripts(request: GenerateScriptRequest) -> dict:
+    """증분 재파싱: 이전 버전에서 바뀌지 않은 슬라이드 중 같은 톤/언어/출처 정책의 기존 스크립트"""
+    if request.bypassCache:
+        return {}
+    from main import get_reusable_slide_results
+    script_source = _script_source(request)
+    return {
+        slide_id: item
+        for slide_id, item in get_reusable_slide_results(request.projectId, "scripting").items()
+        if item["_stageData"].get("toneOfVoice", request.toneOfVoice) == request.toneOfVoice
+        and item["_stageData"].get("language", request.language) == request.language
+        and item["_stageData"].get("scriptSource", DEFAULT_SCRIPT_SOURCE) == script_source
+    }
+
+
+def _reused_script(previous: dict, slide: dict) -> dict:
+    return {
+        **{key: value for key, value in previous.items() if key != "_stageData"},
+        "slideId": slide["slideId"],
+        "slideNumber": slide["slideNumber"],
+    }
+
+
+def _save_response(
+    request: GenerateScriptRequest,
+    scripts: List[dict],
+    reused_slide_ids: List[str],
+) -> GenerateScriptResponse:
+    """응답 생성 후 scripting 단계 결과로 저장 (재개 시 사용)"""
+    # 전체 시간 계산
+    total_duration = sum(s.get("duration", 0) for s in scripts)
+    # 키워드는 덱 전체 스크립트를 한 번에 분석 (슬라이드 간 IDF가 필요하므로 마지막에 계산)
+    slide_keywords, deck_keywords = extract_keywords([s["scriptText"] for s in scripts])
+    
+    response = GenerateScriptResponse(
+        projectId=request.projectId,
+        scripts=[
+            GeneratedScript(
+                slideId=s["slideId"],
+                slideNumber=s["slideNumber"],
+                scriptText=s["scriptText"],
+                duration=s.get("duration"),
+                keywords=keywords,
+                source=s.get("source"),
+            )
+            for s, keywords in zip(scripts, slide_keywords)
+        ],
+        totalDuration=total_duration,
+        toneOfVoice=request.toneOfVoice,
+        language=request.language,
+        scriptSource=_script_source(request),
+        deckKeywords=deck_keywords,
+        reusedSlideIds=reused_slide_ids,
+        generatedAt=datetime.utcnow().isoformat(),
+    )
+    
+    from main import save_stage_result
+    save_stage_result(
+        request.projectId,
+        "scripting",
+        "completed",
+        data=response.model_dump()
+    )
+    
+    _log("MAJOR", "DONE", f"duration={total_duration}s")
+    return response
+
+
+# 클라이언트 연결 끊김 확인 주기 (초)
+DISCONNECT_POLL_INTERVAL = 1.0
+
+
+class ClientDisconnected(Exception):
+    """생성 도중 클라이언트 연결이 끊김"""
+
+
+async def _cancel_on_disconnect(http_request: Request, coro):
+    """
+    클라이언트 연결이 끊기면 coro를 취소 (진행 중인 LLM 요청도 함께 중단)
+    
+    취소된 경우 ClientDisconnected를 발생시킵니다.
+    """
+    task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await http_request.is_disconnected():
+                task.cancel()
+                # 취소가 끝날 때까지 대기 (결과/예외는 버림)
+                await asyncio.gather(task, return_exceptions=True)
+                raise ClientDisconnected()
+    finally:
+        task.cancel()
+
+
 @router.post("/generate-script")
-async def generate_script(request: GenerateScriptRequest) -> JSONResponse:
+async def generate_script(request: GenerateScriptRequest, http_request: Request) -> JSONResponse:
     """
     AI 스크립트 생성 엔드포인트
     
     슬라이드 정보를 받아 IT 전문가 톤의 나레이션 스크립트를 생성합니다.
+    생성 도중 클라이언트가 연결을 끊으면 남은 LLM 요청을 취소합니다.
     """
     try:
-        # 입력 검증
-        if not request.projectId:
-            raise HTTPException(status_code=400, detail="projectId가 필요합니다")
-        
-        if not request.slides or len(request.slides) == 0:
-            raise HTTPException(status_code=400, detail="최소 1개 이상의 슬라이드가 필요합니다")
+        _validate_request(request)
         
         # 이미 완료된 단계인지 체크 (재개 로직)
-        from main import get_stage_result
-        cached_result = get_stage_result(request.projectId, "scripting")
-        if cached_result and cached_result.get("status") == "completed":
+        cached_data = _completed_result(request)
+        if cached_data is not None:
             _log("MINOR", "CACHE_HIT", f"projectId={request.projectId} - using cached scripts")
-            cached_data = cached_result.get("data", {})
             return JSONResponse(
                 status_code=200,
                 content={
@@ -78,32 +255,7 @@ async def generate_script(request: GenerateScriptRequest) -> JSONResponse:
                 }
             )
         
-        # 톤 검증
-        valid_tones = ["professional", "friendly", "casual"]
-        if request.toneOfVoice not in valid_tones:
-            raise HTTPException(
-                status_code=400,
-                detail=f"유효하지 않은 톤입니다. {', '.join(valid_tones)} 중 선택해주세요"
-            )
-        
-        # 언어 검증
-        valid_languages = ["ko", "en"]
-        if request.language not in valid_languages:
-            raise HTTPException(
-                status_code=400,
-                detail=f"유효하지 않은 언어입니다. {', '.join(valid_languages)} 중 선택해주세요"
-            )
-        
-        # 슬라이드 데이터 변환 (Pydantic 모델 -> Dictionary)
-        slide_data = [
-            {
-                "slideId": slide.slideId,
-                "slideNumber": slide.slideNumber,
-                "title": slide.title or f"Slide {slide.slideNumber}",
-                "content": slide.content,
-            }
-            for slide in request.slides
-        ]
+        slide_data = _slide_data(request)
         
         # 스크립트 생성
         _log("MINOR", "START", f"projectId={request.projectId} slides={len(slide_data)}")
@@ -111,58 +263,104 @@ async def generate_script(request: GenerateScriptRequest) -> JSONResponse:
         # 진행 상태 업데이트
         from main import update_project_progress
         
-        scripts = []
-        for idx, slide in enumerate(slide_data, 1):
-            # 진행 상태 업데이트
+        reusable = _reusable_scripts(request)
+        
+        # 슬라이드를 동시에 생성 (동시 LLM 요청 수는 공급자 한도로 제한)
+        provider = resolve_script_provider()
+        script_source = _script_source(request)
+        batch_size = request.batchSize or int(os.getenv("SCRIPT_BATCH_SIZE", "1"))
+        total = len(slide_data)
+        completed = 0
+        reused_slide_ids = []
+        results: List[Optional[dict]] = [None] * total
+        
+        def mark_completed(idx: int, message: str) -> None:
+            nonlocal completed
+            completed += 1
             update_project_progress(
                 request.projectId,
                 "scripting",
-                current=idx,
-                total=len(slide_data),
-                details=f"슬라이드 {idx}/{len(slide_data)} 처리 중..."
+                current=completed,
+                total=total,
+                details=f"슬라이드 {completed}/{total} 완료"
             )
-            
-            # 개별 슬라이드 스크립트 생성
-            script_result = await asyncio.to_thread(
-                generate_scripts,
-                slides=[slide],
+            _log("MINOR", f"SLIDE_{idx}", f"{completed}/{total} {message}")
+        
+        update_project_progress(
+            request.projectId,
+            "scripting",
+            current=0,
+            total=total,
+            details=f"슬라이드 {total}개 스크립트 생성 중..."
+        )
+        
+        pending = []
+        notes_pending = []
+        for idx, slide in enumerate(slide_data, 1):
+            previous = reusable.get(slide["slideId"])
+            if previous:
+                results[idx - 1] = _reused_script(previous, slide)
+                reused_slide_ids.append(slide["slideId"])
+                mark_completed(idx, "이전 스크립트 재사용")
+            elif resolve_slide_source(slide, script_source) == "notes":
+                notes_pending.append((idx, slide))
+            else:
+                pending.append((idx, slide))
+        
+        # 발표자 노트를 그대로 쓰는 슬라이드는 LLM 호출 없이 바로 완료
+        if notes_pending:
+            notes_result = await generate_scripts(
+                slides=[slide for _, slide in notes_pending],
                 tone=request.toneOfVoice,
                 language=request.language,
+                source=script_source,
             )
-            scripts.extend(script_result)
-            
-            _log("MINOR", f"SLIDE_{idx}", f"{idx}/{len(slide_data)} 완료")
-        
-        # 전체 시간 계산
-        total_duration = sum(s.get("duration", 0) for s in scripts)
-        
-        # 응답 생성
-        response = GenerateScriptResponse(
-            projectId=request.projectId,
-            scripts=[
-                GeneratedScript(
-                    slideId=s["slideId"],
-                    slideNumber=s["slideNumber"],
-                    scriptText=s["scriptText"],
-                    duration=s.get("duration"),
-                    keywords=s.get("keywords"),
-                )
-                for s in scripts
-            ],
-            totalDuration=total_duration,
-            generatedAt=datetime.utcnow().isoformat(),
-        )
+            for (idx, _), script in zip(notes_pending, notes_result):
+                results[idx - 1] = script
+                mark_completed(idx, "발표자 노트 사용")
         
-        # 스크립트 생성 결과 저장 (재개 시 사용)
-        from main import save_stage_result
-        save_stage_result(
-            request.projectId,
-            "scripting",
-            "completed",
-            data=response.model_dump()
+        # 배치 모드이면 슬라이드 batch_size장을 한 번의 요청으로 생성
+        groups = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        # Ollama는 덱 개요를 한 번만 평가하고 슬라이드 요청마다 그 context를 재사용
+        deck_session = None
+        if len(groups) > 1:
+            deck_session = create_deck_session(slide_data, request.toneOfVoice, request.language)
+        _log(
+            "MINOR",
+            "PROVIDER",
+            f"provider={provider} concurrency={get_provider_concurrency(provider)} "
+            f"source={script_source} batch={batch_size} requests={len(groups)} "
+            f"deck_session={deck_session is not None}",
         )
         
-        _log("MAJOR", "DONE", f"duration={total_duration}s")
+        async def generate_group(group: List[tuple]) -> None:
+            script_result = await generate_scripts(
+                slides=[slide for _, slide in group],
+                tone=request.toneOfVoice,
+                language=request.language,
+                use_cache=not request.bypassCache,
+                batch=batch_size > 1,
+                deck_session=deck_session,
+                source=script_source,
+            )
+            # 결과는 요청한 슬라이드 순서대로 반환됨
+            for (idx, _), script in zip(group, script_result):
+                results[idx - 1] = script
+                mark_completed(idx, "완료")
+        
+        async def generate_all() -> None:
+            tasks = [asyncio.ensure_future(generate_group(group)) for group in groups]
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                # 한 그룹이 실패하거나 연결이 끊기면 남은 그룹의 생성(LLM 요청)도 중단
+                for task in tasks:
+                    task.cancel()
+        
+        await _cancel_on_disconnect(http_request, generate_all())
+        scripts = [script for script in results if script is not None]
+        
+        response = _save_response(request, scripts, reused_slide_ids)
         
         return JSONResponse(
             status_code=200,
@@ -186,6 +384,21 @@ async def generate_script(request: GenerateScriptRequest) -> JSONResponse:
             }
         )
     
+    except ClientDisconnected:
+        _log("MINOR", "CANCELLED", f"projectId={request.projectId} - client disconnected")
+        # 응답을 받을 클라이언트가 없음 (nginx 관례의 499)
+        return JSONResponse(
+            status_code=499,
+            content={
+                "success": False,
+                "error": {
+                    "code": "CLIENT_DISCONNECTED",
+                    "message": "클라이언트 연결이 끊겨 생성을 취소했습니다",
+                },
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+        )
+    
     except Exception as e:
         _log("CRITICAL", "ERROR", str(e))
         return JSONResponse(
@@ -199,3 +412,155 @@ async def generate_script(request: GenerateScriptRequest) -> JSONResponse:
                 "timestamp": __import__("datetime").datetime.utcnow().isoformat(),
             }
         )
+
+
+def _sse(event: str, data: dict) -> str:
+    """Server-Sent Events 메시지 한 개"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/generate-script/stream")
+async def generate_script_stream(request: GenerateScriptRequest):
+    """
+    AI 스크립트 생성 스트리밍 엔드포인트 (Server-Sent Events)
+    
+    공급자 스트리밍 API로 슬라이드를 동시에 생성하면서 다음 이벤트를 보냅니다.
+    - start: {projectId, totalSlides}
+    - delta: {slideId, slideNumber, text} 생성 중인 텍스트 조각
+    - reset: {slideId, slideNumber} 생성 중 공급자가 바뀜 - 그 슬라이드의 지금까지 받은 조각을 버림
+    - slide: 완료된 슬라이드 스크립트 + {completed, total} (scriptText가 최종 텍스트, 키워드는 done에 포함)
+    - done: {data} 저장된 최종 결과 (/generate-script 응답의 data와 같음)
+    - error: {code, message}
+    배치 모드(batchSize)는 적용되지 않습니다.
+    """
+    try:
+        _validate_request(request)
+    except HTTPException as e:
+        return JSONResponse(
+            status_code=e.status_code,
+            content={
+                "success": False,
+                "error": {
+                    "code": "SCRIPT_GENERATION_ERROR",
+                    "message": e.detail,
+                },
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+        )
+    
+    async def event_stream():
+        slide_data = _slide_data(request)
+        total = len(slide_data)
+        
+        # 이미 완료된 단계이면 저장된 결과를 그대로 전송
+        cached_data = _completed_result(request)
+        if cached_data is not None:
+            _log("MINOR", "CACHE_HIT", f"projectId={request.projectId} - using cached scripts")
+            scripts = cached_data.get("scripts", [])
+            yield _sse("start", {"projectId": request.projectId, "totalSlides": len(scripts), "cached": True})
+            for completed, script in enumerate(scripts, 1):
+                yield _sse("slide", {**script, "completed": completed, "total": len(scripts)})
+            yield _sse("done", {"data": cached_data, "cached": True})
+            return
+        
+        from main import update_project_progress
+        
+        _log("MINOR", "STREAM", f"projectId={request.projectId} slides={total}")
+        # 슬라이드 태스크의 텍스트 조각과 완료를 생성 순서대로 전달
+        queue: asyncio.Queue = asyncio.Queue()
+        reusable = _reusable_scripts(request)
+        results: List[Optional[dict]] = [None] * total
+        reused_slide_ids = []
+        completed = 0
+        script_source = _script_source(request)
+        deck_session = create_deck_session(slide_data, request.toneOfVoice, request.language)
+        
+        def on_delta(slide: dict, text: str) -> None:
+            queue.put_nowait(
+                ("delta", {"slideId": slide["slideId"], "slideNumber": slide["slideNumber"], "text": text})
+            )
+        
+        def on_reset(slide: dict) -> None:
+            queue.put_nowait(("reset", {"slideId": slide["slideId"], "slideNumber": slide["slideNumber"]}))
+        
+        async def generate_one(idx: int, slide: dict) -> None:
+            try:
+                script_result = await generate_scripts(
+                    slides=[slide],
+                    tone=request.toneOfVoice,
+                    language=request.language,
+                    use_cache=not request.bypassCache,
+                    on_delta=on_delta,
+                    on_reset=on_reset,
+                    deck_session=deck_session,
+                    source=script_source,
+                )
+                await queue.put(("slide", (idx, script_result[0])))
+            except Exception as e:
+                await queue.put(("error", e))
+        
+        def slide_event(idx: int, script: dict) -> str:
+            nonlocal completed
+            results[idx - 1] = script
+            completed += 1
+            update_project_progress(
+                request.projectId,
+                "scripting",
+                current=completed,
+                total=total,
+                details=f"슬라이드 {completed}/{total} 완료"
+            )
+            return _sse("slide", {**script, "completed": completed, "total": total})
+        
+        yield _sse("start", {"projectId": request.projectId, "totalSlides": total})
+        
+        pending = []
+        for idx, slide in enumerate(slide_data, 1):
+            previous = reusable.get(slide["slideId"])
+            if previous:
+                reused_slide_ids.append(slide["slideId"])
+                yield slide_event(idx, _reused_script(previous, slide))
+            else:
+                pending.append((idx, slide))
+        
+        tasks = [asyncio.create_task(generate_one(idx, slide)) for idx, slide in pending]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                kind, payload = await queue.get()
+                if kind in ("delta", "reset"):
+                    yield _sse(kind, payload)
+                elif kind == "error":
+                    raise payload
+                else:
+                    remaining -= 1
+                    yield slide_event(*payload)
+            
+            response = _save_response(
+                request,
+                [script for script in results if script is not None],
+                reused_slide_ids,
+            )
+            yield _sse("done", {"data": response.model_dump()})
+        
+        except Exception as e:
+            _log("CRITICAL", "ERROR", str(e))
+            yield _sse("error", {
+                "code": "INTERNAL_SERVER_ERROR",
+                "message": "스크립트 생성 중 오류가 발생했습니다",
+            })
+        
+        finally:
+            # 클라이언트 연결이 끊기면 진행 중인 슬라이드 생성(LLM 요청) 취소
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # 프록시(nginx) 버퍼링 비활성화
+            "X-Accel-Buffering": "no",
+        },
+    )
@@ -3,14 +3,15 @@ TTS (Text-to-Speech) 라우터
 """
 
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
 import asyncio
 import base64
+import os
 
-from app.services.tts_service import GoogleTTSService
+from app.services.tts_service import DEFAULT_TTS_ENGINE, get_voice_options, resolve_voice
 from app.services.r2_storage import get_r2_service
 
 
@@ -22,6 +23,17 @@ def _log(level: str, step: str, message: str):
     print(f"[{timestamp}] [TTS] [{level}] [{step}] {message}")
 
 
+# 동시에 합성할 슬라이드 수 (TTS_MAX_CONCURRENCY)
+DEFAULT_TTS_CONCURRENCY = 4
+# 슬라이드 합성 실패 시 재시도 횟수와 첫 대기 시간 (시도마다 두 배)
+DEFAULT_TTS_RETRIES = 2
+DEFAULT_TTS_RETRY_BACKOFF = 1.0
+
+
+def get_tts_concurrency() -> int:
+    return max(int(os.getenv("TTS_MAX_CONCURRENCY") or DEFAULT_TTS_CONCURRENCY), 1)
+
+
 class ScriptItem(BaseModel):
     slideId: str
     slideNumber: int
@@ -48,27 +60,49 @@ class GenerateTtsResponse(BaseModel):
     projectId: str
     audioUrls: List[AudioItem]
     totalDuration: float
+    voiceId: Optional[str] = None
+    engine: Optional[str] = None
+    speed: Optional[float] = None
+    reusedSlideIds: List[str] = Field(default_factory=list)
     generatedAt: str
 
 
-def _resolve_voice_id(voice_id: Optional[str], voice_name: Optional[str]) -> str:
-    """voiceId 또는 voiceName을 Google TTS voice_id로 변환"""
-    options = GoogleTTSService.get_voice_options()
-
-    if voice_id:
-        # 사전 정의된 키이면 매핑
-        if voice_id in options:
-            return options[voice_id]["voice_id"]
-        # 직접 입력된 voice_id일 수 있음
-        return voice_id
-
-    if voice_name:
-        for _, info in options.items():
-            if info.get("name") == voice_name:
-                return info["voice_id"]
-
-    # 기본 음성
-    return options["male_professional_kr"]["voice_id"]
+async def _synthesize_with_retry(service, text: str, voice_id: str, speed: float, label: str) -> Optional[bytes]:
+    """합성 실패(None/예외) 시 지수 백오프로 재시도 (모두 실패하면 None)"""
+    retries = max(int(os.getenv("TTS_MAX_RETRIES") or DEFAULT_TTS_RETRIES), 0)
+    backoff = float(os.getenv("TTS_RETRY_BACKOFF") or DEFAULT_TTS_RETRY_BACKOFF)
+    for attempt in range(retries + 1):
+        try:
+            audio_data = await asyncio.to_thread(
+                service.synthesize_speech,
+                text=text,
+                voice_id=voice_id,
+                speed=speed,
+            )
+        except Exception as e:
+            _log("WARNING", "SYNTHESIZE", f"{label} attempt {attempt + 1} failed: {e}")
+            audio_data = None
+        if audio_data:
+            return audio_data
+        if attempt < retries:
+            delay = backoff * (2 ** attempt)
+            _log("WARNING", "RETRY", f"{label} retry {attempt + 1}/{retries} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+    return None
+
+
+def _upload_audio(r2_service, service, project_id: str, slide_number: int, audio_data: bytes) -> str:
+    """R2 업로드 후 URL 반환 (R2 미사용/실패 시 data URL, 형식은 엔진 출력 형식)"""
+    audio_url = ""
+    if r2_service:
+        file_key = f"projects/{project_id}/audio/slide_{slide_number}.{service.FILE_EXTENSION}"
+        audio_url = r2_service.upload_file(audio_data, file_key, service.MEDIA_TYPE) or ""
+
+    if not audio_url:
+        # R2 미사용 시 data URL fallback
+        b64 = base64.b64encode(audio_data).decode("utf-8")
+        audio_url = f"data:{service.MEDIA_TYPE};base64,{b64}"
+    return audio_url
 
 
 @router.post("/generate-tts")
@@ -76,7 +110,10 @@ async def generate_tts(request: GenerateTtsRequest) -> JSONResponse:
     """
     TTS 음성 합성 엔드포인트
 
-    슬라이드 스크립트를 받아 ElevenLabs TTS로 음성을 생성합니다.
+    슬라이드 스크립트를 받아 TTS로 음성을 생성합니다.
+    슬라이드는 최대 TTS_MAX_CONCURRENCY개씩 동시에 합성하고(실패 시 재시도),
+    합성이 끝난 슬라이드의 업로드는 다른 슬라이드 합성과 겹쳐 진행합니다.
+    audioUrls는 요청한 슬라이드 순서를 유지합니다.
     """
     try:
         if not request.projectId:
@@ -100,13 +137,14 @@ async def generate_tts(request: GenerateTtsRequest) -> JSONResponse:
                 }
             )
 
-        voice_id = _resolve_voice_id(request.voiceId, request.voiceName)
+        # voiceId로 엔진 선택 (gtts, local ...)
+        service, voice_id = resolve_voice(request.voiceId, request.voiceName)
         _log(
             "MINOR",
             "START",
-            f"projectId={request.projectId} scripts={len(request.scripts)} voice={voice_id}",
+            f"projectId={request.projectId} scripts={len(request.scripts)} "
+            f"engine={service.ENGINE} voice={voice_id}",
         )
-        service = GoogleTTSService()
 
         # R2 사용 가능 여부 확인
         r2_service = None
@@ -116,26 +154,74 @@ async def generate_tts(request: GenerateTtsRequest) -> JSONResponse:
             r2_service = None
 
         # 진행 상태 업데이트 import
-        from main import update_project_progress
-
-        audio_items: List[AudioItem] = []
-        total_duration = 0.0
-
-        for idx, script in enumerate(request.scripts, 1):
-            # 진행 상태 업데이트
+        from main import update_project_progress, get_reusable_slide_results
+
+        # 증분 재파싱: 바뀌지 않은 슬라이드 중 스크립트/엔진/음성/속도가 같으면 기존 음성 재사용
+        speed = request.speed or 1.0
+        previous_scripts = get_reusable_slide_results(request.projectId, "scripting")
+        reusable_audio = {
+            slide_id: item
+            for slide_id, item in get_reusable_slide_results(request.projectId, "voice-synthesis").items()
+            if item["_stageData"].get("voiceId") == voice_id
+            and item["_stageData"].get("engine", DEFAULT_TTS_ENGINE) == service.ENGINE
+            and item["_stageData"].get("speed") == speed
+        }
+
+        total = len(request.scripts)
+        results: List[Optional[AudioItem]] = [None] * total
+        reused_slide_ids: List[str] = []
+        completed = 0
+
+        def mark_completed(idx: int, message: str) -> None:
+            nonlocal completed
+            completed += 1
             update_project_progress(
                 request.projectId,
                 "voice-synthesis",
-                current=idx,
-                total=len(request.scripts),
-                details=f"슬라이드 {idx}/{len(request.scripts)} 음성 합성 중..."
-            )
-            audio_data = await asyncio.to_thread(
-                service.synthesize_speech,
-                text=script.scriptText,
-                voice_id=voice_id,
-                speed=request.speed or 1.0,
+                current=completed,
+                total=total,
+                details=f"슬라이드 {completed}/{total} 음성 합성 완료"
             )
+            _log("MINOR", f"SLIDE_{idx}", f"{completed}/{total} {message}")
+
+        update_project_progress(
+            request.projectId,
+            "voice-synthesis",
+            current=0,
+            total=total,
+            details=f"슬라이드 {total}개 음성 합성 중..."
+        )
+
+        pending = []
+        for idx, script in enumerate(request.scripts, 1):
+            previous_audio = reusable_audio.get(script.slideId)
+            previous_script = previous_scripts.get(script.slideId)
+            if previous_audio and previous_script and previous_script.get("scriptText") == script.scriptText:
+                results[idx - 1] = AudioItem(
+                    slideId=script.slideId,
+                    slideNumber=script.slideNumber,
+                    audioUrl=previous_audio["audioUrl"],
+                    duration=previous_audio["duration"],
+                )
+                reused_slide_ids.append(script.slideId)
+                mark_completed(idx, "이전 음성 재사용")
+            else:
+                pending.append((idx, script))
+
+        concurrency = get_tts_concurrency()
+        synthesis_slots = asyncio.Semaphore(concurrency)
+        _log("MINOR", "WORKERS", f"synthesize={len(pending)} concurrency={concurrency}")
+
+        async def process_slide(idx: int, script: ScriptItem) -> None:
+            # 합성 슬롯은 합성하는 동안만 잡고, 업로드는 슬롯을 놓은 뒤 진행
+            async with synthesis_slots:
+                audio_data = await _synthesize_with_retry(
+                    service,
+                    script.scriptText,
+                    voice_id,
+                    speed,
+                    label=f"slide {script.slideNumber}",
+                )
 
             if not audio_data:
                 raise HTTPException(
@@ -143,33 +229,36 @@ async def generate_tts(request: GenerateTtsRequest) -> JSONResponse:
                     detail=f"TTS 생성 실패: slide {script.slideNumber}",
                 )
 
-            duration = script.duration or service.estimate_duration(script.scriptText)
-            total_duration += duration
-
-            # R2 업로드 또는 data URL 반환
-            audio_url = ""
-            if r2_service:
-                file_key = f"projects/{request.projectId}/audio/slide_{script.slideNumber}.mp3"
-                audio_url = r2_service.upload_file(audio_data, file_key, "audio/mpeg") or ""
+            audio_url = await asyncio.to_thread(
+                _upload_audio, r2_service, service, request.projectId, script.slideNumber, audio_data
+            )
+            results[idx - 1] = AudioItem(
+                slideId=script.slideId,
+                slideNumber=script.slideNumber,
+                audioUrl=audio_url,
+                duration=script.duration or service.estimate_duration(script.scriptText, speed),
+            )
+            mark_completed(idx, "완료")
 
-            if not audio_url:
-                # R2 미사용 시 data URL fallback
-                b64 = base64.b64encode(audio_data).decode("utf-8")
-                audio_url = f"data:audio/mpeg;base64,{b64}"
+        tasks = [asyncio.ensure_future(process_slide(idx, script)) for idx, script in pending]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # 한 슬라이드가 실패하면 남은 슬라이드 합성은 중단
+            for task in tasks:
+                task.cancel()
 
-            audio_items.append(
-                AudioItem(
-                    slideId=script.slideId,
-                    slideNumber=script.slideNumber,
-                    audioUrl=audio_url,
-                    duration=duration,
-                )
-            )
+        audio_items = [item for item in results if item is not None]
+        total_duration = sum(item.duration for item in audio_items)
 
         response = GenerateTtsResponse(
             projectId=request.projectId,
             audioUrls=audio_items,
             totalDuration=total_duration,
+            voiceId=voice_id,
+            engine=service.ENGINE,
+            speed=speed,
+            reusedSlideIds=reused_slide_ids,
             generatedAt=datetime.utcnow().isoformat(),
         )
         
@@ -226,7 +315,7 @@ async def generate_tts(request: GenerateTtsRequest) -> JSONResponse:
 async def get_voices() -> JSONResponse:
     """사용 가능한 음성 목록 반환"""
     try:
-        voices = ElevenLabsTTSService.get_voice_options()
+        voices = get_voice_options()
         return JSONResponse(
             status_code=200,
             content={
@@ -261,7 +350,8 @@ async def get_voices() -> JSONResponse:
 @router.post("/tts-preview")
 async def preview_tts(
     text: str,
-    voiceId: str = "professional-male-korean",
+    voiceId: Optional[str] = None,
+    speed: float = 1.0,
 ):
     """
     TTS 미리듣기 (스트리밍)
@@ -272,11 +362,18 @@ async def preview_tts(
                 status_code=400,
                 detail="텍스트는 1-1000자 사이여야 합니다"
             )
+        if not 0.5 <= speed <= 2.0:
+            raise HTTPException(
+                status_code=400,
+                detail="speed는 0.5-2.0 사이여야 합니다"
+            )
         
-        tts_service = ElevenLabsTTSService()
-        audio_data = tts_service.synthesize_speech(
+        tts_service, voice_id = resolve_voice(voiceId)
+        audio_data = await asyncio.to_thread(
+            tts_service.synthesize_speech,
             text=text,
-            voice_id=voiceId,
+            voice_id=voice_id,
+            speed=speed,
         )
         
         if not audio_data:
@@ -287,7 +384,7 @@ async def preview_tts(
         
         return StreamingResponse(
             iter([audio_data]),
-            media_type="audio/mpeg",
+            media_type=tts_service.MEDIA_TYPE,
         )
     
     except HTTPException as e:
@@ -301,3 +398,17 @@ async def preview_tts(
                 },
             }
         )
+
+    except Exception as e:
+        _log("CRITICAL", "ERROR", str(e))
+        return JSONResponse(
+            status_code=500,
+            content={
+                "success": False,
+                "error": {
+                    "code": "INTERNAL_SERVER_ERROR",
+                    "message": str(e),
+                },
+                "timestamp": datetime.utcnow().isoformat(),
+            },
+        )
@@ -0,0 +1,194 @@
+"""
+디스크 기반 캐시 서비스
+내용 해시를 키로 하는 파일 캐시 (LRU/용량 기반 축출, 선택적 TTL)
+서버 재시작 후에도 MEDIA_DIR/cache 아래에 유지됨
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+def get_media_dir() -> Path:
+    """미디어 루트 디렉터리 (MEDIA_DIR, 기본값 backend/media)"""
+    base_dir = Path(__file__).resolve().parents[2]
+    return Path(os.getenv("MEDIA_DIR", str(base_dir / "media")))
+
+
+def make_cache_key(*parts: Any) -> str:
+    """임의의 값들로부터 파일명으로 안전한 캐시 키(SHA-256) 생성"""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """
+    디스크 LRU 캐시
+
+    - 항목 하나당 파일 하나 (MEDIA_DIR/cache/<name>/<key[:2]>/<key><suffix>)
+    - 최근 사용 시각은 atime, 생성 시각은 mtime으로 관리
+    - 총 용량이 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_bytes: int,
+        ttl: Optional[float] = None,
+        suffix: str = ".bin",
+        directory: Optional[Path] = None,
+    ):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.suffix = suffix
+        self.directory = directory or (get_media_dir() / "cache" / name)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{self.suffix}"
+
+    def _entries(self) -> List[Path]:
+        return list(self.directory.glob(f"*/*{self.suffix}"))
+
+    def _ensure_size(self) -> int:
+        if self._total_bytes is None:
+            total = 0
+            for path in self._entries():
+                try:
+                    total += path.stat().st_size
+                except OSError:
+                    pass
+            self._total_bytes = total
+        return self._total_bytes
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """캐시 조회 (없거나 만료되면 None)"""
+        path = self.path_for(key)
+        try:
+            stat = path.stat()
+            if self.ttl is not None and time.time() - stat.st_mtime > self.ttl:
+                self._remove(path, stat.st_size)
+                self.misses += 1
+                return None
+            data = path.read_bytes()
+            # LRU 갱신: atime만 현재 시각으로, mtime(생성 시각)은 유지
+            os.utime(path, (time.time(), stat.st_mtime))
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put_bytes(self, key: str, data: bytes) -> Path:
+        """캐시 저장 (원자적 교체 후 용량 초과 시 축출)"""
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temp_path.write_bytes(data)
+
+        with self._lock:
+            self._ensure_size()
+            try:
+                previous = path.stat().st_size
+            except OSError:
+                previous = 0
+            os.replace(temp_path, path)
+            self._total_bytes += len(data) - previous
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+        return path
+
+    def get_json(self, key: str) -> Optional[Any]:
+        data = self.get_bytes(key)
+        if data is None:
+            return None
+        try:
+            return json.loads(data.decode("utf-8"))
+        except ValueError:
+            return None
+
+    def put_json(self, key: str, value: Any) -> Path:
+        return self.put_bytes(key, json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+    def _remove(self, path: Path, size: int) -> None:
+        with self._lock:
+            try:
+                path.unlink()
+            except OSError:
+                return
+            if self._total_bytes is not None:
+                self._total_bytes -= size
+
+    def _evict(self) -> None:
+        """용량의 90% 이하가 될 때까지 LRU 순으로 삭제 (lock 보유 상태에서 호출)"""
+        target = int(self.max_bytes * 0.9)
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_atime, stat.st_size, path))
+        entries.sort(key=lambda item: item[0])
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+        self._total_bytes = total
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total_bytes = self._ensure_size()
+        requests_count = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / requests_count, 3) if requests_count else 0.0,
+            "evictions": self.evictions,
+            "bytes": total_bytes,
+            "maxBytes": self.max_bytes,
+        }
+
+
+# 이름별 캐시 인스턴스
+_caches: Dict[str, DiskCache] = {}
+
+
+def get_disk_cache(
+    name: str,
+    default_max_mb: int = 512,
+    ttl: Optional[float] = None,
+    suffix: str = ".bin",
+) -> DiskCache:
+    """
+    이름별 캐시 인스턴스 반환 (없으면 생성)
+
+    용량은 <NAME>_CACHE_MAX_MB 환경 변수로 조정할 수 있습니다.
+    """
+    if name not in _caches:
+        env_name = f"{name.upper()}_CACHE_MAX_MB"
+        max_mb = float(os.getenv(env_name, str(default_max_mb)))
+        _caches[name] = DiskCache(name, int(max_mb * 1024 * 1024), ttl=ttl, suffix=suffix)
+    return _caches[name]
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """생성된 모든 캐시의 통계"""
+    return {name: cache.stats() for name, cache in _caches.items()}
@@ -0,0 +1,234 @@
+"""
+슬라이드 이미지 정규화 서비스
+작성자가 삽입한 원본 이미지(초대형 PNG, CMYK JPEG 등)를 파싱 시 한 번만
+sRGB PNG/JPEG로 변환하고 프레임 크기에 맞게 축소하여 저장
+원본 해시로 결과를 캐시하므로 같은 이미지는 다시 변환하지 않음
+"""
+
+import hashlib
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from app.services.disk_cache import get_disk_cache, make_cache_key
+from app.services.image_store import get_image_store
+
+# 변환 방식이 바뀌면 올려서 기존 정규화 결과를 무효화
+NORMALIZE_VERSION = 1
+
+# 가장 큰 슬라이드 프레임(1080p)에 맞춤 - 작은 프레임은 래스터화 단계에서 축소됨
+NORMALIZED_MAX_SIZE: Tuple[int, int] = (1920, 1080)
+JPEG_QUALITY = 90
+
+# 손실 압축으로 저장해도 되는 원본 형식 (나머지는 PNG로 무손실 저장)
+PHOTO_FORMATS = ("JPEG", "MPO")
+
+
+class NormalizedImage:
+    """정규화 결과 (status: converted/passthrough/unsupported/failed)"""
+
+    def __init__(
+        self,
+        status: str,
+        key: Optional[str] = None,
+        format: Optional[str] = None,
+        width: int = 0,
+        height: int = 0,
+        reason: Optional[str] = None,
+    ):
+        self.status = status
+        # 이미지 저장소 키 (unsupported/failed이면 None)
+        self.key = key
+        self.format = format
+        self.width = width
+        self.height = height
+        self.reason = reason
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "key": self.key,
+            "format": self.format,
+            "width": self.width,
+            "height": self.height,
+            "reason": self.reason,
+        }
+
+
+class NormalizationReport:
+    """한 번의 파싱에서 처리한 이미지 통계"""
+
+    def __init__(self):
+        self.converted = 0
+        self.passthrough = 0
+        self.cached = 0
+        # 변환하지 못한 이미지 (식별자, 사유)
+        self.skipped: List[Dict[str, str]] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "converted": self.converted,
+            "passthrough": self.passthrough,
+            "cached": self.cached,
+            "skipped": self.skipped,
+        }
+
+
+def _to_srgb(image: Image.Image) -> Image.Image:
+    """내장 ICC 프로파일/CMYK 등을 sRGB(RGB 또는 RGBA)로 변환"""
+    icc_profile = image.info.get("icc_profile")
+    if icc_profile and image.mode in ("RGB", "RGBA", "CMYK", "L"):
+        try:
+            from PIL import ImageCms
+
+            source_profile = ImageCms.ImageCmsProfile(io.BytesIO(icc_profile))
+            srgb_profile = ImageCms.createProfile("sRGB")
+            output_mode = "RGBA" if image.mode == "RGBA" else "RGB"
+            image = ImageCms.profileToProfile(image, source_profile, srgb_profile, outputMode=output_mode)
+        except Exception:
+            # 손상된 프로파일이거나 LittleCMS가 없는 경우 단순 변환
+            pass
+
+    if image.mode in ("RGB", "RGBA"):
+        return image
+    has_alpha = image.mode in ("LA", "PA") or (image.mode == "P" and "transparency" in image.info)
+    return image.convert("RGBA" if has_alpha else "RGB")
+
+
+def _has_transparency(image: Image.Image) -> bool:
+    if image.mode != "RGBA":
+        return False
+    return image.getchannel("A").getextrema()[0] < 255
+
+
+def normalize_image(
+    blob: bytes,
+    max_size: Tuple[int, int] = NORMALIZED_MAX_SIZE,
+) -> NormalizedImage:
+    """
+    이미지 한 장을 sRGB PNG/JPEG로 정규화하여 이미지 저장소에 저장
+
+    이미 크기/형식이 맞는 PNG/JPEG는 다시 인코딩하지 않고 원본을 그대로 저장합니다.
+    Pillow가 읽지 못하는 형식(EMF/WMF 등)은 unsupported로 반환합니다.
+    """
+    try:
+        source = Image.open(io.BytesIO(blob))
+        source_format = source.format or "unknown"
+        source.load()
+    except UnidentifiedImageError:
+        return NormalizedImage(status="unsupported", reason="unsupported image format")
+    except (OSError, ValueError) as e:
+        return NormalizedImage(status="unsupported", reason=str(e))
+
+    image_store = get_image_store()
+    fits = source.width <= max_size[0] and source.height <= max_size[1]
+    plain_rgb = source.mode in ("RGB", "RGBA", "L") and not source.info.get("icc_profile")
+    oriented = not source.getexif().get(0x0112, 1) > 1
+
+    if fits and plain_rgb and oriented and source_format in ("PNG", "JPEG"):
+        ext = "png" if source_format == "PNG" else "jpg"
+        return NormalizedImage(
+            status="passthrough",
+            key=image_store.put(blob, ext),
+            format=ext,
+            width=source.width,
+            height=source.height,
+        )
+
+    # EXIF 회전 반영 후 색공간 변환, 비율 유지 축소
+    image = _to_srgb(ImageOps.exif_transpose(source))
+    image.thumbnail(max_size, Image.LANCZOS)
+
+    # 투명도가 있으면 RGBA PNG, 사진 원본은 JPEG, 그 외(도식/스크린샷)는 무손실 PNG
+    output = io.BytesIO()
+    if _has_transparency(image):
+        image.save(output, format="PNG")
+        ext = "png"
+    elif source_format in PHOTO_FORMATS:
+        image.convert("RGB").save(output, format="JPEG", quality=JPEG_QUALITY, optimize=True)
+        ext = "jpg"
+    else:
+        image.convert("RGB").save(output, format="PNG")
+        ext = "png"
+
+    return NormalizedImage(
+        status="converted",
+        key=image_store.put(output.getvalue(), ext),
+        format=ext,
+        width=image.width,
+        height=image.height,
+    )
+
+
+class ImageNormalizer:
+    """
+    스레드 풀 기반 이미지 일괄 정규화
+
+    디코딩/리사이즈/인코딩 대부분은 Pillow가 GIL을 놓고 처리하므로
+    파싱 워커 프로세스 안에서도 스레드로 병렬화됩니다.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_size: Tuple[int, int] = NORMALIZED_MAX_SIZE):
+        default_workers = min(os.cpu_count() or 1, 4)
+        self.max_workers = max_workers or int(os.getenv("IMAGE_NORMALIZE_WORKERS", str(default_workers)))
+        self.max_size = max_size
+        self.cache = get_disk_cache("images", default_max_mb=16, suffix=".json")
+
+    def _normalize_cached(self, blob: bytes) -> Tuple[NormalizedImage, bool]:
+        """(결과, 캐시 적중 여부) - 저장소 파일이 지워졌으면 다시 변환"""
+        source_hash = hashlib.sha256(blob).hexdigest()
+        key = make_cache_key(source_hash, NORMALIZE_VERSION, self.max_size)
+
+        cached = self.cache.get_json(key)
+        if cached:
+            result = NormalizedImage(**cached)
+            if result.key is None or get_image_store().path_for(result.key).exists():
+                return result, True
+
+        result = normalize_image(blob, self.max_size)
+        self.cache.put_json(key, result.to_dict())
+        return result, False
+
+    def normalize_all(
+        self,
+        images: Dict[str, bytes],
+    ) -> Tuple[Dict[str, NormalizedImage], NormalizationReport]:
+        """
+        이미지 일괄 정규화
+
+        Args:
+            images: 식별자(예: 패키지 파트 이름) -> 원본 바이트
+
+        Returns:
+            (식별자 -> 정규화 결과, 처리 통계)
+        """
+        report = NormalizationReport()
+        if not images:
+            return {}, report
+
+        names = list(images)
+        workers = max(1, min(self.max_workers, len(names)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-normalize") as executor:
+            outcomes = list(executor.map(self._safe_normalize, (images[name] for name in names)))
+
+        results: Dict[str, NormalizedImage] = {}
+        for name, (result, cache_hit) in zip(names, outcomes):
+            results[name] = result
+            if cache_hit:
+                report.cached += 1
+            elif result.status == "converted":
+                report.converted += 1
+            elif result.status == "passthrough":
+                report.passthrough += 1
+            if result.status not in ("converted", "passthrough"):
+                report.skipped.append({"source": name, "reason": result.reason or result.status})
+        return results, report
+
+    def _safe_normalize(self, blob: bytes) -> Tuple[NormalizedImage, bool]:
+        try:
+            return self._normalize_cached(blob)
+        except Exception as e:
+            return NormalizedImage(status="failed", reason=str(e)), False
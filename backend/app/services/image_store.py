@@ -0,0 +1,77 @@
+"""
+슬라이드 이미지 저장소
+이미지 바이트를 SHA-256으로 식별하여 디스크에 한 벌만 저장하고
+/media 정적 경로로 접근 가능한 URL을 발급
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from app.services.disk_cache import get_media_dir
+
+
+class ImageStore:
+    """내용 주소 기반 이미지 저장소 (MEDIA_DIR/images/<hash[:2]>/<hash>.<ext>)"""
+
+    def __init__(self, directory: Optional[Path] = None, public_base: Optional[str] = None):
+        self.media_dir = get_media_dir()
+        self.directory = directory or (self.media_dir / "images")
+        self.public_base = (public_base or os.getenv("FASTAPI_PUBLIC_URL", "http://localhost:8000")).rstrip("/")
+
+    def put(self, blob: bytes, ext: str = "png") -> str:
+        """이미지를 저장하고 저장소 키 반환 (같은 내용이면 기존 파일 재사용)"""
+        digest = hashlib.sha256(blob).hexdigest()
+        key = f"{digest[:2]}/{digest}.{ext.lower().lstrip('.') or 'bin'}"
+        path = self.path_for(key)
+
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 여러 워커 프로세스가 동시에 쓸 수 있으므로 임시 파일 후 원자적 교체
+            temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            temp_path.write_bytes(blob)
+            os.replace(temp_path, path)
+
+        return key
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / key
+
+    def url_for(self, key: str) -> str:
+        relative = self.path_for(key).relative_to(self.media_dir).as_posix()
+        return f"{self.public_base}/media/{relative}"
+
+
+def resolve_media_url(url: str) -> Optional[Path]:
+    """
+    이 서버의 /media URL이면 로컬 파일 경로로 변환
+
+    렌더링 시 자기 자신에게 HTTP 요청을 보내지 않고 디스크에서 바로 읽기 위해 사용
+    """
+    public_base = os.getenv("FASTAPI_PUBLIC_URL", "http://localhost:8000").rstrip("/")
+    prefix = f"{public_base}/media/"
+    if not url.startswith(prefix):
+        return None
+
+    media_dir = get_media_dir().resolve()
+    path = (media_dir / url[len(prefix):]).resolve()
+    # 경로 조작으로 MEDIA_DIR 밖을 가리키는 경우 거부
+    if media_dir not in path.parents:
+        return None
+    return path if path.exists() else None
+
+
+# 싱글톤 인스턴스
+_image_store: Optional[ImageStore] = None
+
+
+def get_image_store() -> ImageStore:
+    """이미지 저장소 인스턴스 반환 (없으면 생성)"""
+    global _image_store
+
+    if _image_store is None:
+        _image_store = ImageStore()
+
+    return _image_store
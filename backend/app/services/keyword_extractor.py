@@ -0,0 +1,184 @@
+"""
+덱 단위 키워드 추출 서비스
+덱의 모든 스크립트를 한 번에 토큰화(한국어 조사 제거, 영어 어간 추출)하고
+슬라이드 x 단어 TF-IDF를 NumPy로 계산하여 슬라이드별/덱 전체 키워드를 함께 반환
+단어-문서 쌍만 보관(희소 좌표)하므로 비용은 덱 전체 토큰 수에 비례
+"""
+
+import re
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+KEYWORDS_PER_SLIDE = 5
+DECK_KEYWORDS = 10
+
+# 한글 연속 또는 영문/숫자 단어 (C++, Node.js 같은 기호는 분리됨)
+TOKEN_PATTERN = re.compile(r"[가-힣]+|[A-Za-z][A-Za-z0-9]*")
+
+# 긴 것부터 비교하는 조사/접미사 (떼어낸 뒤 두 글자 이상 남을 때만 제거)
+KOREAN_PARTICLES = sorted(
+    [
+        "에서는", "에서도", "에게서", "으로는", "으로도", "으로써", "으로서", "이라는", "이라고",
+        "에서", "에게", "한테", "께서", "으로", "까지", "부터", "처럼", "보다", "라는", "라고",
+        "이나", "이며", "이고", "이란", "에는", "에도", "와는", "과는", "들은", "들이", "들을", "들의",
+        "은", "는", "이", "가", "을", "를", "의", "에", "로", "와", "과", "도", "만", "들",
+    ],
+    key=len,
+    reverse=True,
+)
+
+# 이 어미로 끝나는 한국어 토큰은 용언으로 보고 제외 (조사 제거 전 원형 기준)
+KOREAN_VERB_ENDINGS = (
+    "습니다", "니다", "세요", "어요", "아요", "해요", "하는", "하고", "하여", "해서", "하면", "했던",
+    "되는", "되고", "되어", "돼서", "있는", "없는", "같은", "이다", "한다", "된다", "였다", "었다",
+    "겠다", "는데", "지만", "면서", "도록", "려면", "하게", "스럽게", "적으로", "하기", "되기",
+)
+# 조사 제거 후 이 글자로 끝나는 토큰은 용언 어간으로 보고 제외 (분석하, 사용되)
+# 고/기/게/며로 끝나는 명사가 많아(분류기, 생성기, 재고) 그 어미들은 제외하지 않음
+KOREAN_VERB_TAILS = ("하", "되")
+
+KOREAN_STOPWORDS = {
+    "그리고", "하지만", "그러나", "그래서", "또한", "또는", "그런데", "따라서", "이제", "먼저", "다음",
+    "여러분", "우리", "저희", "이것", "그것", "저것", "이런", "그런", "어떤", "모든", "각각", "정도",
+    "경우", "때문", "위해", "통해", "대해", "대한", "관련", "가장", "매우", "정말", "바로", "함께",
+    "오늘", "지금", "여기", "거기", "부분", "내용", "슬라이드", "말씀", "설명", "생각", "하나", "가지",
+}
+
+ENGLISH_STOPWORDS = {
+    "the", "and", "for", "are", "but", "not", "you", "your", "our", "all", "any", "can", "has", "have",
+    "had", "was", "were", "will", "with", "this", "that", "these", "those", "from", "into", "about",
+    "than", "then", "them", "they", "their", "there", "here", "what", "which", "when", "where", "who",
+    "how", "why", "also", "just", "very", "more", "most", "such", "each", "other", "some", "only",
+    "its", "it's", "let", "lets", "let's", "we", "us", "is", "be", "been", "being", "do", "does",
+    "did", "so", "if", "of", "on", "in", "to", "as", "at", "by", "or", "an", "a", "one", "slide",
+    "today", "now", "use", "using", "used", "make", "makes", "like", "well", "really", "see",
+    "across", "through", "over", "under", "between", "while", "because", "both", "many", "much",
+    "should", "would", "could", "may", "might", "must", "need", "want", "get", "gets", "way",
+}
+
+
+def _strip_particle(word: str) -> str:
+    for particle in KOREAN_PARTICLES:
+        if word.endswith(particle) and len(word) - len(particle) >= 2:
+            return word[: -len(particle)]
+    return word
+
+
+def _stem_english(word: str) -> str:
+    """가벼운 접미사 제거 어간 추출 (Porter 1단계 수준)"""
+    if len(word) <= 3:
+        return word
+    if word.endswith("sses"):
+        return word[:-2]
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        word = word[:-1]
+    for suffix in ("ing", "ed"):
+        if word.endswith(suffix):
+            stem = word[: -len(suffix)]
+            if len(stem) >= 3 and re.search(r"[aeiouy]", stem):
+                # running -> run, stopped -> stop
+                if len(stem) >= 4 and stem[-1] == stem[-2] and stem[-1] not in "lsz":
+                    stem = stem[:-1]
+                return stem
+    return word
+
+
+def tokenize(text: str) -> List[Tuple[str, str]]:
+    """
+    키워드 후보 토큰 목록
+
+    Returns:
+        (정규화된 어간, 표시용 형태) 목록 - 영어 어간은 소문자
+    """
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(text or ""):
+        word = match.group(0)
+        if "가" <= word[0] <= "힣":
+            if word.endswith(KOREAN_VERB_ENDINGS):
+                continue
+            word = _strip_particle(word)
+            if len(word) < 2 or word in KOREAN_STOPWORDS:
+                continue
+            if word.endswith(KOREAN_VERB_TAILS):
+                continue
+            tokens.append((word, word))
+        else:
+            lower = word.lower()
+            if len(lower) < 3 or lower in ENGLISH_STOPWORDS:
+                continue
+            # 약어(API, AWS)는 대문자 그대로 표시
+            tokens.append((_stem_english(lower), word if word.isupper() else lower))
+    return tokens
+
+
+def extract_keywords(
+    texts: List[str],
+    per_slide: int = KEYWORDS_PER_SLIDE,
+    deck: int = DECK_KEYWORDS,
+) -> Tuple[List[List[str]], List[str]]:
+    """
+    덱 전체 스크립트에서 슬라이드별/덱 키워드를 한 번에 추출
+
+    슬라이드별 점수는 TF-IDF(슬라이드마다 L2 정규화)이고,
+    덱 키워드 점수는 슬라이드별 점수의 합입니다.
+    같은 점수이면 덱에서 먼저 나온 단어가 앞에 옵니다.
+
+    Args:
+        texts: 슬라이드 순서대로의 스크립트
+        per_slide: 슬라이드당 키워드 수
+        deck: 덱 키워드 수
+
+    Returns:
+        (슬라이드별 키워드 목록, 덱 키워드 목록)
+    """
+    vocabulary: Dict[str, int] = {}
+    surfaces: List[Dict[str, int]] = []
+    rows: List[int] = []
+    cols: List[int] = []
+    for row, text in enumerate(texts):
+        for stem, surface in tokenize(text):
+            col = vocabulary.setdefault(stem, len(vocabulary))
+            if col == len(surfaces):
+                surfaces.append({})
+            surfaces[col][surface] = surfaces[col].get(surface, 0) + 1
+            rows.append(row)
+            cols.append(col)
+
+    n_docs, n_terms = len(texts), len(vocabulary)
+    if not n_terms:
+        return [[] for _ in texts], []
+
+    # 어간마다 가장 많이 쓰인 형태로 표시 (같으면 먼저 나온 형태)
+    labels = [max(forms, key=forms.get) for forms in surfaces]
+
+    # (슬라이드, 단어) 쌍별 등장 횟수 - 희소 좌표 형식
+    pair_keys, counts = np.unique(
+        np.asarray(rows, dtype=np.int64) * n_terms + np.asarray(cols, dtype=np.int64),
+        return_counts=True,
+    )
+    doc = pair_keys // n_terms
+    term = pair_keys % n_terms
+
+    doc_lengths = np.bincount(doc, weights=counts, minlength=n_docs)
+    doc_freq = np.bincount(term, minlength=n_terms)
+    idf = np.log((1 + n_docs) / (1 + doc_freq)) + 1
+    weights = counts / doc_lengths[doc] * idf[term]
+    norms = np.sqrt(np.bincount(doc, weights=weights ** 2, minlength=n_docs))
+    weights = weights / norms[doc]
+
+    # 슬라이드별 상위 per_slide개: (슬라이드, -점수, 단어 등장 순서)로 정렬 후 슬라이드마다 앞에서부터
+    order = np.lexsort((term, -weights, doc))
+    sorted_docs = doc[order]
+    rank = np.arange(len(order)) - np.searchsorted(sorted_docs, sorted_docs, side="left")
+    slide_keywords: List[List[str]] = [[] for _ in texts]
+    for index in order[rank < per_slide]:
+        slide_keywords[doc[index]].append(labels[term[index]])
+
+    deck_scores = np.bincount(term, weights=weights, minlength=n_terms)
+    deck_order = np.argsort(-deck_scores, kind="stable")[:deck]
+    deck_keywords = [labels[col] for col in deck_order]
+
+    return slide_keywords, deck_keywords
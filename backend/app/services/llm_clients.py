@@ -0,0 +1,166 @@
+"""
+LLM 클라이언트 풀
+OpenAI와 Ollama 비동기(httpx.AsyncClient) 연결을 프로세스 전체에서 공유하여
+슬라이드마다 TCP/TLS 연결을 새로 맺지 않도록 keep-alive 연결 풀을 유지
+요청 대기는 스레드가 아닌 코루틴으로 처리되므로 동시 생성 수가 스레드 풀에 묶이지 않음
+"""
+
+import asyncio
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+# 공급자별 최대 동시 요청 수 기본값 (OPENAI_MAX_CONCURRENCY / OLLAMA_MAX_CONCURRENCY로 조정)
+# 로컬 Ollama는 GPU 하나를 나눠 쓰므로 작게, OpenAI는 요청 한도 내에서 크게
+DEFAULT_PROVIDER_CONCURRENCY = {
+    "openai": 8,
+    "ollama": 2,
+}
+
+
+def get_provider_concurrency(provider: str) -> int:
+    default = DEFAULT_PROVIDER_CONCURRENCY.get(provider, 1)
+    return max(int(os.getenv(f"{provider.upper()}_MAX_CONCURRENCY", str(default))), 1)
+
+
+def _log(level: str, step: str, message: str):
+    timestamp = datetime.utcnow().isoformat()
+    print(f"[{timestamp}] [LLM_CLIENTS] [{level}] [{step}] {message}")
+
+
+class LLMClientPool:
+    """
+    공급자별 공유 비동기 HTTP 클라이언트와 동시 요청 제한
+
+    - OpenAI: httpx.AsyncClient 연결 풀을 가진 AsyncOpenAI 클라이언트 하나
+    - Ollama: httpx.AsyncClient 하나
+    - 공급자별 asyncio.Semaphore (OPENAI/OLLAMA_MAX_CONCURRENCY)
+
+    풀 크기 기본값은 공급자별 동시 요청 수와 같습니다.
+    클라이언트와 세마포어는 이벤트 루프에 묶이므로 앱 수명(lifespan) 동안만 유지하고
+    aclose()로 정리합니다.
+    """
+
+    def __init__(self):
+        self.openai_api_key = os.getenv("OPENAI_API_KEY")
+        self.openai_pool_size = int(
+            os.getenv("OPENAI_POOL_SIZE") or get_provider_concurrency("openai")
+        )
+        self.openai_timeout = float(os.getenv("OPENAI_TIMEOUT", "60"))
+        self.openai_connect_timeout = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "10"))
+        self.ollama_url = os.getenv("OLLAMA_URL", "http://localhost:11434").rstrip("/")
+        self.ollama_pool_size = int(
+            os.getenv("OLLAMA_POOL_SIZE") or get_provider_concurrency("ollama")
+        )
+        self.ollama_timeout = float(os.getenv("OLLAMA_TIMEOUT", "120"))
+        self.ollama_connect_timeout = float(os.getenv("OLLAMA_CONNECT_TIMEOUT", "5"))
+        # 요청 후 모델을 메모리에 유지할 시간 (Ollama keep_alive 형식, 예: "30m", 음수 "-1m"은 무기한)
+        self.ollama_keep_alive = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+
+        self._openai: Optional[AsyncOpenAI] = None
+        self._ollama: Optional[httpx.AsyncClient] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def start(self) -> None:
+        """연결 풀 생성 (실제 연결은 첫 요청 시 맺어지고 이후 재사용됨)"""
+        if self._ollama is None:
+            self._ollama = self._create_ollama_client()
+        if self._openai is None and self.openai_api_key:
+            self._openai = self._create_openai_client()
+        _log(
+            "MINOR",
+            "START",
+            f"openai_pool={self.openai_pool_size if self._openai else 0} ollama_pool={self.ollama_pool_size}",
+        )
+
+    async def aclose(self) -> None:
+        """연결 풀 종료 (진행 중인 요청의 연결도 닫힘)"""
+        openai_client, ollama_client = self._openai, self._ollama
+        self._openai = None
+        self._ollama = None
+        self._semaphores = {}
+        if openai_client is not None:
+            await openai_client.close()
+        if ollama_client is not None:
+            await ollama_client.aclose()
+
+    def _create_openai_client(self) -> AsyncOpenAI:
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.openai_pool_size,
+                max_keepalive_connections=self.openai_pool_size,
+                keepalive_expiry=60,
+            ),
+            timeout=httpx.Timeout(self.openai_timeout, connect=self.openai_connect_timeout),
+        )
+        return AsyncOpenAI(api_key=self.openai_api_key, http_client=http_client)
+
+    def _create_ollama_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=self.ollama_url,
+            limits=httpx.Limits(
+                max_connections=self.ollama_pool_size,
+                max_keepalive_connections=self.ollama_pool_size,
+                keepalive_expiry=60,
+            ),
+            # 연결 풀 대기는 세마포어가 담당하므로 풀 대기 시간은 제한하지 않음
+            timeout=httpx.Timeout(self.ollama_timeout, connect=self.ollama_connect_timeout, pool=None),
+        )
+
+    @property
+    def openai(self) -> Optional[AsyncOpenAI]:
+        """공유 OpenAI 클라이언트 (OPENAI_API_KEY가 없으면 None)"""
+        if self._openai is None and self.openai_api_key:
+            self.start()
+        return self._openai
+
+    @property
+    def ollama(self) -> httpx.AsyncClient:
+        """공유 Ollama 클라이언트 (base_url=OLLAMA_URL)"""
+        if self._ollama is None:
+            self.start()
+        return self._ollama
+
+    def limit(self, provider: str) -> asyncio.Semaphore:
+        """
+        공급자별 동시 요청 제한 세마포어
+
+        모든 요청이 공유하므로 동시 LLM 호출 수가 공급자 한도를 넘지 않습니다.
+            async with get_llm_clients().limit("ollama"):
+                ...
+        """
+        if provider not in self._semaphores:
+            self._semaphores[provider] = asyncio.Semaphore(get_provider_concurrency(provider))
+        return self._semaphores[provider]
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "openai": {
+                "enabled": self._openai is not None,
+                "poolSize": self.openai_pool_size,
+                "timeout": self.openai_timeout,
+            },
+            "ollama": {
+                "url": self.ollama_url,
+                "poolSize": self.ollama_pool_size,
+                "timeout": self.ollama_timeout,
+                "keepAlive": self.ollama_keep_alive,
+            },
+        }
+
+
+# 싱글톤 인스턴스
+_llm_clients: Optional[LLMClientPool] = None
+
+
+def get_llm_clients() -> LLMClientPool:
+    """LLM 클라이언트 풀 인스턴스 반환 (없으면 생성)"""
+    global _llm_clients
+
+    if _llm_clients is None:
+        _llm_clients = LLMClientPool()
+
+    return _llm_clients
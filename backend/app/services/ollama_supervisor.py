@@ -0,0 +1,273 @@
+"""
+Ollama 프로세스 감독 서비스
+서버 시작을 막지 않도록 백그라운드 태스크에서 Ollama를 시작하고
+OLLAMA_MODEL을 keep_alive로 미리 메모리에 올려 첫 요청의 모델 로딩 시간을 없앰
+직접 띄운 프로세스가 죽으면 다시 시작
+"""
+
+import asyncio
+import os
+import subprocess
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.services.llm_clients import get_llm_clients
+
+DEFAULT_STARTUP_TIMEOUT = 30.0
+DEFAULT_HEALTH_INTERVAL = 10.0
+# 재시작 대기 시간 (실패할 때마다 두 배, 최대값)
+RESTART_BACKOFF_INITIAL = 1.0
+RESTART_BACKOFF_MAX = 60.0
+# 이 시간 이상 정상 동작하면 재시작 대기 시간 초기화
+STABLE_AFTER = 60.0
+HEALTH_CHECK_TIMEOUT = 2.0
+# 모델 로딩은 디스크/GPU 상태에 따라 오래 걸릴 수 있음
+WARMUP_TIMEOUT = 300.0
+
+
+def _log(level: str, step: str, message: str):
+    timestamp = datetime.utcnow().isoformat()
+    print(f"[{timestamp}] [OLLAMA] [{level}] [{step}] {message}", flush=True)
+
+
+class OllamaSupervisor:
+    """
+    Ollama 서비스 감독
+
+    상태(state):
+    - starting: 서버 확인/시작 중
+    - warming: 모델 로딩 중
+    - ready: 요청 처리 가능 (모델이 메모리에 올라가 있음)
+    - unavailable: 서버가 응답하지 않음 (재시작 대기 중)
+    - not_installed: ollama 실행 파일 없음
+    - disabled: OLLAMA_AUTOSTART=false
+    - stopped: 앱 종료
+    """
+
+    def __init__(self):
+        self.autostart = os.getenv("OLLAMA_AUTOSTART", "true").lower() not in ("0", "false", "no")
+        self.warmup = os.getenv("OLLAMA_WARMUP", "true").lower() not in ("0", "false", "no")
+        self.model = os.getenv("OLLAMA_MODEL", "llama3.1")
+        self.startup_timeout = float(os.getenv("OLLAMA_STARTUP_TIMEOUT") or DEFAULT_STARTUP_TIMEOUT)
+        self.health_interval = float(os.getenv("OLLAMA_HEALTH_INTERVAL") or DEFAULT_HEALTH_INTERVAL)
+
+        self.state = "disabled" if not self.autostart else "starting"
+        self.model_warm = False
+        self.managed = False
+        self.restarts = 0
+        self.last_error: Optional[str] = None
+        self.ready_since: Optional[float] = None
+        self.warmup_ms: Optional[int] = None
+
+        # asyncio 서브프로세스는 Windows SelectorEventLoop(uvicorn reload)에서 지원되지 않으므로
+        # subprocess.Popen으로 띄우고 대기는 스레드에서 처리
+        self._process: Optional[subprocess.Popen] = None
+        self._task: Optional[asyncio.Task] = None
+        # 상태 확인/워밍업 전용 연결 (생성 요청 연결 풀이 가득 차도 상태 확인이 막히지 않도록 분리)
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=get_llm_clients().ollama_url,
+                limits=httpx.Limits(max_connections=1, max_keepalive_connections=1),
+                timeout=httpx.Timeout(HEALTH_CHECK_TIMEOUT),
+            )
+        return self._client
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def start(self) -> None:
+        """감독 태스크 시작 (즉시 반환)"""
+        if not self.autostart or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run(), name="ollama-supervisor")
+
+    async def stop(self) -> None:
+        """감독 태스크 종료 및 직접 띄운 프로세스 정리"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._process is not None and self._process.poll() is None:
+            _log("MINOR", "STOP", f"Stopping Ollama (pid={self._process.pid})")
+            self._process.terminate()
+            try:
+                await asyncio.to_thread(self._process.wait, 5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                await asyncio.to_thread(self._process.wait)
+        self._process = None
+        self.model_warm = False
+        if self.autostart:
+            self.state = "stopped"
+
+    async def _healthy(self) -> bool:
+        try:
+            response = await self.client.get("/api/tags")
+            return response.status_code == 200
+        except Exception:
+            return False
+
+    async def _run(self) -> None:
+        backoff = RESTART_BACKOFF_INITIAL
+        while True:
+            try:
+                if not await self._ensure_server():
+                    if self.state == "not_installed":
+                        return
+                    self._set_unavailable()
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, RESTART_BACKOFF_MAX)
+                    continue
+
+                if self.warmup and not self.model_warm:
+                    await self._warm_model()
+                self.state = "ready"
+                self.ready_since = self.ready_since or time.monotonic()
+
+                await self._watch()
+                # 여기로 오면 서버가 응답하지 않음
+                if self.ready_since and time.monotonic() - self.ready_since >= STABLE_AFTER:
+                    backoff = RESTART_BACKOFF_INITIAL
+                self._set_unavailable()
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, RESTART_BACKOFF_MAX)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = str(e)
+                _log("WARNING", "ERROR", str(e))
+                self._set_unavailable()
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, RESTART_BACKOFF_MAX)
+
+    def _set_unavailable(self) -> None:
+        if self.state != "unavailable":
+            _log("WARNING", "UNAVAILABLE", "Ollama is not responding")
+        self.state = "unavailable"
+        self.model_warm = False
+        self.ready_since = None
+
+    async def _ensure_server(self) -> bool:
+        """서버가 응답하면 True - 없으면 `ollama serve`를 띄우고 응답할 때까지 대기"""
+        if await self._healthy():
+            if not self.managed and self.state == "starting":
+                _log("MINOR", "START", "OK - Ollama is already running")
+            return True
+
+        if self._process is None or self._process.poll() is not None:
+            if self._process is not None:
+                self.restarts += 1
+                _log("WARNING", "RESTART", f"Ollama exited (code={self._process.returncode}) - restarting")
+            else:
+                _log("MINOR", "START", "Starting Ollama service...")
+            try:
+                self._process = subprocess.Popen(
+                    ["ollama", "serve"],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
+            except FileNotFoundError:
+                self.state = "not_installed"
+                self.last_error = "ollama not found in PATH"
+                _log("CRITICAL", "START", "ERROR - Ollama not found in PATH - please install Ollama first")
+                return False
+            self.managed = True
+
+        self.state = "starting"
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                self.last_error = f"ollama serve exited with code {self._process.returncode}"
+                return False
+            if await self._healthy():
+                _log("MAJOR", "START", f"OK - Ollama started (pid={self._process.pid})")
+                return True
+            await asyncio.sleep(0.5)
+
+        self.last_error = f"Ollama startup timeout ({self.startup_timeout:.0f}s)"
+        _log("WARNING", "START", f"WARN - {self.last_error}")
+        return False
+
+    async def _warm_model(self) -> None:
+        """짧은 프롬프트로 모델을 메모리에 올리고 keep_alive 동안 유지"""
+        self.state = "warming"
+        clients = get_llm_clients()
+        started = time.monotonic()
+        try:
+            response = await self.client.post(
+                "/api/generate",
+                json={
+                    "model": self.model,
+                    "prompt": "안녕하세요",
+                    "stream": False,
+                    "keep_alive": clients.ollama_keep_alive,
+                    "options": {"num_predict": 1},
+                },
+                timeout=WARMUP_TIMEOUT,
+            )
+            if response.status_code == 404:
+                # 모델 미설치 - 서버는 사용할 수 있으므로 ready로 두고 사유만 기록
+                self.last_error = f"model {self.model} not found (run: ollama pull {self.model})"
+                _log("WARNING", "WARMUP", self.last_error)
+                return
+            response.raise_for_status()
+        except Exception as e:
+            self.last_error = f"warmup failed: {e}"
+            _log("WARNING", "WARMUP", self.last_error)
+            return
+
+        self.model_warm = True
+        self.warmup_ms = int((time.monotonic() - started) * 1000)
+        _log("MAJOR", "WARMUP", f"OK - {self.model} loaded in {self.warmup_ms}ms (keep_alive={clients.ollama_keep_alive})")
+
+    async def _watch(self) -> None:
+        """서버가 응답하지 않을 때까지 대기 (직접 띄운 프로세스는 종료 즉시 감지)"""
+        while True:
+            if self._process is not None and self._process.poll() is None:
+                try:
+                    await asyncio.to_thread(self._process.wait, self.health_interval)
+                    return
+                except subprocess.TimeoutExpired:
+                    pass
+            else:
+                await asyncio.sleep(self.health_interval)
+            if not await self._healthy():
+                return
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "ready": self.ready,
+            "model": self.model,
+            "modelWarm": self.model_warm,
+            "warmupMs": self.warmup_ms,
+            "managed": self.managed,
+            "pid": self._process.pid if self._process is not None and self._process.poll() is None else None,
+            "restarts": self.restarts,
+            "lastError": self.last_error,
+        }
+
+
+# 싱글톤 인스턴스
+_ollama_supervisor: Optional[OllamaSupervisor] = None
+
+
+def get_ollama_supervisor() -> OllamaSupervisor:
+    """Ollama 감독 인스턴스 반환 (없으면 생성)"""
+    global _ollama_supervisor
+
+    if _ollama_supervisor is None:
+        _ollama_supervisor = OllamaSupervisor()
+
+    return _ollama_supervisor
@@ -0,0 +1,304 @@
+"""
+PPT 파싱 엔진
+python-pptx 파싱과 슬라이드 래스터화를 미리 띄워둔 프로세스 풀에서 실행하여
+이벤트 루프(다른 API 요청)를 블로킹하지 않도록 함
+"""
+
+import asyncio
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+
+def _log(level: str, step: str, message: str):
+    timestamp = datetime.utcnow().isoformat()
+    print(f"[{timestamp}] [PARSE_ENGINE] [{level}] [{step}] {message}")
+
+
+class ParseTimeoutError(RuntimeError):
+    """파싱 작업이 제한 시간을 초과함"""
+
+
+class ParseWorkerCrashedError(RuntimeError):
+    """파싱 워커 프로세스가 비정상 종료됨"""
+
+
+def _warm_worker() -> None:
+    """워커 초기화 - 무거운 모듈을 미리 import하여 첫 요청 지연 제거"""
+    import pptx  # noqa: F401
+    import PIL.Image  # noqa: F401
+    from app.services import image_normalizer  # noqa: F401
+    from app.services import ppt_parser  # noqa: F401
+    from app.services import ppt_text_parser  # noqa: F401
+    from app.services import slide_rasterizer  # noqa: F401
+
+
+def _ping() -> int:
+    """워커 예열용 빈 작업"""
+    return os.getpid()
+
+
+def _parse_job(
+    source: Union[bytes, str],
+    mode: str,
+    slide_range: Optional[Tuple[int, int]] = None,
+) -> Dict[str, Any]:
+    """워커 프로세스에서 실행되는 파싱 작업 (slide_range가 있으면 해당 구간만)"""
+    from app.services.ppt_parser import parse_ppt_file
+    return parse_ppt_file(source, mode=mode, slide_range=slide_range)
+
+
+def _rasterize_job(layout: Dict[str, Any]) -> Dict[str, str]:
+    """워커 프로세스에서 실행되는 슬라이드 래스터화 작업"""
+    from app.services.slide_rasterizer import rasterize_slide
+    return rasterize_slide(layout)
+
+
+class ParseEngine:
+    """프로세스 풀 기반 PPT 파싱 엔진"""
+
+    def __init__(self, max_workers: Optional[int] = None, timeout: Optional[float] = None):
+        default_workers = min(os.cpu_count() or 1, 4)
+        self.max_workers = max_workers or int(os.getenv("PPT_PARSE_WORKERS", "0")) or default_workers
+        self.timeout = timeout or float(os.getenv("PPT_PARSE_TIMEOUT", "300"))
+        # 이 슬라이드 수 이상이면 구간으로 나눠 여러 워커에서 동시에 파싱
+        self.shard_min_slides = int(os.getenv("PPT_SHARD_MIN_SLIDES", "50"))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # 워커 수만큼만 제출 - 작업이 풀 큐에서 기다리지 않으므로 타임아웃은 실행 시간만 셈
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._restarts = 0
+
+    def start(self) -> None:
+        """프로세스 풀 생성 및 워커 예열 (완료를 기다리지 않음)"""
+        with self._lock:
+            if self._executor is None:
+                self._create_executor()
+
+    def shutdown(self) -> None:
+        """프로세스 풀 종료"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "workers": self.max_workers,
+            "timeout": self.timeout,
+            "shardMinSlides": self.shard_min_slides,
+            "running": self._executor is not None,
+            "restarts": self._restarts,
+        }
+
+    def _create_executor(self) -> None:
+        # Windows와 동작을 맞추고 이벤트 루프 스레드의 fork를 피하기 위해 spawn 사용
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker,
+        )
+        self._generation += 1
+        for _ in range(self.max_workers):
+            self._executor.submit(_ping)
+        _log("MINOR", "START", f"workers={self.max_workers} generation={self._generation}")
+
+    def _restart(self, generation: int, reason: str) -> None:
+        """
+        고장났거나 멈춘 풀을 폐기하고 새로 생성
+
+        ProcessPoolExecutor는 워커 하나만 종료해도 풀 전체를 고장(BrokenProcessPool)으로 처리하고
+        어느 워커가 멈춘 작업을 실행 중인지 알려주지 않으므로, 멈춘 작업만 따로 끊을 수 없습니다.
+        그래서 풀 전체를 종료하며, 그때 다른 워커에서 실행 중이던 작업은 _run이 새 풀에서
+        한 번 다시 실행합니다 (처음부터 다시 실행되므로 그만큼 늦어짐).
+        """
+        with self._lock:
+            if generation != self._generation:
+                # 다른 작업이 이미 재시작함
+                return
+            executor = self._executor
+            if executor is not None:
+                # 멈춘 워커는 shutdown으로 종료되지 않으므로 직접 종료
+                for process in list((getattr(executor, "_processes", None) or {}).values()):
+                    try:
+                        process.terminate()
+                    except Exception:
+                        pass
+                executor.shutdown(wait=False, cancel_futures=True)
+            self._restarts += 1
+            _log("WARNING", "RESTART", reason)
+            self._create_executor()
+
+    def _limit(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+        return self._slots
+
+    async def _run(self, job: Callable[..., Any], *args: Any) -> Any:
+        """
+        작업을 워커 프로세스에서 실행 (타임아웃/크래시 시 풀 재시작)
+
+        동시에 제출하는 작업은 워커 수 이하로 제한하고, 타임아웃은 슬롯을 얻은 뒤(실행 시작)부터 셉니다.
+        자리를 기다리는 시간 때문에 타임아웃이 나서 다른 요청의 작업까지 중단되는 일을 막습니다.
+        """
+        async with self._limit():
+            # 다른 작업의 타임아웃으로 풀이 재시작된 경우 한 번 재시도
+            for attempt in range(2):
+                with self._lock:
+                    if self._executor is None:
+                        self._create_executor()
+                    executor = self._executor
+                    generation = self._generation
+
+                future = executor.submit(job, *args)
+                try:
+                    return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+                except asyncio.TimeoutError:
+                    self._restart(generation, f"{job.__name__} timed out after {self.timeout}s")
+                    raise ParseTimeoutError(f"PPT 처리 시간 초과 ({self.timeout:.0f}초)")
+                except asyncio.CancelledError:
+                    # 다른 작업이 풀을 재시작하면서 시작 전 작업을 취소한 경우만 재시도
+                    # (이 요청 자체의 취소는 그대로 전파)
+                    if not future.cancelled() or generation == self._generation:
+                        raise
+                    if attempt == 0:
+                        continue
+                    raise ParseWorkerCrashedError("PPT 처리 워커가 비정상 종료되었습니다")
+                except BrokenProcessPool:
+                    if generation != self._generation and attempt == 0:
+                        continue
+                    self._restart(generation, "worker process crashed")
+                    raise ParseWorkerCrashedError("PPT 처리 워커가 비정상 종료되었습니다")
+
+            raise ParseWorkerCrashedError("PPT 처리 워커가 비정상 종료되었습니다")
+
+    def plan_shards(self, slide_count: int) -> List[Tuple[int, int]]:
+        """
+        슬라이드 구간 분할 계획 [(start, end), ...] (end 미포함, 슬라이드 번호는 1부터)
+
+        분할할 만큼 크지 않으면 빈 목록을 반환합니다.
+        """
+        shard_count = min(self.max_workers, slide_count // max(self.shard_min_slides, 1))
+        if shard_count <= 1:
+            return []
+        size = math.ceil(slide_count / shard_count)
+        return [
+            (start, min(start + size, slide_count + 1))
+            for start in range(1, slide_count + 1, size)
+        ]
+
+    async def parse(
+        self,
+        source: Union[bytes, str],
+        mode: str = "full",
+        on_progress: Optional[Callable[[int, int, str], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        PPT 파일을 워커 프로세스에서 파싱
+
+        source는 파일 경로를 권장합니다 (바이트를 워커로 복사하지 않음).
+        전체 파싱 모드에서 슬라이드가 많으면 구간별로 나눠 여러 워커에서 파싱한 뒤
+        슬라이드 순서대로 병합하며, 구간이 끝날 때마다 on_progress(완료 슬라이드, 전체, 설명)를 호출합니다.
+        """
+        if mode == "full" and isinstance(source, str):
+            from app.services.ppt_text_parser import count_slides
+            try:
+                slide_count = await asyncio.to_thread(count_slides, source)
+            except Exception:
+                # 손상된 파일은 일반 파싱 경로에서 오류를 보고
+                slide_count = 0
+            shards = self.plan_shards(slide_count)
+            if shards:
+                return await self._parse_sharded(source, mode, shards, slide_count, on_progress)
+
+        return await self._run(_parse_job, source, mode)
+
+    async def _parse_sharded(
+        self,
+        source: str,
+        mode: str,
+        shards: List[Tuple[int, int]],
+        slide_count: int,
+        on_progress: Optional[Callable[[int, int, str], None]],
+    ) -> Dict[str, Any]:
+        from app.services.ppt_parser import merge_parse_results
+
+        _log("MINOR", "SHARD", f"slides={slide_count} shards={len(shards)}")
+        completed = {"shards": 0, "slides": 0}
+
+        async def run_shard(slide_range: Tuple[int, int]) -> Dict[str, Any]:
+            result = await self._run(_parse_job, source, mode, slide_range)
+            completed["shards"] += 1
+            completed["slides"] += slide_range[1] - slide_range[0]
+            if on_progress:
+                on_progress(
+                    completed["slides"],
+                    slide_count,
+                    f"슬라이드 분석 중... ({completed['shards']}/{len(shards)} 구간 완료)",
+                )
+            return result
+
+        # 각 워커가 같은 파일을 읽기 전용으로 열어 자기 구간만 추출
+        results = await asyncio.gather(*(run_shard(slide_range) for slide_range in shards))
+        return merge_parse_results(list(results))
+
+    async def rasterize(
+        self,
+        layouts: List[Optional[Dict[str, Any]]],
+        on_progress: Optional[Callable[[int, int, str], None]] = None,
+    ) -> Tuple[List[Dict[str, str]], List[int]]:
+        """
+        슬라이드 레이아웃들을 워커 프로세스에 나눠 래스터화
+
+        한 번에 워커 수만큼만 제출하므로 큰 덱도 다른 요청의 파싱 작업과 번갈아 워커를 씁니다.
+        슬라이드가 끝날 때마다 on_progress(완료 슬라이드, 전체, 설명)를 호출합니다.
+
+        Returns:
+            (슬라이드별 프레임 URL, 래스터화에 실패한 슬라이드 인덱스 목록)
+            레이아웃이 없거나 실패한 슬라이드의 프레임은 빈 딕셔너리입니다.
+        """
+        total = len(layouts)
+        frames: List[Dict[str, str]] = [{} for _ in layouts]
+        failed: List[int] = []
+        queue = iter(range(total))
+        completed = {"slides": 0}
+
+        async def worker() -> None:
+            for index in queue:
+                layout = layouts[index]
+                if layout:
+                    try:
+                        frames[index] = await self._run(_rasterize_job, layout)
+                    except Exception as e:
+                        _log("WARNING", "RASTERIZE", f"slide index={index}: {type(e).__name__}: {e}")
+                        failed.append(index)
+                completed["slides"] += 1
+                if on_progress:
+                    on_progress(
+                        completed["slides"],
+                        total,
+                        f"슬라이드 이미지 생성 중... ({completed['slides']}/{total})",
+                    )
+
+        await asyncio.gather(*(worker() for _ in range(min(self.max_workers, total))))
+        return frames, sorted(failed)
+
+
+# 싱글톤 인스턴스
+_parse_engine: Optional[ParseEngine] = None
+
+
+def get_parse_engine() -> ParseEngine:
+    """파싱 엔진 인스턴스 반환 (없으면 생성)"""
+    global _parse_engine
+
+    if _parse_engine is None:
+        _parse_engine = ParseEngine()
+
+    return _parse_engine
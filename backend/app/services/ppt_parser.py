@@ -5,11 +5,25 @@ python-pptx를 사용한 PowerPoint 파일 분석
 
 import io
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Union
 from pptx import Presentation
-from pptx.util import Pt
-from pptx.enum.text import MSO_ANCHOR
-from PIL import Image
+from pptx.enum.shapes import MSO_SHAPE_TYPE, PP_PLACEHOLDER
+from pptx.shapes.picture import Picture
+
+from app.services.image_normalizer import ImageNormalizer, NormalizationReport
+from app.services.image_store import get_image_store
+
+# 파싱 결과 형식이 바뀌면 올려서 파싱 캐시를 무효화
+PARSER_VERSION = 7
+
+# 지원하는 파싱 모드
+PARSE_MODES = ("full", "text")
+
+TITLE_PLACEHOLDER_TYPES = (
+    PP_PLACEHOLDER.TITLE,
+    PP_PLACEHOLDER.CENTER_TITLE,
+    PP_PLACEHOLDER.VERTICAL_TITLE,
+)
 
 
 class Slide:
@@ -19,18 +33,181 @@ class Slide:
         self.slide_number = slide_number
         self.title = title or f"Slide {slide_number}"
         self.content = ""
-        self.image_data: List[bytes] = []
+        self.image_urls: List[str] = []
         self.notes = ""
+        # 래스터화용 레이아웃 (전체 파싱 모드에서만 채워짐)
+        self.layout: Optional[Dict[str, Any]] = None
         
     def to_dict(self) -> Dict[str, Any]:
-        return {
+        data = {
             "slideId": self.slide_id,
             "slideNumber": self.slide_number,
             "title": self.title,
             "content": self.content,
-            "imageUrls": [],  # 나중에 R2에 업로드 후 채움
+            "imageUrls": self.image_urls,
             "notes": self.notes,
         }
+        if self.layout is not None:
+            data["layout"] = self.layout
+        return data
+
+
+def join_slide_text(slides: List[Slide]) -> str:
+    """모든 슬라이드의 제목/본문을 하나의 텍스트로 통합"""
+    all_text = []
+    for slide in slides:
+        if slide.title:
+            all_text.append(f"# {slide.title}")
+        if slide.content:
+            all_text.append(slide.content)
+        all_text.append("")
+    
+    return "\n".join(all_text)
+
+
+# 그룹 좌표계 변환 (x' = ax * x + bx, y' = ay * y + by)
+IDENTITY_TRANSFORM = (1.0, 0.0, 1.0, 0.0)
+
+
+class SlideShapeVisitor:
+    """
+    슬라이드 도형 단일 순회 방문자
+
+    제목, 본문 텍스트, 표, 그룹 도형(재귀), 그림을 한 번의 순회로 수집합니다.
+    래스터화를 위해 각 도형의 슬라이드 좌표(EMU) 레이아웃도 그리기 순서대로 기록합니다.
+    """
+
+    def __init__(self):
+        self.title = ""
+        self.text_parts: List[str] = []
+        # (그림 도형, 레이아웃 요소) - 이미지 URL은 저장 후 요소에 채워짐
+        self.pictures: List[Tuple[Picture, Dict[str, Any]]] = []
+        self.elements: List[Dict[str, Any]] = []
+        self._title_found = False
+
+    def visit(self, shapes, depth: int = 0, transform: Tuple[float, ...] = IDENTITY_TRANSFORM) -> None:
+        for shape in shapes:
+            try:
+                self._visit_shape(shape, depth, transform)
+            except Exception:
+                # 손상되었거나 지원하지 않는 도형은 건너뜀
+                continue
+
+    def _visit_shape(self, shape, depth: int, transform: Tuple[float, ...]) -> None:
+        if self._shape_type(shape) == MSO_SHAPE_TYPE.GROUP:
+            self.visit(shape.shapes, depth + 1, self._group_transform(shape, transform))
+            return
+
+        box = self._box(shape, transform)
+
+        # 제목 플레이스홀더는 최상위의 첫 번째 것만 제목으로 사용
+        if depth == 0 and not self._title_found and self._is_title(shape):
+            self._title_found = True
+            self.title = shape.text_frame.text.strip()
+            self._add_text_element(box, shape.text_frame, self.title, "title")
+            return
+
+        if isinstance(shape, Picture):
+            element = {"kind": "picture", "box": box, "image": None}
+            self.pictures.append((shape, element))
+            self.elements.append(element)
+            return
+
+        if shape.has_table:
+            table_text = self._table_text(shape.table)
+            if table_text:
+                self.text_parts.append(table_text)
+                self._add_text_element(box, None, table_text, "table")
+            return
+
+        if shape.has_text_frame:
+            text = shape.text_frame.text.strip()
+            if text:
+                self.text_parts.append(text)
+                self._add_text_element(box, shape.text_frame, text, "body")
+
+    def _add_text_element(self, box, text_frame, text: str, role: str) -> None:
+        if box is None or not text:
+            return
+        element = {"kind": "text", "box": box, "text": text, "role": role}
+        if text_frame is not None:
+            element.update(self._text_style(text_frame))
+        self.elements.append(element)
+
+    @staticmethod
+    def _box(shape, transform: Tuple[float, ...]) -> Optional[List[int]]:
+        """도형 위치를 슬라이드 좌표(EMU)로 변환 [left, top, width, height]"""
+        if None in (shape.left, shape.top, shape.width, shape.height):
+            return None
+        ax, bx, ay, by = transform
+        return [
+            int(ax * shape.left + bx),
+            int(ay * shape.top + by),
+            int(ax * shape.width),
+            int(ay * shape.height),
+        ]
+
+    @staticmethod
+    def _group_transform(group, transform: Tuple[float, ...]) -> Tuple[float, ...]:
+        """그룹 내부 좌표계(chOff/chExt)를 부모 좌표계로 옮기는 변환 계산"""
+        xfrm = group._element.xfrm
+        if xfrm is None or xfrm.chOff is None or xfrm.chExt is None or xfrm.off is None or xfrm.ext is None:
+            return transform
+        ch_x, ch_y = xfrm.chOff.x, xfrm.chOff.y
+        ch_w, ch_h = xfrm.chExt.cx or 1, xfrm.chExt.cy or 1
+        scale_x = xfrm.ext.cx / ch_w
+        scale_y = xfrm.ext.cy / ch_h
+        ax, bx, ay, by = transform
+        return (
+            ax * scale_x,
+            ax * (xfrm.off.x - ch_x * scale_x) + bx,
+            ay * scale_y,
+            ay * (xfrm.off.y - ch_y * scale_y) + by,
+        )
+
+    @staticmethod
+    def _text_style(text_frame) -> Dict[str, Any]:
+        """첫 번째로 명시된 글꼴 크기/굵기/색상과 문단 정렬"""
+        style: Dict[str, Any] = {}
+        for paragraph in text_frame.paragraphs:
+            if "align" not in style and paragraph.alignment is not None:
+                style["align"] = str(paragraph.alignment).split(".")[-1].split(" ")[0].lower()
+            for run in paragraph.runs:
+                font = run.font
+                if "fontSize" not in style and font.size is not None:
+                    style["fontSize"] = font.size.pt
+                if "bold" not in style and font.bold is not None:
+                    style["bold"] = bool(font.bold)
+                if "color" not in style:
+                    try:
+                        if font.color.type is not None and font.color.rgb is not None:
+                            style["color"] = str(font.color.rgb)
+                    except AttributeError:
+                        pass
+        return style
+
+    @staticmethod
+    def _shape_type(shape):
+        # 알 수 없는 자동 도형은 shape_type 접근 시 예외가 발생함
+        try:
+            return shape.shape_type
+        except NotImplementedError:
+            return None
+
+    @staticmethod
+    def _is_title(shape) -> bool:
+        if not shape.is_placeholder:
+            return False
+        return shape.placeholder_format.type in TITLE_PLACEHOLDER_TYPES
+
+    @staticmethod
+    def _table_text(table) -> str:
+        rows = []
+        for row in table.rows:
+            cells = [cell.text.strip() for cell in row.cells]
+            if any(cells):
+                rows.append(" | ".join(cells))
+        return "\n".join(rows)
 
 
 class PptParser:
@@ -39,12 +216,27 @@ class PptParser:
     def __init__(self):
         self.prs: Optional[Presentation] = None
         self.slides: List[Slide] = []
+        self.slide_range: Optional[Tuple[int, int]] = None
+        self.image_report = NormalizationReport()
     
-    def parse_file(self, file_content: bytes) -> Dict[str, Any]:
-        """PPT 파일 파싱"""
+    def parse_file(
+        self,
+        source: Union[bytes, str, Path],
+        slide_range: Optional[Tuple[int, int]] = None,
+    ) -> Dict[str, Any]:
+        """
+        PPT 파일 파싱
+
+        source는 파일 경로 또는 바이너리 데이터입니다.
+        경로를 넘기면 파일 전체를 메모리로 복사하지 않습니다.
+        slide_range=(start, end)를 주면 start <= 슬라이드 번호 < end 인 슬라이드만 추출합니다.
+        """
+        self.slide_range = slide_range
         try:
-            # 바이너리 데이터로부터 Presentation 로드
-            prs = Presentation(io.BytesIO(file_content))
+            if isinstance(source, (bytes, bytearray)):
+                prs = Presentation(io.BytesIO(source))
+            else:
+                prs = Presentation(str(source))
             self.prs = prs
             
             # 슬라이드 추출
@@ -56,6 +248,7 @@ class PptParser:
                 "slides": [slide.to_dict() for slide in self.slides],
                 "extracted_text": self._get_all_text(),
                 "metadata": self._extract_metadata(),
+                "image_report": self.image_report.to_dict(),
             }
         except Exception as e:
             return {
@@ -68,47 +261,36 @@ class PptParser:
         if not self.prs:
             return
         
+        start, end = self.slide_range or (1, len(self.prs.slides) + 1)
+        slide_pictures: List[Tuple[Slide, List[Tuple[Picture, Dict[str, Any]]]]] = []
         for idx, slide in enumerate(self.prs.slides, 1):
+            if not start <= idx < end:
+                continue
             slide_obj = Slide(idx)
             
-            # 슬라이드 제목 추출
-            slide_obj.title = self._extract_title(slide)
+            # 도형을 한 번만 순회하여 제목/텍스트/이미지 수집
+            visitor = SlideShapeVisitor()
+            visitor.visit(slide.shapes)
             
-            # 텍스트 추출
-            slide_obj.content = self._extract_text(slide)
+            slide_obj.title = visitor.title
+            slide_obj.content = "\n".join(visitor.text_parts)
             
             # 발표자 노트 추출
             if slide.has_notes_slide:
                 slide_obj.notes = self._extract_notes(slide)
             
-            # 이미지 추출
-            slide_obj.image_data = self._extract_images(slide)
+            slide_pictures.append((slide_obj, visitor.pictures))
+            
+            slide_obj.layout = {
+                "width": self.prs.slide_width,
+                "height": self.prs.slide_height,
+                "elements": visitor.elements,
+            }
             
             self.slides.append(slide_obj)
-    
-    def _extract_title(self, slide) -> str:
-        """슬라이드 제목 추출"""
-        try:
-            if slide.shapes.title:
-                return slide.shapes.title.text.strip()
-        except:
-            pass
-        return ""
-    
-    def _extract_text(self, slide) -> str:
-        """슬라이드의 모든 텍스트 추출"""
-        text_parts = []
-        
-        try:
-            for shape in slide.shapes:
-                if hasattr(shape, "text") and shape.text.strip():
-                    # 제목은 이미 추출했으므로 스킵
-                    if shape != slide.shapes.title:
-                        text_parts.append(shape.text.strip())
-        except:
-            pass
         
-        return "\n".join(text_parts)
+        # 이미지 추출 (덱 전체 이미지를 한 번에 정규화하여 저장소에 한 벌만 저장)
+        self._extract_images(slide_pictures)
     
     def _extract_notes(self, slide) -> str:
         """발표자 노트 추출"""
@@ -120,34 +302,49 @@ class PptParser:
             pass
         return ""
     
-    def _extract_images(self, slide) -> List[bytes]:
-        """슬라이드에서 이미지 추출"""
-        images = []
+    def _extract_images(
+        self,
+        slide_pictures: List[Tuple[Slide, List[Tuple[Picture, Dict[str, Any]]]]],
+    ) -> None:
+        """
+        방문자가 수집한 그림 도형의 이미지를 정규화/저장하고 슬라이드와 레이아웃에 URL 기록
+
+        같은 이미지 파트는 한 번만 변환하며, 변환할 수 없는 형식(EMF/WMF 등)은
+        URL 없이 image_report의 skipped에 기록됩니다.
+        """
+        # 패키지 파트 이름 -> 원본 바이트 (같은 이미지를 여러 슬라이드에서 재사용)
+        blobs: Dict[str, bytes] = {}
+        partnames: Dict[int, str] = {}
+        for _, pictures in slide_pictures:
+            for picture, element in pictures:
+                try:
+                    image_part = picture.part.related_part(picture._element.blip_rId)
+                except Exception:
+                    # 링크된 이미지 등 내장 데이터가 없는 경우
+                    continue
+                partname = str(image_part.partname)
+                partnames[id(element)] = partname
+                if partname not in blobs:
+                    blobs[partname] = image_part.blob
         
-        try:
-            for shape in slide.shapes:
-                if shape.shape_type == 13:  # PICTURE
-                    try:
-                        image_stream = shape.image.blob
-                        images.append(image_stream)
-                    except:
-                        pass
-        except:
-            pass
+        results, self.image_report = ImageNormalizer().normalize_all(blobs)
+        image_store = get_image_store()
         
-        return images
+        for slide_obj, pictures in slide_pictures:
+            urls = []
+            for _, element in pictures:
+                result = results.get(partnames.get(id(element), ""))
+                if result is None or result.key is None:
+                    continue
+                url = image_store.url_for(result.key)
+                element["image"] = url
+                if url not in urls:
+                    urls.append(url)
+            slide_obj.image_urls = urls
     
     def _get_all_text(self) -> str:
         """모든 슬라이드의 텍스트 통합"""
-        all_text = []
-        for slide in self.slides:
-            if slide.title:
-                all_text.append(f"# {slide.title}")
-            if slide.content:
-                all_text.append(slide.content)
-            all_text.append("")
-        
-        return "\n".join(all_text)
+        return join_slide_text(self.slides)
     
     def _extract_metadata(self) -> Dict[str, Any]:
         """파일 메타데이터 추출"""
@@ -165,7 +362,61 @@ class PptParser:
             return {}
 
 
-def parse_ppt_file(file_content: bytes) -> Dict[str, Any]:
-    """PPT 파일을 파싱하여 반환"""
-    parser = PptParser()
-    return parser.parse_file(file_content)
+def merge_parse_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """분할 파싱 결과(슬라이드 구간 순서)를 하나의 파싱 결과로 병합"""
+    for result in results:
+        if not result.get("success"):
+            return result
+
+    slides = [slide for result in results for slide in result.get("slides", [])]
+    image_report = NormalizationReport()
+    for result in results:
+        report = result.get("image_report") or {}
+        image_report.converted += report.get("converted", 0)
+        image_report.passthrough += report.get("passthrough", 0)
+        image_report.cached += report.get("cached", 0)
+        image_report.skipped.extend(report.get("skipped", []))
+
+    return {
+        "success": True,
+        "total_slides": len(slides),
+        "slides": slides,
+        # 구간별 텍스트는 마지막 슬라이드 뒤 빈 줄이 하나씩 빠져 있으므로 줄바꿈으로 연결
+        "extracted_text": "\n".join(result.get("extracted_text", "") for result in results),
+        "metadata": results[0].get("metadata", {}) if results else {},
+        "image_report": image_report.to_dict(),
+    }
+
+
+def parse_ppt_file(
+    source: Union[bytes, str, Path],
+    mode: str = "full",
+    slide_range: Optional[Tuple[int, int]] = None,
+) -> Dict[str, Any]:
+    """
+    PPT 파일(경로 또는 바이트)을 파싱하여 반환
+
+    mode:
+        - "full": python-pptx 객체 모델로 전체 파싱 (이미지 포함)
+        - "text": OOXML 파트를 직접 읽어 제목/본문/노트만 추출 (빠름)
+    slide_range:
+        (start, end) 슬라이드 번호 범위만 파싱 (대용량 덱 분할 파싱용, 전체 파싱 모드만 지원)
+    """
+    from app.services.ppt_text_parser import compute_slide_hashes, parse_pptx_text
+
+    if mode == "text":
+        result = parse_pptx_text(source)
+    else:
+        parser = PptParser()
+        result = parser.parse_file(source, slide_range=slide_range)
+
+    # 증분 재파싱을 위한 슬라이드별 내용 해시
+    if result.get("success"):
+        try:
+            hashes = compute_slide_hashes(source, slide_range=slide_range)
+            if len(hashes) == len(result["slides"]):
+                for slide_data, content_hash in zip(result["slides"], hashes):
+                    slide_data["contentHash"] = content_hash
+        except Exception as e:
+            print(f"[WARN] Failed to compute slide hashes: {e}")
+    return result
@@ -0,0 +1,308 @@
+"""
+PPT 텍스트 전용 파싱 서비스
+python-pptx 객체 모델을 만들지 않고 zip 안의 OOXML 파트를
+증분 XML 파서로 직접 읽어 제목/본문/노트만 추출
+"""
+
+import hashlib
+import io
+import posixpath
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from xml.etree.ElementTree import iterparse
+
+from app.services.ppt_parser import Slide, join_slide_text
+
+NS_P = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+NS_A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+NS_R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+NS_DC = "{http://purl.org/dc/elements/1.1/}"
+NS_DCTERMS = "{http://purl.org/dc/terms/}"
+
+REL_NOTES_SLIDE = "/notesSlide"
+# 전체 파싱 모드(ppt_parser.TITLE_PLACEHOLDER_TYPES: TITLE, CENTER_TITLE, VERTICAL_TITLE)와 같은 제목 자리표시자
+# (세로 제목은 보통 type="title" orient="vert"로 저장되어 "title"로 처리됨)
+TITLE_PLACEHOLDER_TYPES = ("title", "ctrTitle", "vertTitle")
+
+
+def _rels_path(part_path: str) -> str:
+    """파트 경로에 대응하는 .rels 경로 (ppt/slides/slide1.xml -> ppt/slides/_rels/slide1.xml.rels)"""
+    directory, name = posixpath.split(part_path)
+    return posixpath.join(directory, "_rels", f"{name}.rels")
+
+
+def _read_rels(zf: zipfile.ZipFile, part_path: str) -> Dict[str, Dict[str, str]]:
+    """관계 파일을 읽어 rId -> {type, target(절대 경로)} 매핑 반환"""
+    rels_path = _rels_path(part_path)
+    try:
+        data = zf.read(rels_path)
+    except KeyError:
+        return {}
+
+    base_dir = posixpath.dirname(part_path)
+    rels = {}
+    for _, elem in iterparse(io.BytesIO(data)):
+        if elem.tag != f"{NS_PKG_REL}Relationship":
+            continue
+        target = elem.get("Target", "")
+        if elem.get("TargetMode") != "External":
+            if target.startswith("/"):
+                target = target.lstrip("/")
+            else:
+                target = posixpath.normpath(posixpath.join(base_dir, target))
+        rels[elem.get("Id", "")] = {"type": elem.get("Type", ""), "target": target}
+    return rels
+
+
+def list_slide_parts(zf: zipfile.ZipFile) -> List[str]:
+    """presentation.xml의 sldIdLst 순서대로 슬라이드 파트 경로 반환"""
+    rels = _read_rels(zf, "ppt/presentation.xml")
+    slide_parts = []
+    with zf.open("ppt/presentation.xml") as stream:
+        for _, elem in iterparse(stream):
+            if elem.tag == f"{NS_P}sldId":
+                rel = rels.get(elem.get(f"{NS_R}id", ""))
+                if rel:
+                    slide_parts.append(rel["target"])
+            elif elem.tag == f"{NS_P}sldIdLst":
+                break
+    return slide_parts
+
+
+def count_slides(source: Union[bytes, str, Path]) -> int:
+    """presentation.xml만 읽어 슬라이드 수 반환 (슬라이드 파트는 열지 않음)"""
+    if isinstance(source, (bytes, bytearray)):
+        zf = zipfile.ZipFile(io.BytesIO(source))
+    else:
+        zf = zipfile.ZipFile(str(source))
+    with zf:
+        return len(list_slide_parts(zf))
+
+
+def compute_slide_hashes(
+    source: Union[bytes, str, Path],
+    slide_range: Optional[Tuple[int, int]] = None,
+) -> List[str]:
+    """
+    슬라이드별 내용 해시 계산 (슬라이드 순서대로)
+
+    슬라이드 XML과 관계된 모든 내부 파트(이미지, 노트, 레이아웃 등)의 바이트를 해시합니다.
+    파트 경로는 해시에 넣지 않으므로 파트 이름만 바뀐 슬라이드는 같은 해시가 됩니다.
+    같은 파트를 여러 슬라이드가 공유하면 한 번만 읽습니다.
+    slide_range=(start, end)를 주면 해당 범위 슬라이드의 해시만 계산합니다.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        zf = zipfile.ZipFile(io.BytesIO(source))
+    else:
+        zf = zipfile.ZipFile(str(source))
+
+    part_digests: Dict[str, str] = {}
+
+    def part_digest(part_path: str) -> str:
+        if part_path not in part_digests:
+            digest = hashlib.sha256()
+            try:
+                with zf.open(part_path) as stream:
+                    for chunk in iter(lambda: stream.read(1024 * 1024), b""):
+                        digest.update(chunk)
+            except KeyError:
+                pass
+            part_digests[part_path] = digest.hexdigest()
+        return part_digests[part_path]
+
+    hashes = []
+    with zf:
+        slide_parts = list_slide_parts(zf)
+        if slide_range is not None:
+            slide_parts = slide_parts[slide_range[0] - 1:slide_range[1] - 1]
+        for part_path in slide_parts:
+            digest = hashlib.sha256(part_digest(part_path).encode("ascii"))
+            rels = _read_rels(zf, part_path)
+            # 파트 경로는 제외 - 다시 저장할 때 미디어 번호가 바뀌어도(image3 -> image5) 같은 해시
+            # 관계 ID 순서로 내용 해시만 이어 붙임 (슬라이드 XML이 참조하는 것은 관계 ID)
+            for rel_id in sorted(rels):
+                target = rels[rel_id]["target"]
+                if target.startswith(("http://", "https://", "file:")):
+                    continue
+                digest.update(f"{rel_id}:{part_digest(target)}".encode("utf-8"))
+            hashes.append(digest.hexdigest())
+    return hashes
+
+
+class _ShapeTextCollector:
+    """
+    슬라이드/노트 XML 한 파트를 스트리밍으로 읽으며 도형별 텍스트 수집
+
+    python-pptx의 text_frame.text와 같은 규칙을 따름:
+    문단은 "\\n", 줄바꿈(a:br)은 "\\v"로 연결
+    """
+
+    def __init__(self):
+        self.title: Optional[str] = None
+        self.text_parts: List[str] = []
+        self.body_placeholder_text: Optional[str] = None
+
+    def collect(self, stream) -> None:
+        group_depth = 0
+        shape: Optional[Dict[str, Any]] = None
+        table_rows: Optional[List[str]] = None
+        row_cells: Optional[List[str]] = None
+        cell_paragraphs: Optional[List[str]] = None
+        runs: List[str] = []
+
+        for event, elem in iterparse(stream, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                if tag == f"{NS_P}grpSp":
+                    group_depth += 1
+                elif tag == f"{NS_P}sp":
+                    shape = {"placeholder": None, "paragraphs": [], "depth": group_depth}
+                elif tag == f"{NS_P}ph" and shape is not None:
+                    shape["placeholder"] = elem.get("type", "obj")
+                elif tag == f"{NS_A}tbl":
+                    table_rows = []
+                elif tag == f"{NS_A}tr" and table_rows is not None:
+                    row_cells = []
+                elif tag == f"{NS_A}tc" and row_cells is not None:
+                    cell_paragraphs = []
+                elif tag == f"{NS_A}p":
+                    runs = []
+                continue
+
+            # end 이벤트
+            if tag == f"{NS_A}t":
+                runs.append(elem.text or "")
+            elif tag == f"{NS_A}br":
+                runs.append("\v")
+            elif tag == f"{NS_A}p":
+                paragraph = "".join(runs)
+                if cell_paragraphs is not None:
+                    cell_paragraphs.append(paragraph)
+                elif shape is not None:
+                    shape["paragraphs"].append(paragraph)
+            elif tag == f"{NS_A}tc" and cell_paragraphs is not None:
+                row_cells.append("\n".join(cell_paragraphs).strip())
+                cell_paragraphs = None
+            elif tag == f"{NS_A}tr" and row_cells is not None:
+                if any(row_cells):
+                    table_rows.append(" | ".join(row_cells))
+                row_cells = None
+            elif tag == f"{NS_A}tbl" and table_rows is not None:
+                if table_rows:
+                    self.text_parts.append("\n".join(table_rows))
+                table_rows = None
+                elem.clear()
+            elif tag == f"{NS_P}sp" and shape is not None:
+                self._finish_shape(shape)
+                shape = None
+                elem.clear()
+            elif tag == f"{NS_P}grpSp":
+                group_depth -= 1
+                elem.clear()
+
+    def _finish_shape(self, shape: Dict[str, Any]) -> None:
+        text = "\n".join(shape["paragraphs"]).strip()
+        placeholder = shape["placeholder"]
+
+        # 최상위의 첫 번째 제목 플레이스홀더만 제목으로 사용
+        if placeholder in TITLE_PLACEHOLDER_TYPES and shape["depth"] == 0 and self.title is None:
+            self.title = text
+            return
+        if placeholder == "body" and self.body_placeholder_text is None:
+            self.body_placeholder_text = text
+        if text:
+            self.text_parts.append(text)
+
+
+class OoxmlTextParser:
+    """OOXML 파트를 직접 읽는 텍스트 전용 PPT 파서"""
+
+    def __init__(self):
+        self.slides: List[Slide] = []
+
+    def parse_file(self, source: Union[bytes, str, Path]) -> Dict[str, Any]:
+        """PPT 파일 텍스트 파싱 (PptParser.parse_file과 같은 결과 형식)"""
+        try:
+            if isinstance(source, (bytes, bytearray)):
+                zf = zipfile.ZipFile(io.BytesIO(source))
+            else:
+                zf = zipfile.ZipFile(str(source))
+
+            with zf:
+                for idx, part_path in enumerate(list_slide_parts(zf), 1):
+                    self.slides.append(self._parse_slide(zf, idx, part_path))
+                metadata = self._extract_metadata(zf)
+
+            return {
+                "success": True,
+                "total_slides": len(self.slides),
+                "slides": [slide.to_dict() for slide in self.slides],
+                "extracted_text": join_slide_text(self.slides),
+                "metadata": metadata,
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+            }
+
+    def _parse_slide(self, zf: zipfile.ZipFile, slide_number: int, part_path: str) -> Slide:
+        slide_obj = Slide(slide_number)
+
+        collector = _ShapeTextCollector()
+        with zf.open(part_path) as stream:
+            collector.collect(stream)
+        slide_obj.title = collector.title or ""
+        slide_obj.content = "\n".join(collector.text_parts)
+
+        # 발표자 노트 (본문 플레이스홀더)
+        for rel in _read_rels(zf, part_path).values():
+            if rel["type"].endswith(REL_NOTES_SLIDE):
+                notes_collector = _ShapeTextCollector()
+                try:
+                    with zf.open(rel["target"]) as stream:
+                        notes_collector.collect(stream)
+                except KeyError:
+                    break
+                slide_obj.notes = notes_collector.body_placeholder_text or ""
+                break
+
+        return slide_obj
+
+    def _extract_metadata(self, zf: zipfile.ZipFile) -> Dict[str, Any]:
+        """docProps/core.xml에서 메타데이터 추출"""
+        values: Dict[str, str] = {}
+        try:
+            with zf.open("docProps/core.xml") as stream:
+                for _, elem in iterparse(stream):
+                    if elem.tag in (f"{NS_DC}title", f"{NS_DC}creator", f"{NS_DCTERMS}created"):
+                        values[elem.tag] = (elem.text or "").strip()
+        except KeyError:
+            return {}
+
+        return {
+            "pptTitle": values.get(f"{NS_DC}title") or "Untitled",
+            "pptAuthor": values.get(f"{NS_DC}creator") or "Unknown",
+            "createdAt": self._format_created(values.get(f"{NS_DCTERMS}created", "")),
+        }
+
+    @staticmethod
+    def _format_created(value: str) -> str:
+        """W3CDTF 날짜를 python-pptx의 str(datetime) 형식으로 변환"""
+        if not value:
+            return ""
+        for fmt in ("%Y-%m-%dT%H:%M:%SZ", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d"):
+            try:
+                return str(datetime.strptime(value, fmt))
+            except ValueError:
+                continue
+        return value
+
+
+def parse_pptx_text(source: Union[bytes, str, Path]) -> Dict[str, Any]:
+    """PPT 파일에서 텍스트(제목/본문/노트)만 빠르게 추출"""
+    parser = OoxmlTextParser()
+    return parser.parse_file(source)
@@ -0,0 +1,388 @@
+"""
+LLM 공급자 라우터
+공급자별 지연 시간 분포와 연속 실패를 추적하여
+- 연속으로 실패한 공급자는 회로를 열어 일정 시간 건너뛰고
+- 우선 공급자가 자신의 p95 지연을 넘기면 다음 공급자로 헤지 요청을 보내
+먼저 성공한 응답을 사용 (나머지 요청은 취소)
+헤지 시간은 동시 요청 슬롯을 얻은 뒤부터 재므로, 로컬 대기열에서 기다리는 요청은 헤지하지 않음
+(오류율은 /api/status 확인용 통계이며 라우팅에는 쓰지 않음)
+"""
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from app.services.llm_clients import get_llm_clients
+
+# 지연 시간/성공 여부를 보관할 최근 요청 수
+STATS_WINDOW = 200
+
+# p95를 헤지 기준으로 쓰기 위한 최소 표본 수 (그 전에는 LLM_HEDGE_DELAY 사용)
+HEDGE_MIN_SAMPLES = 5
+DEFAULT_HEDGE_DELAY = 20.0
+# p95가 아주 작아도 이보다 빨리 헤지하지 않음 (초)
+MIN_HEDGE_DELAY = 0.5
+
+DEFAULT_CIRCUIT_FAILURES = 3
+DEFAULT_CIRCUIT_COOLDOWN = 30.0
+
+# 공급자 호출: 스트리밍 조각 콜백(없으면 None)을 받아 생성 텍스트(실패 시 None) 반환
+ProviderCall = Callable[[Optional[Callable[[str], None]]], Awaitable[Optional[str]]]
+
+
+def _log(level: str, step: str, message: str):
+    timestamp = datetime.utcnow().isoformat()
+    print(f"[{timestamp}] [PROVIDER_ROUTER] [{level}] [{step}] {message}")
+
+
+def _percentile(values: List[float], p: float) -> Optional[float]:
+    """nearest-rank 백분위수 (값이 없으면 None)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(int(math.ceil(p / 100 * len(ordered))) - 1, 0)
+    return ordered[rank]
+
+
+class CircuitBreaker:
+    """
+    공급자 회로 차단기
+
+    - closed: 정상 호출
+    - open: 연속 failure_threshold회 실패 후 cooldown 동안 호출하지 않음
+    - half_open: cooldown이 지나면 시험 요청 하나만 허용 (성공하면 closed, 실패하면 다시 open)
+    """
+
+    def __init__(self, failure_threshold: int, cooldown: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        self.opened_count = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+    def available(self) -> bool:
+        state = self.state
+        return state == "closed" or (state == "half_open" and not self.probing)
+
+    def begin(self) -> None:
+        """호출 시작 (half_open이면 시험 요청으로 표시)"""
+        if self.state == "half_open":
+            self.probing = True
+
+    def release(self) -> None:
+        """결과 없이 끝난 호출 (헤지에서 져서 취소됨)"""
+        self.probing = False
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self) -> bool:
+        """실패 기록 후 이번 실패로 회로가 열렸으면 True"""
+        self.consecutive_failures += 1
+        reopen = self.probing
+        self.probing = False
+        if reopen or (self.opened_at is None and self.consecutive_failures >= self.failure_threshold):
+            self.opened_at = time.monotonic()
+            self.opened_count += 1
+            return True
+        return False
+
+
+class ProviderStats:
+    """공급자 한 곳의 최근 요청 지연 시간(요청 종류별)과 성공 여부"""
+
+    def __init__(self):
+        self.latencies: Dict[str, Deque[float]] = {}
+        self.outcomes: Deque[bool] = deque(maxlen=STATS_WINDOW)
+        self.requests = 0
+        self.failures = 0
+        self.cancelled = 0
+
+    def record(self, kind: str, latency: float, ok: bool) -> None:
+        self.requests += 1
+        self.outcomes.append(ok)
+        if ok:
+            # 실패는 대부분 즉시 끝나므로(연결 거부 등) 지연 분포에서 제외
+            self.latencies.setdefault(kind, deque(maxlen=STATS_WINDOW)).append(latency)
+        else:
+            self.failures += 1
+
+    def samples(self, kind: str) -> int:
+        return len(self.latencies.get(kind, ()))
+
+    def percentile(self, kind: str, p: float) -> Optional[float]:
+        return _percentile(list(self.latencies.get(kind, ())), p)
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return sum(1 for ok in self.outcomes if not ok) / len(self.outcomes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        latency = {}
+        for kind in self.latencies:
+            latency[kind] = {
+                "samples": self.samples(kind),
+                **{
+                    f"p{p}": round(self.percentile(kind, p), 3)
+                    for p in (50, 95, 99)
+                },
+            }
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "cancelled": self.cancelled,
+            "errorRate": round(self.error_rate, 3),
+            "latency": latency,
+        }
+
+
+class ProviderRouter:
+    """
+    공급자 체인 호출
+
+    calls에 넣은 순서가 우선순위입니다. 회로가 열린 공급자는 건너뛰고,
+    실행 중인 공급자가 실패하면 다음 공급자를 호출하며,
+    우선 공급자가 p95 지연을 넘기면 다음 공급자를 동시에 호출(헤지)합니다.
+    모든 공급자가 실패하면 None을 반환합니다.
+    """
+
+    def __init__(self):
+        self.hedging = os.getenv("LLM_HEDGING", "true").lower() not in ("0", "false", "no")
+        self.default_hedge_delay = float(os.getenv("LLM_HEDGE_DELAY") or DEFAULT_HEDGE_DELAY)
+        self.circuit_failures = int(os.getenv("LLM_CIRCUIT_FAILURES") or DEFAULT_CIRCUIT_FAILURES)
+        self.circuit_cooldown = float(os.getenv("LLM_CIRCUIT_COOLDOWN") or DEFAULT_CIRCUIT_COOLDOWN)
+        self.stats: Dict[str, ProviderStats] = {}
+        self.circuits: Dict[str, CircuitBreaker] = {}
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def _stats(self, provider: str) -> ProviderStats:
+        if provider not in self.stats:
+            self.stats[provider] = ProviderStats()
+        return self.stats[provider]
+
+    def _circuit(self, provider: str) -> CircuitBreaker:
+        if provider not in self.circuits:
+            self.circuits[provider] = CircuitBreaker(self.circuit_failures, self.circuit_cooldown)
+        return self.circuits[provider]
+
+    def hedge_delay(self, provider: str, kind: str) -> float:
+        """헤지까지 기다릴 시간 - 표본이 충분하면 해당 공급자/요청 종류의 p95"""
+        stats = self._stats(provider)
+        if stats.samples(kind) < HEDGE_MIN_SAMPLES:
+            return self.default_hedge_delay
+        return max(stats.percentile(kind, 95), MIN_HEDGE_DELAY)
+
+    async def _attempt(
+        self,
+        provider: str,
+        kind: str,
+        call: ProviderCall,
+        on_delta: Optional[Callable[[str], None]],
+        on_slot: Optional[Callable[[], None]] = None,
+    ) -> Optional[str]:
+        """
+        동시 요청 슬롯을 얻어 호출하고 결과 기록 (지연 시간에서 슬롯 대기 시간은 제외)
+
+        on_slot은 슬롯을 얻은 직후 호출됩니다 (헤지 시간 기준점).
+        """
+        circuit = self._circuit(provider)
+        circuit.begin()
+        try:
+            async with get_llm_clients().limit(provider):
+                started = time.monotonic()
+                if on_slot is not None:
+                    on_slot()
+                result = await call(on_delta)
+        except asyncio.CancelledError:
+            circuit.release()
+            self._stats(provider).cancelled += 1
+            raise
+
+        self._stats(provider).record(kind, time.monotonic() - started, result is not None)
+        if result is not None:
+            circuit.record_success()
+        elif circuit.record_failure():
+            _log(
+                "WARNING",
+                "CIRCUIT_OPEN",
+                f"{provider} failed {circuit.consecutive_failures}x - skipping for {self.circuit_cooldown:.0f}s",
+            )
+        return result
+
+    async def route(
+        self,
+        label: str,
+        calls: Dict[str, ProviderCall],
+        kind: str = "slide",
+        on_delta: Optional[Callable[[str], None]] = None,
+        on_reset: Optional[Callable[[], None]] = None,
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        공급자 체인으로 한 건 생성하고 응답한 공급자도 함께 반환
+
+        Args:
+            label: 로그용 요청 이름 (예: "slide 3")
+            calls: 공급자 이름 -> 호출 함수 (우선순위 순)
+            kind: 지연 시간 분포 구분 (slide, batch)
+            on_delta: 스트리밍 조각 콜백 - 먼저 조각을 보낸 공급자의 조각만 전달하고 나머지는 취소
+            on_reset: 조각을 보내던 공급자가 도중에 실패하면 호출 - 이미 전달한 조각은 버려야 하며
+                이후에는 다음 공급자의 조각을 처음부터 전달
+
+        Returns:
+            (생성 텍스트, 응답한 공급자) - 모든 공급자 실패 시 (None, None)
+        """
+        remaining = list(calls)
+        running: Dict[asyncio.Future, str] = {}
+        # 공급자가 동시 요청 슬롯을 얻은 시각 (헤지 시간은 여기서부터)
+        slot_acquired_at: Dict[str, float] = {}
+        slot_events: Dict[str, asyncio.Event] = {}
+        stream_owner: List[str] = []
+        decisions: List[str] = []
+        started = time.monotonic()
+
+        def forward(provider: str) -> Optional[Callable[[str], None]]:
+            if on_delta is None:
+                return None
+
+            def handle(text: str) -> None:
+                if not stream_owner:
+                    stream_owner.append(provider)
+                    for task, other in running.items():
+                        if other != provider:
+                            task.cancel()
+                if stream_owner[0] == provider:
+                    on_delta(text)
+
+            return handle
+
+        def launch() -> None:
+            while remaining:
+                provider = remaining.pop(0)
+                if self._circuit(provider).available():
+                    slot_events[provider] = asyncio.Event()
+
+                    def on_slot(provider: str = provider) -> None:
+                        slot_acquired_at[provider] = time.monotonic()
+                        slot_events[provider].set()
+
+                    task = asyncio.ensure_future(
+                        self._attempt(provider, kind, calls[provider], forward(provider), on_slot)
+                    )
+                    running[task] = provider
+                    decisions.append(provider)
+                    return
+                decisions.append(f"skip {provider} (circuit {self._circuit(provider).state})")
+
+        result: Optional[str] = None
+        winner: Optional[str] = None
+        hedged = False
+        try:
+            launch()
+            while running:
+                timeout = None
+                slot_waiter: Optional[asyncio.Future] = None
+                if self.hedging and remaining and len(running) == 1 and not stream_owner:
+                    provider = next(iter(running.values()))
+                    if provider in slot_acquired_at:
+                        elapsed = time.monotonic() - slot_acquired_at[provider]
+                        timeout = max(self.hedge_delay(provider, kind) - elapsed, 0)
+                    else:
+                        # 아직 슬롯 대기 중 - 느린 것이 아니라 붐비는 것이므로 슬롯을 얻을 때까지 헤지 보류
+                        slot_waiter = asyncio.ensure_future(slot_events[provider].wait())
+
+                waiting = set(running) | ({slot_waiter} if slot_waiter else set())
+                try:
+                    done, _ = await asyncio.wait(waiting, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    if slot_waiter is not None:
+                        slot_waiter.cancel()
+                if slot_waiter is not None and slot_waiter in done:
+                    done.discard(slot_waiter)
+                    if not done:
+                        continue
+                if not done:
+                    # 우선 공급자가 p95를 넘김 -> 다음 공급자를 동시에 호출
+                    decisions.append(f"hedge after {time.monotonic() - started:.1f}s")
+                    hedged = True
+                    self.hedged += 1
+                    launch()
+                    continue
+
+                for task in done:
+                    provider = running.pop(task)
+                    if task.cancelled():
+                        continue
+                    if task.result() is not None:
+                        result, winner = task.result(), provider
+                        break
+                    decisions.append(f"{provider} failed")
+                    if stream_owner and stream_owner[0] == provider:
+                        # 스트리밍 도중 실패 - 다음 공급자가 조각을 보낼 수 있도록 소유권 해제
+                        stream_owner.clear()
+                        decisions.append("stream reset")
+                        if on_reset is not None:
+                            on_reset()
+                if winner is not None:
+                    break
+                if not running:
+                    launch()
+        finally:
+            for task in running:
+                task.cancel()
+
+        if hedged and winner is not None and winner != next(iter(calls)):
+            self.hedge_wins += 1
+        _log(
+            "MINOR",
+            "ROUTE",
+            f"{label}: {' -> '.join(decisions) or 'no provider'} | "
+            f"winner={winner or 'none'} {time.monotonic() - started:.2f}s",
+        )
+        return result, winner
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "hedging": self.hedging,
+            "hedged": self.hedged,
+            "hedgeWins": self.hedge_wins,
+            "providers": {
+                provider: {
+                    **stats.to_dict(),
+                    "circuit": self._circuit(provider).state,
+                    "hedgeDelay": {kind: round(self.hedge_delay(provider, kind), 3) for kind in stats.latencies},
+                }
+                for provider, stats in self.stats.items()
+            },
+        }
+
+
+# 싱글톤 인스턴스
+_provider_router: Optional[ProviderRouter] = None
+
+
+def get_provider_router() -> ProviderRouter:
+    """LLM 공급자 라우터 인스턴스 반환 (없으면 생성)"""
+    global _provider_router
+
+    if _provider_router is None:
+        _provider_router = ProviderRouter()
+
+    return _provider_router
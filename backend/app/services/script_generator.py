@@ -1,12 +1,20 @@
 """
 OpenAI API를 사용한 AI 스크립트 생성 서비스
 IT 전문가 페르소나로 자연스러운 나레이션 생성
+공급자 호출은 비동기(AsyncOpenAI, httpx.AsyncClient)로 처리하여 요청 태스크가 취소되면
+진행 중인 HTTP 요청도 함께 중단됨
 """
 
+import asyncio
+import json
 import os
-from typing import List, Dict, Any, Optional
-from openai import OpenAI
-import requests
+import re
+from typing import Callable, List, Dict, Any, Optional, Tuple
+from openai import AsyncOpenAI
+
+from app.services.disk_cache import DiskCache, get_disk_cache, make_cache_key
+from app.services.llm_clients import get_llm_clients
+from app.services.provider_router import ProviderCall, get_provider_router
 
 # IT 전문가 페르소나 프롬프트
 IT_EXPERT_SYSTEM_PROMPT = """당신은 경험 많은 IT 기술과 비즈니스 전략 전문가입니다.
@@ -22,22 +30,190 @@ SCENARIO_TEMPLATES = {
     "casual": "이것은 캐주얼한 프레젠테이션입니다. 편하고 자연스러운 톤으로 진행해주세요.",
 }
 
+OPENAI_SCRIPT_MODEL = "gpt-4o-mini"
+SCRIPT_TEMPERATURE = 0.7
+
+# 배치 모드에서 슬라이드 하나당 허용하는 출력 토큰 수와 요청당 상한
+BATCH_TOKENS_PER_SLIDE = 600
+BATCH_MAX_TOKENS = 8000
+
+# 생성 결과 캐시 보관 기간 (SCRIPTS_CACHE_TTL, 초, 기본 7일)
+DEFAULT_SCRIPT_CACHE_TTL = 7 * 24 * 3600
+
+# 스크립트 출처 정책
+# - llm: 항상 LLM으로 생성
+# - notes: 발표자 노트를 그대로 사용 (노트가 없으면 제목/본문, LLM 호출 없음)
+# - notes-then-llm: 노트가 충분히 길면 그대로 사용, 아니면 LLM 생성
+# - polish-notes: 노트가 충분히 길면 LLM으로 문장만 다듬고, 아니면 LLM 생성
+SCRIPT_SOURCES = ("llm", "notes", "notes-then-llm", "polish-notes")
+DEFAULT_SCRIPT_SOURCE = "llm"
+# 노트를 스크립트로 쓰기 위한 최소 글자 수 (SCRIPT_NOTES_MIN_CHARS)
+DEFAULT_NOTES_MIN_CHARS = 40
+
+# 덱 세션 개요에 넣을 최대 글자 수 (모델 컨텍스트 창을 넘지 않도록)
+DECK_OUTLINE_MAX_CHARS = 4000
+DECK_OUTLINE_LINE_CHARS = 80
+
+
+def get_script_cache() -> DiskCache:
+    """슬라이드 스크립트 디스크 캐시 (용량은 SCRIPTS_CACHE_MAX_MB)"""
+    ttl = float(os.getenv("SCRIPTS_CACHE_TTL", str(DEFAULT_SCRIPT_CACHE_TTL)))
+    return get_disk_cache("scripts", default_max_mb=64, ttl=ttl, suffix=".json")
+
+
+def resolve_provider_chain(openai_api_key: Optional[str] = None) -> List[str]:
+    """
+    공급자 우선순위 (LLM_PROVIDER_CHAIN, 예: "ollama,openai")
+    
+    기본값: 로컬 LLM 우선 사용 또는 OpenAI 키 미설정 시 Ollama 후 OpenAI, 그 외에는 OpenAI만
+    """
+    chain = [
+        provider.strip().lower()
+        for provider in os.getenv("LLM_PROVIDER_CHAIN", "").split(",")
+        if provider.strip()
+    ]
+    if chain:
+        return chain
+    openai_api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
+    if os.getenv("LOCAL_LLM_PROVIDER", "").lower() == "ollama" or not openai_api_key:
+        return ["ollama", "openai"]
+    return ["openai"]
+
+
+def resolve_script_provider() -> str:
+    """스크립트 생성에 우선 사용할 공급자 (openai 또는 ollama)"""
+    return resolve_provider_chain()[0]
+
+
+def clean_notes(notes: Optional[str]) -> str:
+    """발표자 노트 정리 (줄바꿈 문자 통일, 빈 줄/중복 공백 제거)"""
+    if not notes:
+        return ""
+    lines = [" ".join(line.split()) for line in notes.replace("\v", "\n").splitlines()]
+    return "\n".join(line for line in lines if line)
+
+
+def resolve_slide_source(slide: Dict[str, Any], source: str) -> str:
+    """
+    슬라이드 하나의 스크립트 출처 결정
+    
+    Returns:
+        notes(노트 그대로), polish(노트 다듬기), llm(새로 생성) 중 하나
+    """
+    if source == "notes":
+        return "notes"
+    if source in ("notes-then-llm", "polish-notes"):
+        min_chars = int(os.getenv("SCRIPT_NOTES_MIN_CHARS") or DEFAULT_NOTES_MIN_CHARS)
+        if len(clean_notes(slide.get("notes"))) >= min_chars:
+            return "notes" if source == "notes-then-llm" else "polish"
+    return "llm"
+
+
+class OllamaDeckSession:
+    """
+    덱 단위 Ollama 세션
+    
+    시스템 프롬프트와 덱 개요를 한 번만 평가(prime)하고, 응답으로 받은 context(KV 캐시 토큰)를
+    슬라이드 요청마다 재사용하여 페르소나 프롬프트를 슬라이드마다 다시 평가하지 않습니다.
+    모든 슬라이드가 같은 개요를 공유하므로 앞뒤 슬라이드와의 흐름도 이어집니다.
+    슬라이드끼리는 context를 이어 붙이지 않으므로 동시에 생성할 수 있습니다.
+    """
+    
+    def __init__(self, slides: List[Dict[str, Any]], tone: str, language: str):
+        self.slide_count = len(slides)
+        self.tone = tone
+        self.language = language
+        self.outline = self._build_outline(slides)
+        self.context: Optional[List[int]] = None
+        # 준비 실패 시 슬라이드 요청은 전체 프롬프트로 진행
+        self.failed = False
+        self._lock = asyncio.Lock()
+    
+    @staticmethod
+    def _build_outline(slides: List[Dict[str, Any]]) -> str:
+        lines = []
+        length = 0
+        for slide in slides:
+            content = (slide.get("content") or "").strip().splitlines()
+            summary = content[0][:DECK_OUTLINE_LINE_CHARS] if content else ""
+            line = f"{slide.get('slideNumber')}. {slide.get('title', '')}"
+            if summary:
+                line += f" - {summary}"
+            if length + len(line) > DECK_OUTLINE_MAX_CHARS:
+                lines.append(f"... (총 {len(slides)}장)")
+                break
+            lines.append(line)
+            length += len(line) + 1
+        return "\n".join(lines)
+    
+    def priming_prompt(self) -> str:
+        scenario = SCENARIO_TEMPLATES.get(self.tone, SCENARIO_TEMPLATES["professional"])
+        return f"""{IT_EXPERT_SYSTEM_PROMPT}
+
+{scenario}
+다음은 이번 발표 자료 전체({self.slide_count}장)의 구성입니다.
+이후 요청마다 이 중 한 슬라이드의 {self.language.upper()} 나레이션 스크립트를 작성하게 됩니다.
+앞뒤 슬라이드와 자연스럽게 이어지도록 전체 흐름을 기억해주세요.
+
+{self.outline}
+
+확인했으면 "확인"이라고만 답해주세요."""
+    
+    async def get_context(self, prime: Callable[["OllamaDeckSession"], Any]) -> Optional[List[int]]:
+        """세션 context 반환 (처음 호출한 요청이 prime(session)으로 한 번만 준비)"""
+        if self.context is None and not self.failed:
+            async with self._lock:
+                if self.context is None and not self.failed:
+                    self.context = await prime(self)
+                    self.failed = self.context is None
+        return self.context
+
+
+def create_deck_session(
+    slides: List[Dict[str, Any]],
+    tone: str,
+    language: str,
+) -> Optional[OllamaDeckSession]:
+    """
+    덱 세션 생성 (OLLAMA_DECK_SESSION=false이거나 Ollama를 쓰지 않거나 슬라이드가 한 장이면 None)
+    """
+    if os.getenv("OLLAMA_DECK_SESSION", "true").lower() in ("0", "false", "no"):
+        return None
+    if len(slides) < 2 or "ollama" not in resolve_provider_chain():
+        return None
+    return OllamaDeckSession(slides, tone, language)
+
 
 class OpenAIScriptGenerator:
     """OpenAI를 사용한 스크립트 생성"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        deck_session: Optional[OllamaDeckSession] = None,
+    ):
+        clients = get_llm_clients()
         self.openai_api_key = api_key or os.getenv("OPENAI_API_KEY")
-        self.client = OpenAI(api_key=self.openai_api_key) if self.openai_api_key else None
-        self.local_provider = os.getenv("LOCAL_LLM_PROVIDER", "").lower()
-        self.ollama_url = os.getenv("OLLAMA_URL", "http://localhost:11434")
+        # 별도 키가 주어진 경우에만 전용 클라이언트 생성, 기본은 공유 연결 풀 사용
+        if api_key and api_key != clients.openai_api_key:
+            self.client = AsyncOpenAI(api_key=api_key)
+        else:
+            self.client = clients.openai
+        self.ollama_client = clients.ollama
+        self.ollama_keep_alive = clients.ollama_keep_alive
         self.ollama_model = os.getenv("OLLAMA_MODEL", "llama3.1")
+        # 주어지면 Ollama 요청은 덱 세션 context를 이어서 생성
+        self.deck_session = deck_session
     
-    def generate_script(
+    async def generate_script(
         self,
         slides: List[Dict[str, Any]],
         tone: str = "professional",
         language: str = "ko",
+        use_cache: bool = True,
+        on_delta: Optional[Callable[[Dict[str, Any], str], None]] = None,
+        source: str = DEFAULT_SCRIPT_SOURCE,
+        on_reset: Optional[Callable[[Dict[str, Any]], None]] = None,
     ) -> List[Dict[str, str]]:
         """
         슬라이드별 스크립트 생성
@@ -46,6 +222,10 @@ class OpenAIScriptGenerator:
             slides: 슬라이드 정보 리스트
             tone: 톤 설정 (professional, friendly, casual)
             language: 언어 (ko, en)
+            use_cache: False이면 캐시를 건너뛰고 새로 생성 (결과는 캐시에 갱신)
+            on_delta: 주어지면 공급자 스트리밍 API로 생성하며 조각마다 on_delta(slide, text) 호출
+            source: 스크립트 출처 정책 (SCRIPT_SOURCES)
+            on_reset: 스트리밍 중 공급자가 바뀌면 on_reset(slide) 호출 (그 슬라이드의 이전 조각은 폐기)
         
         Returns:
             슬라이드별 생성된 스크립트
@@ -53,33 +233,245 @@ class OpenAIScriptGenerator:
         scripts = []
         
         for slide in slides:
-            script = self._generate_slide_script(
-                slide_number=slide.get("slideNumber", 1),
-                title=slide.get("title", ""),
-                content=slide.get("content", ""),
-                tone=tone,
-                language=language,
-            )
+            slide_delta = (lambda text, slide=slide: on_delta(slide, text)) if on_delta else None
+            slide_reset = (lambda slide=slide: on_reset(slide)) if on_reset else None
+            slide_source = resolve_slide_source(slide, source)
+            if slide_source == "notes":
+                script = self._notes_script(slide)
+                if slide_delta:
+                    slide_delta(script)
+            elif slide_source == "polish":
+                script = await self._polish_notes(slide, tone, language, use_cache, slide_delta, slide_reset)
+            else:
+                script = await self._generate_slide_script(
+                    slide_number=slide.get("slideNumber", 1),
+                    title=slide.get("title", ""),
+                    content=slide.get("content", ""),
+                    tone=tone,
+                    language=language,
+                    use_cache=use_cache,
+                    on_delta=slide_delta,
+                    on_reset=slide_reset,
+                )
             
-            scripts.append({
-                "slideId": slide.get("slideId"),
-                "slideNumber": slide.get("slideNumber"),
-                "scriptText": script,
-                "duration": self._estimate_duration(script),
-                "keywords": self._extract_keywords(script),
-            })
+            scripts.append(self._script_item(slide, script, slide_source))
         
         return scripts
     
-    def _generate_slide_script(
+    @staticmethod
+    def _notes_script(slide: Dict[str, Any]) -> str:
+        """발표자 노트를 스크립트로 사용 (노트가 없으면 제목/본문)"""
+        notes = clean_notes(slide.get("notes"))
+        if notes:
+            return notes
+        return f"{slide.get('title', '')}. {slide.get('content', '')}"
+    
+    async def _polish_notes(
+        self,
+        slide: Dict[str, Any],
+        tone: str,
+        language: str,
+        use_cache: bool = True,
+        on_delta: Optional[Callable[[str], None]] = None,
+        on_reset: Optional[Callable[[], None]] = None,
+    ) -> str:
+        """발표자 노트의 내용은 유지하고 나레이션 문장으로만 다듬기 (실패하면 노트 그대로)"""
+        notes = clean_notes(slide.get("notes"))
+        scenario = SCENARIO_TEMPLATES.get(tone, SCENARIO_TEMPLATES["professional"])
+        prompt = f"""다음 발표자 노트를 음성 나레이션 스크립트로 다듬어주세요.
+
+슬라이드 제목: {slide.get('title', '')}
+발표자 노트:
+{notes}
+
+요구사항:
+{scenario}
+- 노트의 내용과 순서를 유지하고 새로운 내용은 추가하지 마세요
+- 메모체/개조식 문장을 소리 내어 읽기 자연스러운 문장으로 바꿔주세요
+- {language.upper()} 언어로 작성해주세요
+
+스크립트만 작성해주세요. 다른 설명은 하지 마세요."""
+        
+        cache = get_script_cache()
+        cache_key = make_cache_key("polish-notes", self._script_cache_key(slide.get("title", ""), notes, tone, language))
+        if use_cache:
+            cached = cache.get_json(cache_key)
+            if cached and cached.get("scriptText"):
+                if on_delta:
+                    on_delta(cached["scriptText"])
+                return cached["scriptText"]
+        
+        # 다듬기는 노트 길이만큼만 출력하면 되므로 토큰 상한을 노트 길이에 맞춤
+        script, provider = await self._request_script(
+            prompt,
+            label=f"slide {slide.get('slideNumber')} polish",
+            max_tokens=min(max(len(notes) * 2, 200), 1000),
+            on_delta=on_delta,
+            on_reset=on_reset,
+        )
+        if not script:
+            return notes
+        
+        if self._cacheable(provider):
+            cache.put_json(cache_key, {"scriptText": script})
+        return script
+    
+    async def generate_script_batch(
+        self,
+        slides: List[Dict[str, Any]],
+        tone: str = "professional",
+        language: str = "ko",
+        use_cache: bool = True,
+        source: str = DEFAULT_SCRIPT_SOURCE,
+    ) -> List[Dict[str, Any]]:
+        """
+        여러 슬라이드를 한 번의 요청(JSON 출력)으로 생성
+        
+        시스템 프롬프트와 시나리오를 슬라이드마다 반복해 보내지 않으므로 요청 수와
+        프롬프트 토큰이 줄어듭니다. 응답에서 빠졌거나 형식이 잘못된 슬라이드만
+        슬라이드별 호출로 다시 생성합니다.
+        """
+        cache = get_script_cache()
+        scripts: Dict[int, str] = {}
+        sources: Dict[int, str] = {}
+        pending = []
+        polish = []
+        for idx, slide in enumerate(slides):
+            sources[idx] = resolve_slide_source(slide, source)
+            if sources[idx] == "notes":
+                scripts[idx] = self._notes_script(slide)
+                continue
+            if sources[idx] == "polish":
+                polish.append((idx, slide))
+                continue
+            cache_key = self._script_cache_key(slide.get("title", ""), slide.get("content", ""), tone, language)
+            cached = cache.get_json(cache_key) if use_cache else None
+            if cached and cached.get("scriptText"):
+                scripts[idx] = cached["scriptText"]
+            else:
+                pending.append((idx, slide, cache_key))
+        
+        # 노트 다듬기는 슬라이드별 요청이므로 동시에 실행 (동시 요청 수는 공급자 한도로 제한)
+        polished = await asyncio.gather(
+            *(self._polish_notes(slide, tone, language, use_cache) for _, slide in polish)
+        )
+        for (idx, _), script in zip(polish, polished):
+            scripts[idx] = script
+        
+        if len(pending) > 1:
+            slide_numbers = [slide.get("slideNumber") for _, slide, _ in pending]
+            reply, provider = await self._request_script(
+                self._build_batch_prompt([slide for _, slide, _ in pending], tone, language),
+                label=f"batch {slide_numbers[0]}-{slide_numbers[-1]}",
+                json_output=True,
+                max_tokens=min(BATCH_TOKENS_PER_SLIDE * len(pending), BATCH_MAX_TOKENS),
+            )
+            parsed = self._parse_batch_reply(reply, [slide.get("slideNumber") for _, slide, _ in pending])
+            for idx, slide, cache_key in pending:
+                script = parsed.get(slide.get("slideNumber"))
+                if script:
+                    scripts[idx] = script
+                    if self._cacheable(provider):
+                        cache.put_json(cache_key, {"scriptText": script})
+            failed = [slide.get("slideNumber") for idx, slide, _ in pending if idx not in scripts]
+            if failed:
+                print(f"배치 응답에서 누락된 슬라이드 개별 생성: {failed}")
+        
+        # 배치에서 실패한 슬라이드(또는 한 장만 남은 경우)는 슬라이드별 호출
+        for idx, slide, _ in pending:
+            if idx not in scripts:
+                scripts[idx] = await self._generate_slide_script(
+                    slide_number=slide.get("slideNumber", 1),
+                    title=slide.get("title", ""),
+                    content=slide.get("content", ""),
+                    tone=tone,
+                    language=language,
+                    use_cache=False,
+                )
+        
+        return [self._script_item(slide, scripts[idx], sources[idx]) for idx, slide in enumerate(slides)]
+    
+    def _build_batch_prompt(self, slides: List[Dict[str, Any]], tone: str, language: str) -> str:
+        scenario = SCENARIO_TEMPLATES.get(tone, SCENARIO_TEMPLATES["professional"])
+        slide_blocks = "\n\n".join(
+            f"[슬라이드 {slide.get('slideNumber')}]\n"
+            f"슬라이드 제목: {slide.get('title', '')}\n"
+            f"슬라이드 내용: {slide.get('content', '')}"
+            for slide in slides
+        )
+        
+        return f"""다음 {len(slides)}개 슬라이드 각각에 대해 나레이션 스크립트를 작성해주세요.
+
+{slide_blocks}
+
+요구사항:
+{scenario}
+- 슬라이드마다 약 30-60초 분량의 음성 스크립트를 작성해주세요
+- {language.upper()} 언어로 작성해주세요
+- 시작과 끝을 자연스럽게 이어지도록 해주세요
+- 일인칭이나 이인칭 호칭 없이 객관적으로 설명해주세요
+
+반드시 아래 JSON 형식으로만 응답해주세요. 다른 설명은 하지 마세요.
+{{"scripts": [{{"slideNumber": <슬라이드 번호>, "script": "<스크립트>"}}]}}"""
+    
+    @staticmethod
+    def _parse_batch_reply(reply: Optional[str], slide_numbers: List[int]) -> Dict[int, str]:
+        """배치 응답 검증 후 슬라이드 번호 -> 스크립트 (요청하지 않았거나 비어 있는 항목은 제외)"""
+        if not reply:
+            return {}
+        # 코드 블록으로 감싸서 응답하는 모델 대비
+        text = re.sub(r"^```(?:json)?\s*|\s*```$", "", reply.strip())
+        try:
+            data = json.loads(text)
+        except ValueError:
+            print("배치 응답 JSON 파싱 실패")
+            return {}
+        
+        items = data.get("scripts") if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            return {}
+        
+        expected = set(slide_numbers)
+        results: Dict[int, str] = {}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            try:
+                slide_number = int(item.get("slideNumber"))
+            except (TypeError, ValueError):
+                continue
+            script = item.get("script")
+            if slide_number in expected and slide_number not in results and isinstance(script, str) and script.strip():
+                results[slide_number] = script.strip()
+        return results
+    
+    def _script_item(self, slide: Dict[str, Any], script: str, source: str = "llm") -> Dict[str, Any]:
+        return {
+            "slideId": slide.get("slideId"),
+            "slideNumber": slide.get("slideNumber"),
+            "scriptText": script,
+            # 실제 출처 (notes, polish, llm)
+            "source": source,
+            "duration": self._estimate_duration(script),
+        }
+    
+    async def _generate_slide_script(
         self,
         slide_number: int,
         title: str,
         content: str,
         tone: str,
         language: str,
+        use_cache: bool = True,
+        on_delta: Optional[Callable[[str], None]] = None,
+        on_reset: Optional[Callable[[], None]] = None,
     ) -> str:
-        """특정 슬라이드의 스크립트 생성"""
+        """
+        특정 슬라이드의 스크립트 생성 (같은 입력이면 디스크 캐시 결과 재사용)
+        
+        on_delta가 주어지면 생성되는 텍스트 조각마다 호출합니다 (캐시 적중 시 전체 텍스트 한 번).
+        스트리밍 중 공급자가 실패하여 다음 공급자로 넘어가면 on_reset을 호출합니다.
+        """
         
         scenario = SCENARIO_TEMPLATES.get(tone, SCENARIO_TEMPLATES["professional"])
         
@@ -98,18 +490,114 @@ class OpenAIScriptGenerator:
 
 스크립트만 작성해주세요. 다른 설명은 하지 마세요."""
         
-        # 로컬 LLM 우선 사용 또는 OpenAI 키 미설정 시 Ollama 사용
-        if self.local_provider == "ollama" or not self.openai_api_key:
-            script = self._generate_with_ollama(prompt)
-            if script:
-                return script
+        cache = get_script_cache()
+        cache_key = self._script_cache_key(title, content, tone, language)
+        if use_cache:
+            cached = cache.get_json(cache_key)
+            if cached and cached.get("scriptText"):
+                if on_delta:
+                    on_delta(cached["scriptText"])
+                return cached["scriptText"]
+        
+        script, provider = await self._request_script(
+            prompt, label=f"slide {slide_number}", on_delta=on_delta, on_reset=on_reset
+        )
+        if not script:
+            # 폴백: 기본 스크립트 생성 (캐시하지 않음)
+            return f"{title}. {content}"
+        
+        if self._cacheable(provider):
+            cache.put_json(cache_key, {"scriptText": script})
+        return script
+
+    def _script_cache_key(self, title: str, content: str, tone: str, language: str) -> str:
+        # 슬라이드 번호는 제외 - 같은 내용이면 다른 프로젝트/위치에서도 재사용
+        # 키는 우선 공급자 모델 기준이므로 우선 공급자가 생성한 결과만 저장 (_cacheable)
+        return make_cache_key(
+            self._preferred_model(),
+            IT_EXPERT_SYSTEM_PROMPT,
+            title,
+            content,
+            tone,
+            language,
+            SCRIPT_TEMPERATURE,
+        )
+
+    def _preferred_model(self) -> str:
+        """우선 사용할 모델 이름 (캐시 키용)"""
+        if self._provider_chain()[0] == "ollama":
+            return f"ollama:{self.ollama_model}"
+        return f"openai:{OPENAI_SCRIPT_MODEL}"
+
+    def _provider_chain(self) -> List[str]:
+        return resolve_provider_chain(self.openai_api_key)
+
+    def _cacheable(self, provider: Optional[str]) -> bool:
+        """
+        응답한 공급자의 결과를 캐시해도 되는지 (우선 공급자일 때만)
+
+        폴백/헤지로 다른 공급자가 응답한 결과를 우선 모델 키로 저장하면
+        우선 공급자가 복구된 뒤에도 다른 모델의 결과가 계속 재사용되므로 저장하지 않습니다.
+        """
+        return provider is not None and provider == self._provider_chain()[0]
+
+    async def _request_script(
+        self,
+        prompt: str,
+        label: str = "script",
+        json_output: bool = False,
+        max_tokens: int = 500,
+        on_delta: Optional[Callable[[str], None]] = None,
+        on_reset: Optional[Callable[[], None]] = None,
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        공급자 라우터로 LLM 호출 (json_output이면 JSON 객체 응답 강제)
+        
+        Returns:
+            (생성 텍스트, 응답한 공급자) - 모두 실패하면 (None, None)
+        
+        on_delta가 주어지면 스트리밍으로 받아 조각마다 호출하고,
+        조각을 보내던 공급자가 실패해 다음 공급자로 넘어가면 on_reset을 호출합니다.
+        호출 중 태스크가 취소되면 CancelledError가 그대로 전파되고 연결이 닫힙니다.
+        """
+        calls: Dict[str, ProviderCall] = {}
+        for provider in self._provider_chain():
+            if provider == "ollama":
+                calls[provider] = lambda delta: self._generate_with_ollama(
+                    prompt, json_output=json_output, on_delta=delta
+                )
+            elif provider == "openai" and self.client:
+                calls[provider] = lambda delta: self._generate_with_openai(
+                    prompt, json_output, max_tokens, delta
+                )
+        
+        if not calls:
+            print("OpenAI API 오류: OPENAI_API_KEY가 설정되지 않았습니다")
+            return None, None
+        
+        return await get_provider_router().route(
+            label,
+            calls,
+            kind="batch" if json_output else "slide",
+            on_delta=on_delta,
+            on_reset=on_reset,
+        )
 
+    async def _generate_with_openai(
+        self,
+        prompt: str,
+        json_output: bool = False,
+        max_tokens: int = 500,
+        on_delta: Optional[Callable[[str], None]] = None,
+    ) -> Optional[str]:
+        """OpenAI로 스크립트 생성 (on_delta가 있으면 스트리밍)"""
         try:
-            if not self.client:
-                raise RuntimeError("OPENAI_API_KEY가 설정되지 않았습니다")
+            options: Dict[str, Any] = {}
+            if json_output:
+                options["response_format"] = {"type": "json_object"}
 
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
+            response = await self.client.chat.completions.create(
+                model=OPENAI_SCRIPT_MODEL,
                 messages=[
                     {
                         "role": "system",
@@ -120,40 +608,120 @@ class OpenAIScriptGenerator:
                         "content": prompt,
                     },
                 ],
-                temperature=0.7,
-                max_tokens=500,
+                temperature=SCRIPT_TEMPERATURE,
+                max_tokens=max_tokens,
+                stream=on_delta is not None,
+                **options,
             )
 
-            return response.choices[0].message.content.strip()
+            if on_delta is None:
+                return response.choices[0].message.content.strip()
+
+            parts = []
+            async for chunk in response:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    on_delta(delta)
+            return "".join(parts).strip() or None
 
         except Exception as e:
             print(f"OpenAI API 오류: {e}")
-            # 폴백: 기본 스크립트 생성
-            return f"{title}. {content}"
+            return None
 
-    def _generate_with_ollama(self, prompt: str) -> Optional[str]:
-        """Ollama 로컬 모델로 스크립트 생성"""
+    async def _generate_with_ollama(
+        self,
+        prompt: str,
+        json_output: bool = False,
+        on_delta: Optional[Callable[[str], None]] = None,
+    ) -> Optional[str]:
+        """
+        Ollama 로컬 모델로 스크립트 생성 (on_delta가 있으면 스트리밍)
+        
+        덱 세션이 있으면 시스템 프롬프트 대신 세션 context에 이어서 슬라이드 프롬프트만 평가합니다.
+        """
         try:
-            url = f"{self.ollama_url.rstrip('/')}/api/generate"
             payload = {
                 "model": self.ollama_model,
                 "prompt": f"{IT_EXPERT_SYSTEM_PROMPT}\n\n{prompt}",
-                "stream": False,
+                "stream": on_delta is not None,
+                "keep_alive": self.ollama_keep_alive,
                 "options": {
-                    "temperature": 0.7,
+                    "temperature": SCRIPT_TEMPERATURE,
                 },
             }
+            if json_output:
+                payload["format"] = "json"
+            if self.deck_session is not None:
+                context = await self.deck_session.get_context(self._prime_deck_session)
+                if context:
+                    payload["prompt"] = prompt
+                    payload["context"] = context
 
-            response = requests.post(url, json=payload, timeout=120)
-            response.raise_for_status()
-            data = response.json()
-            content = data.get("response", "").strip()
+            if on_delta is None:
+                response = await self.ollama_client.post("/api/generate", json=payload)
+                response.raise_for_status()
+                data = response.json()
+                content = data.get("response", "").strip()
+                return content or None
+
+            # 스트리밍 응답: 줄마다 {"response": "...", "done": false} JSON
+            parts = []
+            async with self.ollama_client.stream("POST", "/api/generate", json=payload) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    data = json.loads(line)
+                    if data.get("error"):
+                        raise RuntimeError(data["error"])
+                    delta = data.get("response", "")
+                    if delta:
+                        parts.append(delta)
+                        on_delta(delta)
+                    if data.get("done"):
+                        break
+            content = "".join(parts).strip()
             return content or None
 
         except Exception as e:
             print(f"Ollama 호출 오류: {e}")
             return None
     
+    async def _prime_deck_session(self, session: OllamaDeckSession) -> Optional[List[int]]:
+        """시스템 프롬프트와 덱 개요를 한 번 평가하고 context 반환 (실패 시 None)"""
+        try:
+            response = await self.ollama_client.post(
+                "/api/generate",
+                json={
+                    "model": self.ollama_model,
+                    "prompt": session.priming_prompt(),
+                    "stream": False,
+                    "keep_alive": self.ollama_keep_alive,
+                    "options": {
+                        "temperature": SCRIPT_TEMPERATURE,
+                        "num_predict": 8,
+                    },
+                },
+            )
+            response.raise_for_status()
+            data = response.json()
+            context = data.get("context")
+            if not context:
+                print("Ollama 덱 세션 준비 실패: context 없음")
+                return None
+            print(
+                f"Ollama 덱 세션 준비: 슬라이드 {session.slide_count}장, "
+                f"프롬프트 {data.get('prompt_eval_count', '?')}토큰 "
+                f"{data.get('prompt_eval_duration', 0) / 1e6:.0f}ms"
+            )
+            return context
+        except Exception as e:
+            print(f"Ollama 덱 세션 준비 오류: {e}")
+            return None
+    
     def _estimate_duration(self, script: str) -> int:
         """
         스크립트의 예상 음성 시간 계산
@@ -164,25 +732,31 @@ class OpenAIScriptGenerator:
         char_count = len(script.replace(" ", "").replace("\n", ""))
         duration = max(int(char_count * 0.5), 5)  # 최소 5초
         return min(duration, 120)  # 최대 120초
-    
-    def _extract_keywords(self, script: str) -> List[str]:
-        """
-        스크립트에서 주요 키워드 추출 (간단한 구현)
-        실제 환경에서는 NLP 라이브러리 사용 권장
-        """
-        # 명사 같은 단어들 추출 (임시 구현)
-        words = script.split()
-        keywords = [w for w in words if len(w) > 2][:5]
-        return keywords
 
 
-def generate_scripts(
+async def generate_scripts(
     slides: List[Dict[str, Any]],
     tone: str = "professional",
     language: str = "ko",
+    use_cache: bool = True,
+    batch: bool = False,
+    on_delta: Optional[Callable[[Dict[str, Any], str], None]] = None,
+    deck_session: Optional[OllamaDeckSession] = None,
+    source: str = DEFAULT_SCRIPT_SOURCE,
+    on_reset: Optional[Callable[[Dict[str, Any]], None]] = None,
 ) -> List[Dict[str, Any]]:
     """
     슬라이드별 스크립트 생성
+
+    batch=True이면 전달된 슬라이드들을 한 번의 요청으로 생성합니다.
+    on_delta가 주어지면 슬라이드별로 스트리밍하며 텍스트 조각마다 on_delta(slide, text)를 호출하고,
+    도중에 공급자가 바뀌면 on_reset(slide)를 호출합니다 (그 슬라이드의 이전 조각은 폐기).
+    deck_session(create_deck_session)을 여러 호출에 넘기면 Ollama 요청이 같은 덱 context를 공유합니다.
+    source는 스크립트 출처 정책(SCRIPT_SOURCES)으로, 노트를 쓰는 슬라이드는 LLM을 호출하지 않습니다.
     """
-    generator = OpenAIScriptGenerator()
-    return generator.generate_script(slides, tone, language)
+    generator = OpenAIScriptGenerator(deck_session=deck_session)
+    if batch and len(slides) > 1 and on_delta is None:
+        return await generator.generate_script_batch(slides, tone, language, use_cache=use_cache, source=source)
+    return await generator.generate_script(
+        slides, tone, language, use_cache=use_cache, on_delta=on_delta, source=source, on_reset=on_reset
+    )
@@ -0,0 +1,231 @@
+"""
+슬라이드 래스터화 서비스
+파서가 기록한 레이아웃(EMU 좌표의 그림/텍스트 상자)을 Pillow로 그려
+1080p/720p/썸네일 프레임을 한 번에 생성
+결과는 레이아웃 내용 해시로 MEDIA_DIR/frames 아래에 저장되어 재사용됨
+"""
+
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+from app.services.disk_cache import get_media_dir, make_cache_key
+from app.services.image_store import resolve_media_url
+
+# 그리기 방식이 바뀌면 올려서 기존 프레임을 무효화
+RASTER_VERSION = 1
+
+# 한 번에 생성하는 프레임 크기 (가장 큰 크기로 그린 뒤 축소)
+FRAME_SIZES: Dict[str, Tuple[int, int]] = {
+    "1080p": (1920, 1080),
+    "720p": (1280, 720),
+    "thumbnail": (320, 180),
+}
+
+EMU_PER_POINT = 12700
+BACKGROUND_COLOR = (255, 255, 255)
+CANVAS_COLOR = (15, 23, 42)
+TEXT_COLOR = (30, 41, 59)
+DEFAULT_FONT_SIZES = {"title": 36.0, "body": 18.0, "table": 14.0}
+
+# 한글을 지원하는 글꼴 후보 (SLIDE_FONT_PATH가 우선)
+FONT_CANDIDATES = [
+    "C:/Windows/Fonts/malgun.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+]
+BOLD_FONT_CANDIDATES = [
+    "C:/Windows/Fonts/malgunbd.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Bold.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Bold.ttc",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+]
+
+
+def _frames_dir() -> Path:
+    return get_media_dir() / "frames"
+
+
+def _public_base() -> str:
+    return os.getenv("FASTAPI_PUBLIC_URL", "http://localhost:8000").rstrip("/")
+
+
+@lru_cache(maxsize=128)
+def _load_font(size: int, bold: bool = False):
+    """글꼴 로드 (크기별 캐시)"""
+    candidates = BOLD_FONT_CANDIDATES if bold else FONT_CANDIDATES
+    configured = os.getenv("SLIDE_BOLD_FONT_PATH" if bold else "SLIDE_FONT_PATH")
+    if configured:
+        candidates = [configured, *candidates]
+    for font_path in candidates:
+        if os.path.exists(font_path):
+            try:
+                return ImageFont.truetype(font_path, size)
+            except OSError:
+                continue
+    if bold:
+        return _load_font(size, False)
+    return ImageFont.load_default(size=size)
+
+
+def _parse_color(value: Optional[str]) -> Tuple[int, int, int]:
+    if not value or len(value) != 6:
+        return TEXT_COLOR
+    try:
+        return tuple(int(value[i:i + 2], 16) for i in (0, 2, 4))
+    except ValueError:
+        return TEXT_COLOR
+
+
+def _wrap_text(text: str, font, max_width: int) -> List[str]:
+    """상자 너비에 맞춰 줄바꿈 (단어 단위, 긴 단어/한글은 글자 단위)"""
+    lines: List[str] = []
+    for paragraph in text.replace("\v", "\n").split("\n"):
+        current = ""
+        for word in paragraph.split(" "):
+            candidate = f"{current} {word}" if current else word
+            if font.getlength(candidate) <= max_width:
+                current = candidate
+                continue
+            if current:
+                lines.append(current)
+                current = ""
+            # 단어 자체가 너무 길면 글자 단위로 자름
+            for char in word:
+                if font.getlength(current + char) > max_width and current:
+                    lines.append(current)
+                    current = char
+                else:
+                    current += char
+        lines.append(current)
+    return lines
+
+
+class SlideRasterizer:
+    """레이아웃 -> 프레임 이미지"""
+
+    def __init__(self, layout: Dict[str, Any]):
+        self.layout = layout
+        width, height = FRAME_SIZES["1080p"]
+        slide_width = layout.get("width") or 9144000
+        slide_height = layout.get("height") or 6858000
+        # 슬라이드 비율을 유지한 채 16:9 캔버스 중앙에 배치
+        self.scale = min(width / slide_width, height / slide_height)
+        self.offset_x = (width - slide_width * self.scale) / 2
+        self.offset_y = (height - slide_height * self.scale) / 2
+        self.slide_rect = (
+            int(self.offset_x),
+            int(self.offset_y),
+            int(self.offset_x + slide_width * self.scale),
+            int(self.offset_y + slide_height * self.scale),
+        )
+
+    def _to_pixels(self, box: List[int]) -> Tuple[int, int, int, int]:
+        left, top, width, height = box
+        return (
+            int(self.offset_x + left * self.scale),
+            int(self.offset_y + top * self.scale),
+            max(int(width * self.scale), 1),
+            max(int(height * self.scale), 1),
+        )
+
+    def render(self) -> Image.Image:
+        canvas = Image.new("RGB", FRAME_SIZES["1080p"], color=CANVAS_COLOR)
+        draw = ImageDraw.Draw(canvas)
+        draw.rectangle(self.slide_rect, fill=BACKGROUND_COLOR)
+
+        for element in self.layout.get("elements", []):
+            box = element.get("box")
+            if not box:
+                continue
+            try:
+                if element.get("kind") == "picture":
+                    self._draw_picture(canvas, element, box)
+                elif element.get("kind") == "text":
+                    self._draw_text(draw, element, box)
+            except Exception as e:
+                print(f"[WARN] Failed to rasterize element: {e}")
+        return canvas
+
+    def _draw_picture(self, canvas: Image.Image, element: Dict[str, Any], box: List[int]) -> None:
+        image_url = element.get("image")
+        path = resolve_media_url(image_url) if image_url else None
+        if not path:
+            return
+        x, y, width, height = self._to_pixels(box)
+        with Image.open(path) as source:
+            picture = source.convert("RGBA").resize((width, height), Image.LANCZOS)
+        canvas.paste(picture, (x, y), picture)
+
+    def _draw_text(self, draw: ImageDraw.ImageDraw, element: Dict[str, Any], box: List[int]) -> None:
+        x, y, width, height = self._to_pixels(box)
+        role = element.get("role", "body")
+        point_size = element.get("fontSize") or DEFAULT_FONT_SIZES.get(role, 18.0)
+        pixel_size = max(int(point_size * EMU_PER_POINT * self.scale), 8)
+        bold = element.get("bold", role == "title")
+        font = _load_font(pixel_size, bold)
+        color = _parse_color(element.get("color"))
+        align = element.get("align") or ("center" if role == "title" else "left")
+
+        # 상자 안쪽 여백 (0.1인치)
+        padding = int(91440 * self.scale)
+        inner_width = max(width - padding * 2, 1)
+        line_height = int(pixel_size * 1.2)
+        lines = _wrap_text(element.get("text", ""), font, inner_width)
+
+        # 제목은 세로 가운데, 나머지는 위에서부터
+        text_height = line_height * len(lines)
+        cursor_y = y + padding
+        if role == "title":
+            cursor_y = y + max((height - text_height) // 2, 0)
+
+        for line in lines:
+            if cursor_y > y + height:
+                break
+            line_width = font.getlength(line)
+            if align == "center":
+                line_x = x + (width - line_width) / 2
+            elif align == "right":
+                line_x = x + width - padding - line_width
+            else:
+                line_x = x + padding
+            draw.text((line_x, cursor_y), line, fill=color, font=font)
+            cursor_y += line_height
+
+
+def layout_hash(layout: Dict[str, Any]) -> str:
+    """레이아웃 내용 해시 (이미지 URL은 내용 주소이므로 이미지 변경도 반영됨)"""
+    return make_cache_key("slide-frame", RASTER_VERSION, layout)
+
+
+def rasterize_slide(layout: Dict[str, Any]) -> Dict[str, str]:
+    """
+    슬라이드 하나를 모든 프레임 크기로 래스터화하고 크기별 URL 반환
+
+    같은 내용의 슬라이드는 이미 생성된 프레임을 그대로 재사용합니다.
+    """
+    key = layout_hash(layout)
+    frame_dir = _frames_dir() / key[:2]
+    paths = {name: frame_dir / f"{key}_{name}.png" for name in FRAME_SIZES}
+
+    if not all(path.exists() for path in paths.values()):
+        frame_dir.mkdir(parents=True, exist_ok=True)
+        frame = SlideRasterizer(layout).render()
+        for name, size in FRAME_SIZES.items():
+            resized = frame if frame.size == size else frame.resize(size, Image.LANCZOS)
+            temp_path = paths[name].with_name(f"{paths[name].name}.{os.getpid()}.tmp")
+            resized.save(temp_path, format="PNG")
+            os.replace(temp_path, paths[name])
+
+    media_dir = get_media_dir()
+    return {
+        name: f"{_public_base()}/media/{path.relative_to(media_dir).as_posix()}"
+        for name, path in paths.items()
+    }
@@ -0,0 +1,169 @@
+"""
+TTS 문장 단위 분할 및 MP3 이어 붙이기
+긴 스크립트를 문장 경계(한국어/영어)에서 엔진 요청 한도 이하 조각으로 나누고,
+조각별로 합성한 MP3를 재인코딩 없이 프레임 단위로 이어 붙임
+(조각마다 붙는 ID3 태그와 Xing/Info/VBRI 헤더 프레임은 제거하여 조각 사이에 빈 구간이 없도록 함)
+"""
+
+import re
+from typing import Iterator, List, Optional, Tuple
+
+# 조각 하나의 최대 글자 수 (gTTS는 100자 단위로 나눠 순차 요청하므로 같은 값 사용)
+DEFAULT_CHUNK_MAX_CHARS = 100
+
+# 문장 끝: 종결 부호(와 닫는 따옴표/괄호) 뒤 공백, 또는 줄바꿈
+SENTENCE_END = re.compile(r"(?<=[.!?。！？…])[\"'”’)\]]*\s+|\n+")
+# 문장이 너무 길 때 나눌 위치: 쉼표/세미콜론 뒤, 그다음은 공백
+CLAUSE_END = re.compile(r"(?<=[,;:，、])\s+")
+# 마침표 뒤에서 문장을 끊지 않는 영어 약어
+ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "prof", "vs", "etc", "e.g", "i.e", "inc", "ltd", "no", "fig"}
+
+# MPEG 오디오 Layer III 프레임 헤더 표
+BITRATES_KBPS = {
+    "1": [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    "2": [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+SAMPLE_RATES = {
+    "1": [44100, 48000, 32000],
+    "2": [22050, 24000, 16000],
+    "2.5": [11025, 12000, 8000],
+}
+MPEG_VERSIONS = {0b11: "1", 0b10: "2", 0b00: "2.5"}
+
+
+def _split_sentences(text: str) -> List[str]:
+    sentences: List[str] = []
+    start = 0
+    for match in SENTENCE_END.finditer(text):
+        # 닫는 따옴표/괄호는 앞 문장에 포함
+        candidate = text[start:match.start() + len(match.group(0).rstrip())].strip()
+        last_word = candidate.rsplit(" ", 1)[-1].rstrip(".\"'”’)]").lower()
+        if "\n" not in match.group(0) and last_word in ABBREVIATIONS:
+            continue
+        if candidate:
+            sentences.append(candidate)
+        start = match.end()
+    tail = text[start:].strip()
+    if tail:
+        sentences.append(tail)
+    return sentences
+
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    """max_chars보다 긴 문장을 절(쉼표) -> 공백 -> 글자 수 순으로 나눔"""
+    if len(sentence) <= max_chars:
+        return [sentence]
+    for pattern in (CLAUSE_END, re.compile(r"\s+")):
+        pieces = [piece for piece in pattern.split(sentence) if piece]
+        if len(pieces) > 1:
+            return _pack(pieces, max_chars)
+    return [sentence[i:i + max_chars] for i in range(0, len(sentence), max_chars)]
+
+
+def _pack(pieces: List[str], max_chars: int) -> List[str]:
+    """이어 붙여도 max_chars를 넘지 않는 조각끼리 묶음"""
+    chunks: List[str] = []
+    current = ""
+    for piece in pieces:
+        for part in _split_long(piece, max_chars):
+            if current and len(current) + 1 + len(part) <= max_chars:
+                current = f"{current} {part}"
+            else:
+                if current:
+                    chunks.append(current)
+                current = part
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_text_chunks(text: str, max_chars: int = DEFAULT_CHUNK_MAX_CHARS) -> List[str]:
+    """
+    문장 경계에서 텍스트를 합성 조각으로 분할
+
+    조각은 max_chars 이하이며, 짧은 문장은 한도 안에서 한 조각으로 묶습니다.
+    같은 문장은 어느 스크립트에서든 같은 조각이 되므로 조각 단위 캐시가 재사용됩니다.
+    """
+    return _pack(_split_sentences(text or ""), max(max_chars, 1))
+
+
+def _strip_tags(data: bytes) -> bytes:
+    """앞쪽 ID3v2 태그(여러 개일 수 있음)와 끝의 ID3v1 태그 제거"""
+    while len(data) >= 10 and data[:3] == b"ID3":
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        footer = 10 if data[5] & 0x10 else 0
+        data = data[10 + size + footer:]
+    if len(data) >= 128 and data[-128:-125] == b"TAG":
+        data = data[:-128]
+    return data
+
+
+def _frame_header(data: bytes, offset: int) -> Optional[Tuple[int, int]]:
+    """offset의 Layer III 프레임 (길이, 사이드 정보 길이) - 프레임 헤더가 아니면 None"""
+    if offset + 4 > len(data) or data[offset] != 0xFF or data[offset + 1] & 0xE0 != 0xE0:
+        return None
+    version = MPEG_VERSIONS.get((data[offset + 1] >> 3) & 0b11)
+    layer = (data[offset + 1] >> 1) & 0b11
+    bitrate_index = data[offset + 2] >> 4
+    sample_rate_index = (data[offset + 2] >> 2) & 0b11
+    if version is None or layer != 0b01 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    bitrate = BITRATES_KBPS["1" if version == "1" else "2"][bitrate_index] * 1000
+    sample_rate = SAMPLE_RATES[version][sample_rate_index]
+    padding = (data[offset + 2] >> 1) & 0b1
+    mono = (data[offset + 3] >> 6) == 0b11
+    if version == "1":
+        length = 144 * bitrate // sample_rate + padding
+        side_info = 17 if mono else 32
+    else:
+        length = 72 * bitrate // sample_rate + padding
+        side_info = 9 if mono else 17
+    return length, side_info
+
+
+def _is_info_frame(data: bytes, offset: int, side_info: int) -> bool:
+    """인코더가 넣는 Xing/Info/VBRI 헤더 프레임 (오디오가 아니라 전체 길이 정보)"""
+    tag_offset = offset + 4 + side_info
+    return data[tag_offset:tag_offset + 4] in (b"Xing", b"Info") or data[offset + 36:offset + 40] == b"VBRI"
+
+
+def _audio_frames(data: bytes) -> Iterator[bytes]:
+    """MP3 데이터의 오디오 프레임 (프레임 사이 잡음 바이트와 헤더 프레임은 건너뜀)"""
+    offset = 0
+    while offset < len(data):
+        header = _frame_header(data, offset)
+        if header is None or offset + header[0] > len(data):
+            offset += 1
+            continue
+        length, side_info = header
+        # 다음 위치도 프레임 헤더이거나 데이터 끝이어야 유효한 프레임으로 봄 (오디오 안의 0xFFE 오인 방지)
+        end = offset + length
+        if end < len(data) and _frame_header(data, end) is None:
+            offset += 1
+            continue
+        if not _is_info_frame(data, offset, side_info):
+            yield data[offset:end]
+        offset = end
+
+
+def concat_mp3(parts: List[bytes]) -> bytes:
+    """
+    MP3 조각들을 재인코딩 없이 순서대로 이어 붙임
+
+    조각의 태그와 Xing/Info 헤더 프레임을 빼고 오디오 프레임만 연결합니다.
+    (헤더의 전체 프레임 수는 이어 붙인 뒤에는 틀린 값이 되어 플레이어가 길이를 잘못 계산함)
+    프레임을 찾지 못한 조각은 태그만 제거하고 그대로 붙입니다.
+    """
+    if len(parts) == 1:
+        return parts[0]
+    output = bytearray()
+    for part in parts:
+        data = _strip_tags(part)
+        frames = list(_audio_frames(data))
+        if frames:
+            for frame in frames:
+                output += frame
+        else:
+            output += data
+    return bytes(output)
@@ -1,17 +1,203 @@
 """
-Google Text-to-Speech (gTTS)를 사용한 TTS (Text-to-Speech) 서비스
+TTS (Text-to-Speech) 엔진 서비스
+엔진 공통 인터페이스(TTSEngine)와 voiceId로 엔진을 고르는 레지스트리
+- gtts: Google Text-to-Speech (무료, 인터넷 필요)
+- local: 글자마다 정해진 음을 내는 오프라인 톤 생성기 (네트워크 없음, 부하 테스트/벤치마크용)
+긴 스크립트는 문장 단위 조각으로 나눠 동시에 합성한 뒤 MP3 프레임을 이어 붙이고,
+조각별 결과는 (엔진, 텍스트, 언어, 음성, 속도) 해시를 키로 디스크에 캐시하여
+같은 문장(인트로, 반복 안내 문구, 실패 후 재실행)은 네트워크 요청 없이 재사용
 """
 
 import os
-from typing import List, Dict, Any, Optional
+import threading
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from gtts import gTTS
 import io
 
+import numpy as np
 
-class GoogleTTSService:
+from app.services.disk_cache import DiskCache, get_disk_cache, make_cache_key
+from app.services.tts_chunks import DEFAULT_CHUNK_MAX_CHARS, concat_mp3, split_text_chunks
+
+# 기본 엔진 (TTS_ENGINE) - voiceId가 특정 엔진의 음성이면 그 엔진 사용
+DEFAULT_TTS_ENGINE = "gtts"
+
+# 음성 길이 추정 기준 (한국어 약 1초당 7글자)
+CHARS_PER_SECOND = 7.0
+
+# 이 속도 이하이면 gTTS 느린 읽기(slow=True) 사용 (gTTS는 배속 조절 미지원)
+GTTS_SLOW_SPEED = 0.75
+
+# 조각 동시 합성 스레드 수 (TTS_CHUNK_WORKERS, 모든 슬라이드가 공유)
+DEFAULT_CHUNK_WORKERS = 8
+
+_chunk_executor: Optional[ThreadPoolExecutor] = None
+_chunk_executor_lock = threading.Lock()
+
+
+def get_chunk_executor() -> ThreadPoolExecutor:
+    """조각 합성 스레드 풀 (없으면 생성)"""
+    global _chunk_executor
+
+    with _chunk_executor_lock:
+        if _chunk_executor is None:
+            workers = max(int(os.getenv("TTS_CHUNK_WORKERS") or DEFAULT_CHUNK_WORKERS), 1)
+            _chunk_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts-chunk")
+    return _chunk_executor
+
+
+def get_audio_cache() -> DiskCache:
+    """TTS 음성 디스크 캐시 (프로젝트 간 공유, 용량은 AUDIO_CACHE_MAX_MB)"""
+    return get_disk_cache("audio", default_max_mb=512, suffix=".mp3")
+
+
+def make_audio_cache_key(engine: str, text: str, lang: str, voice_id: str, speed: float) -> str:
+    return make_cache_key("tts", engine, text.strip(), lang, voice_id, round(float(speed), 2))
+
+
+class TTSEngine:
+    """
+    TTS 엔진 공통 인터페이스
+
+    엔진은 _synthesize(조각 하나 합성)만 구현하면 되고,
+    조각 분할/동시 합성/이어 붙이기/캐시는 synthesize_speech가 처리합니다.
+
+    - ENGINE: 레지스트리 이름 (캐시 키에 포함)
+    - MEDIA_TYPE / FILE_EXTENSION: 출력 오디오 형식
+    - CHUNKED: 문장 조각으로 나눠 동시에 합성할지 (요청 지연이 큰 네트워크 엔진)
+    - CACHEABLE: 조각 결과를 디스크 캐시에 저장할지
+    - VOICE_OPTIONS: 키 -> 음성 정보 (voice_id, name, gender, accent, lang)
+    """
+
+    ENGINE = ""
+    MEDIA_TYPE = "audio/mpeg"
+    FILE_EXTENSION = "mp3"
+    CHUNKED = False
+    CACHEABLE = True
+    VOICE_OPTIONS: Dict[str, Dict[str, Any]] = {}
+    DEFAULT_VOICE = ""
+
+    @classmethod
+    def get_voice_options(cls) -> Dict[str, Any]:
+        """사용 가능한 음성 옵션 반환"""
+        return cls.VOICE_OPTIONS
+
+    @classmethod
+    def find_voice(cls, voice: str) -> Optional[Dict[str, Any]]:
+        """음성 키 또는 voice_id로 음성 정보 조회 (없으면 None)"""
+        if voice in cls.VOICE_OPTIONS:
+            return cls.VOICE_OPTIONS[voice]
+        for info in cls.VOICE_OPTIONS.values():
+            if info["voice_id"] == voice:
+                return info
+        return None
+
+    def voice_info(self, voice_id: str) -> Dict[str, Any]:
+        """음성 정보 (모르는 voice_id이면 엔진 기본 음성)"""
+        return self.find_voice(voice_id) or self.VOICE_OPTIONS[self.DEFAULT_VOICE]
+
+    def synthesize_speech(
+        self,
+        text: str,
+        voice_id: Optional[str] = None,
+        speed: float = 1.0,
+        use_cache: bool = True,
+    ) -> Optional[bytes]:
+        """
+        텍스트를 음성으로 변환
+        
+        Args:
+            text: 변환할 텍스트
+            voice_id: 음성 ID (없거나 모르는 값이면 엔진 기본 음성)
+            speed: 음성 속도 (0.5 ~ 2.0)
+            use_cache: False이면 캐시를 건너뛰고 새로 합성 (결과는 캐시에 갱신)
+        
+        Returns:
+            생성된 음성 바이너리 데이터 (MEDIA_TYPE) 또는 None
+        """
+        
+        if not text or not text.strip():
+            return None
+        
+        voice = self.voice_info(voice_id or self.DEFAULT_VOICE)
+        if not self.CHUNKED:
+            return self._synthesize_chunk(text.strip(), voice, speed, use_cache)
+        
+        max_chars = int(os.getenv("TTS_CHUNK_MAX_CHARS") or DEFAULT_CHUNK_MAX_CHARS)
+        chunks = split_text_chunks(text, max_chars)
+        if len(chunks) == 1:
+            return self._synthesize_chunk(chunks[0], voice, speed, use_cache)
+        
+        # 조각을 동시에 합성 (결과는 조각 순서대로)
+        parts = list(
+            get_chunk_executor().map(
+                lambda chunk: self._synthesize_chunk(chunk, voice, speed, use_cache),
+                chunks,
+            )
+        )
+        if any(part is None for part in parts):
+            # 성공한 조각은 캐시에 남으므로 재시도 시 실패한 조각만 다시 합성
+            return None
+        return self.concat(parts)
+    
+    def _synthesize_chunk(
+        self,
+        text: str,
+        voice: Dict[str, Any],
+        speed: float,
+        use_cache: bool,
+    ) -> Optional[bytes]:
+        """조각 하나 합성 (조각 단위 캐시 사용)"""
+        if not self.CACHEABLE:
+            return self._synthesize(text, voice, speed)
+        
+        cache = get_audio_cache()
+        cache_key = make_audio_cache_key(self.ENGINE, text, voice["lang"], voice["voice_id"], speed)
+        if use_cache:
+            cached = cache.get_bytes(cache_key)
+            if cached:
+                return cached
+        
+        audio_data = self._synthesize(text, voice, speed)
+        if audio_data:
+            cache.put_bytes(cache_key, audio_data)
+        return audio_data
+    
+    def _synthesize(self, text: str, voice: Dict[str, Any], speed: float) -> Optional[bytes]:
+        """조각 하나를 합성 (엔진별 구현, 실패 시 None)"""
+        raise NotImplementedError
+    
+    def concat(self, parts: List[bytes]) -> bytes:
+        """조각 오디오를 순서대로 이어 붙임"""
+        return concat_mp3(parts)
+    
+    def estimate_duration(self, text: str, speed: float = 1.0) -> float:
+        """
+        텍스트 기반 음성 길이 추정 (한국어 기준: 1초당 약 5-7글자)
+        
+        Args:
+            text: 추정할 텍스트
+            speed: 음성 속도 (기본 구현은 무시)
+        
+        Returns:
+            추정 시간 (초)
+        """
+        # 한국어는 약 1초당 7글자 기준
+        char_count = len(text)
+        estimated_seconds = max(1.0, char_count / CHARS_PER_SECOND)
+        return round(estimated_seconds, 1)
+
+
+class GoogleTTSService(TTSEngine):
     """Google TTS 음성 생성 서비스 (무료)"""
     
-    # 한국어 지원 음성 목록
+    ENGINE = "gtts"
+    CHUNKED = True
+    DEFAULT_VOICE = "male_professional_kr"
+    
+    # gTTS는 성별/톤 구분이 없어 언어(lang)와 억양 도메인(tld)만 실제로 적용됨
     VOICE_OPTIONS = {
         "male_professional_kr": {
             "voice_id": "ko-male-professional",
@@ -41,78 +227,171 @@ class GoogleTTSService:
             "accent": "korean",
             "lang": "ko",
         },
+        "professional_en_us": {
+            "voice_id": "en-us-professional",
+            "name": "Professional (English, US)",
+            "gender": "neutral",
+            "accent": "american",
+            "lang": "en",
+            "tld": "com",
+        },
+        "professional_en_gb": {
+            "voice_id": "en-gb-professional",
+            "name": "Professional (English, UK)",
+            "gender": "neutral",
+            "accent": "british",
+            "lang": "en",
+            "tld": "co.uk",
+        },
     }
     
-    def __init__(self):
-        # Google TTS는 API 키 불필요 (무료)
-        pass
-    
-    @staticmethod
-    def get_voice_options() -> Dict[str, Any]:
-        """사용 가능한 음성 옵션 반환"""
-        return GoogleTTSService.VOICE_OPTIONS
-    
-    def synthesize_speech(
-        self,
-        text: str,
-        voice_id: str = "ko-male-professional",
-        speed: float = 1.0,
-    ) -> Optional[bytes]:
-        """
-        텍스트를 음성으로 변환
-        
-        Args:
-            text: 변환할 텍스트
-            voice_id: 음성 ID (gTTS는 무시, 언어만 사용)
-            speed: 음성 속도 (0.5 ~ 2.0, gTTS는 지원 안 함)
-        
-        Returns:
-            생성된 음성 바이너리 데이터 (MP3) 또는 None
-        """
-        
-        if not text or not text.strip():
-            return None
-        
+    def _synthesize(self, text: str, voice: Dict[str, Any], speed: float) -> Optional[bytes]:
         try:
-            # gTTS 객체 생성 (한국어 고정)
-            tts = gTTS(text=text, lang='ko', slow=False)
+            tts = gTTS(
+                text=text,
+                lang=voice["lang"],
+                tld=voice.get("tld", "com"),
+                slow=speed <= GTTS_SLOW_SPEED,
+            )
             
             # 음성을 바이트 스트림으로 저장
             audio_buffer = io.BytesIO()
             tts.write_to_fp(audio_buffer)
-            audio_buffer.seek(0)
-            
             return audio_buffer.getvalue()
         
         except Exception as e:
             print(f"Google TTS 생성 실패: {e}")
             return None
+
+
+class LocalToneTTSService(TTSEngine):
+    """
+    오프라인 톤 생성 엔진
+
+    글자마다 글자 코드로 정해지는 음높이의 짧은 톤을 내고 공백/문장 부호는 무음으로 둡니다.
+    같은 입력이면 항상 같은 WAV를 만들고, 길이는 estimate_duration과 같아
+    네트워크 없이 음성 단계와 영상 합성을 실행/측정할 수 있습니다.
+    """
     
-    def estimate_duration(self, text: str) -> float:
-        """
-        텍스트 기반 음성 길이 추정 (한국어 기준: 1초당 약 5-7글자)
+    ENGINE = "local"
+    MEDIA_TYPE = "audio/wav"
+    FILE_EXTENSION = "wav"
+    # 합성 비용이 디스크 캐시 조회보다 작음
+    CACHEABLE = False
+    DEFAULT_VOICE = "local_tone"
+    SAMPLE_RATE = 16000
+    # 톤 사이 클릭 잡음을 없애는 페이드 길이 (초)
+    FADE_SECONDS = 0.005
+    
+    VOICE_OPTIONS = {
+        "local_tone": {
+            "voice_id": "local-tone",
+            "name": "Local Tone (오프라인 테스트용)",
+            "gender": "neutral",
+            "accent": "none",
+            "lang": "ko",
+            "baseFrequency": 220.0,
+        },
+        "local_tone_high": {
+            "voice_id": "local-tone-high",
+            "name": "Local Tone High (오프라인 테스트용)",
+            "gender": "neutral",
+            "accent": "none",
+            "lang": "ko",
+            "baseFrequency": 440.0,
+        },
+    }
+    
+    def _synthesize(self, text: str, voice: Dict[str, Any], speed: float) -> Optional[bytes]:
+        # 글자 하나의 길이는 estimate_duration 기준(1초당 7글자)을 속도로 나눈 값
+        samples_per_char = max(int(self.SAMPLE_RATE / (CHARS_PER_SECOND * speed)), 1)
+        codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+        voiced = np.array([ch.isalnum() for ch in text])
+        # 반음 12단계 안에서 글자 코드로 음높이 결정
+        frequencies = voice["baseFrequency"] * 2 ** ((codes % 12) / 12)
         
-        Args:
-            text: 추정할 텍스트
+        t = np.arange(samples_per_char) / self.SAMPLE_RATE
+        fade = min(int(self.FADE_SECONDS * self.SAMPLE_RATE), samples_per_char // 2)
+        envelope = np.ones(samples_per_char)
+        if fade:
+            ramp = np.linspace(0.0, 1.0, fade)
+            envelope[:fade] = ramp
+            envelope[-fade:] = ramp[::-1]
         
-        Returns:
-            추정 시간 (초)
-        """
-        # 한국어는 약 1초당 7글자 기준
-        char_count = len(text)
-        estimated_seconds = max(1.0, char_count / 7.0)
-        return round(estimated_seconds, 1)
+        tones = np.sin(2 * np.pi * frequencies[:, None] * t[None, :]) * envelope * voiced[:, None]
+        samples = (tones.ravel() * 0.3 * 32767).astype("<i2")
+        
+        # 전체 길이가 estimate_duration보다 짧으면 끝에 무음 추가
+        min_samples = int(self.estimate_duration(text, speed) * self.SAMPLE_RATE)
+        if len(samples) < min_samples:
+            samples = np.concatenate([samples, np.zeros(min_samples - len(samples), dtype="<i2")])
+        
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.SAMPLE_RATE)
+            wav.writeframes(samples.tobytes())
+        return buffer.getvalue()
+    
+    def estimate_duration(self, text: str, speed: float = 1.0) -> float:
+        return round(max(1.0, len(text.strip()) / (CHARS_PER_SECOND * speed)), 1)
+
+
+# 엔진 레지스트리
+TTS_ENGINES = {
+    GoogleTTSService.ENGINE: GoogleTTSService,
+    LocalToneTTSService.ENGINE: LocalToneTTSService,
+}
+
+_tts_engines: Dict[str, TTSEngine] = {}
+
+
+def get_tts_engine(name: Optional[str] = None) -> TTSEngine:
+    """이름별 엔진 인스턴스 반환 (없으면 생성, 이름이 없으면 TTS_ENGINE)"""
+    name = name or os.getenv("TTS_ENGINE") or DEFAULT_TTS_ENGINE
+    if name not in TTS_ENGINES:
+        raise ValueError(f"Unknown TTS engine: {name} (available: {', '.join(TTS_ENGINES)})")
+    if name not in _tts_engines:
+        _tts_engines[name] = TTS_ENGINES[name]()
+    return _tts_engines[name]
+
+
+def get_voice_options() -> Dict[str, Any]:
+    """모든 엔진의 음성 옵션 (키 -> 음성 정보 + engine)"""
+    return {
+        key: {**info, "engine": name}
+        for name, engine in TTS_ENGINES.items()
+        for key, info in engine.VOICE_OPTIONS.items()
+    }
+
+
+def resolve_voice(voice_id: Optional[str] = None, voice_name: Optional[str] = None) -> Tuple[TTSEngine, str]:
+    """
+    voiceId(음성 키 또는 voice_id) 또는 voiceName으로 엔진과 voice_id 결정
+
+    어느 엔진의 음성도 아니면 기본 엔진(TTS_ENGINE)에 voice_id를 그대로 넘깁니다.
+    """
+    for name, engine in TTS_ENGINES.items():
+        info = engine.find_voice(voice_id) if voice_id else None
+        if info is None and not voice_id and voice_name:
+            info = next((v for v in engine.VOICE_OPTIONS.values() if v.get("name") == voice_name), None)
+        if info is not None:
+            return get_tts_engine(name), info["voice_id"]
+
+    engine = get_tts_engine()
+    return engine, voice_id or engine.VOICE_OPTIONS[engine.DEFAULT_VOICE]["voice_id"]
 
 
 def synthesize(
     scripts: List[Dict[str, Any]],
-    voice_id: str = "ko-male-professional",
+    voice_id: Optional[str] = None,
     speed: float = 1.0,
 ) -> List[Dict[str, Any]]:
     """
     여러 스크립트를 음성으로 변환
     """
-    service = GoogleTTSService()
+    service, voice_id = resolve_voice(voice_id)
     results = []
     
     for script in scripts:
@@ -122,7 +401,7 @@ def synthesize(
             speed=speed,
         )
         
-        duration = service.estimate_duration(script.get("scriptText", ""))
+        duration = service.estimate_duration(script.get("scriptText", ""), speed)
         
         results.append({
             "slideId": script.get("slideId"),
@@ -0,0 +1,171 @@
+"""
+업로드 파일 스풀링 서비스
+업로드를 청크 단위로 임시 파일에 기록하여 메모리 사용량을 일정하게 유지
+기록하는 동안 SHA-256 지문을 함께 계산
+요청 본문 크기 제한은 UploadSizeLimitMiddleware가 multipart 파싱 전에 적용
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from fastapi import UploadFile
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# 한 번에 읽어들일 청크 크기 (1MB)
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# multipart 경계/헤더 등 파일 외 본문 여유분
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """업로드 파일이 허용 크기를 초과함"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        super().__init__(f"파일이 너무 큽니다 (최대 {max_size / 1024 / 1024}MB)")
+
+
+class SpooledUpload:
+    """디스크에 기록된 업로드 파일"""
+
+    def __init__(self, path: Path, size: int, sha256: str):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+
+    def cleanup(self) -> None:
+        """임시 파일 삭제"""
+        try:
+            self.path.unlink(missing_ok=True)
+        except OSError as e:
+            print(f"[WARN] Failed to remove spooled upload {self.path}: {e}")
+
+
+async def spool_upload(
+    file: UploadFile,
+    max_size: int,
+    suffix: str = "",
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> SpooledUpload:
+    """
+    업로드 파일을 임시 파일로 스트리밍 저장
+
+    크기 제한을 넘는 순간 중단하고 UploadTooLargeError를 발생시킵니다.
+    이 함수가 호출될 때는 Starlette가 multipart 본문을 이미 받아둔 상태이므로,
+    큰 업로드를 받기 전에 끊는 것은 UploadSizeLimitMiddleware가 담당합니다.
+    """
+    # 크기를 미리 알 수 있으면 읽기 전에 거부
+    declared_size: Optional[int] = getattr(file, "size", None)
+    if declared_size is not None and declared_size > max_size:
+        raise UploadTooLargeError(max_size)
+
+    spool_dir = os.getenv("UPLOAD_SPOOL_DIR") or None
+    fd, temp_name = tempfile.mkstemp(prefix="vlooo_upload_", suffix=suffix, dir=spool_dir)
+    path = Path(temp_name)
+    size = 0
+    digest = hashlib.sha256()
+
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLargeError(max_size)
+                digest.update(chunk)
+                # 디스크 쓰기는 이벤트 루프를 막지 않도록 스레드에서
+                await asyncio.to_thread(out.write, chunk)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+
+    return SpooledUpload(path, size, digest.hexdigest())
+
+
+class UploadSizeLimitMiddleware:
+    """
+    경로별 요청 본문 크기 제한 (multipart 파싱 전에 적용)
+
+    Content-Length가 제한을 넘으면 본문을 읽지 않고 바로 413을 반환하고,
+    Content-Length가 없으면(chunked) 받은 바이트를 세다가 제한을 넘는 순간 413을 보내고
+    앱에는 연결 종료를 전달하여 본문 읽기를 멈춥니다 (이후 앱의 응답은 버림).
+    제한은 파일 크기에 multipart 여유분(MULTIPART_OVERHEAD)을 더한 값이며,
+    정확한 파일 크기 검사는 spool_upload가 합니다.
+    """
+
+    def __init__(self, app: ASGIApp, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        max_size = self.limits.get(scope.get("path", "")) if scope["type"] == "http" else None
+        if max_size is None:
+            await self.app(scope, receive, send)
+            return
+
+        limit = max_size + MULTIPART_OVERHEAD
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            await self._reject(send, max_size)
+            return
+
+        received = 0
+        response_started = False
+        rejected = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit and not response_started:
+                    rejected = True
+                    await self._reject(send, max_size)
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            nonlocal response_started
+            if rejected:
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        await self.app(scope, limited_receive, guarded_send)
+
+    async def _reject(self, send: Send, max_size: int) -> None:
+        body = json.dumps(
+            {
+                "success": False,
+                "error": {
+                    "code": "FILE_TOO_LARGE",
+                    "message": str(UploadTooLargeError(max_size)),
+                },
+                "timestamp": datetime.utcnow().isoformat(),
+            },
+            ensure_ascii=False,
+        ).encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 413,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"connection", b"close"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -3,16 +3,20 @@ FFmpeg 기반 비디오 렌더링 서비스
 """
 
 import base64
+import io
 import os
 import shutil
 import subprocess
 import tempfile
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
+from urllib.parse import urlparse
 
 import requests
 from PIL import Image, ImageDraw, ImageFont
 
+from app.services.image_store import resolve_media_url
+
 
 def _resolution_to_size(resolution: str) -> Tuple[int, int]:
     if resolution == "720p":
@@ -26,6 +30,10 @@ def _read_bytes_from_url(url: str) -> bytes:
     if url.startswith("data:"):
         header, b64_data = url.split(",", 1)
         return base64.b64decode(b64_data)
+    local_path = resolve_media_url(url)
+    if local_path:
+        # 이 서버의 /media 파일은 HTTP를 거치지 않고 디스크에서 읽음
+        return local_path.read_bytes()
     if url.startswith("http://") or url.startswith("https://"):
         resp = requests.get(url, timeout=60)
         resp.raise_for_status()
@@ -40,6 +48,40 @@ def _download_to_path(url: str, dest_path: Path) -> None:
     dest_path.write_bytes(data)
 
 
+# TTS 엔진 출력 형식별 확장자 (gTTS: MP3, local: WAV)
+AUDIO_EXTENSIONS = {
+    "audio/mpeg": ".mp3",
+    "audio/mp3": ".mp3",
+    "audio/wav": ".wav",
+    "audio/x-wav": ".wav",
+    "audio/wave": ".wav",
+}
+
+
+def _audio_extension(url: str) -> str:
+    """오디오 URL의 형식에 맞는 확장자 (data URL은 미디어 타입, 그 외는 경로 확장자, 모르면 .mp3)"""
+    if url.startswith("data:"):
+        media_type = url[5:].split(",", 1)[0].split(";", 1)[0].strip().lower()
+        return AUDIO_EXTENSIONS.get(media_type, ".mp3")
+    suffix = Path(urlparse(url).path).suffix.lower()
+    return suffix if suffix in AUDIO_EXTENSIONS.values() else ".mp3"
+
+
+def _fit_image_to_frame(data: bytes, path: Path, width: int, height: int) -> bool:
+    """이미지를 프레임 크기에 맞춰 레터박스 처리 후 PNG로 저장 (실패 시 False)"""
+    try:
+        with Image.open(io.BytesIO(data)) as source:
+            picture = source.convert("RGB")
+        picture.thumbnail((width, height), Image.LANCZOS)
+        frame = Image.new("RGB", (width, height), color=(15, 23, 42))
+        frame.paste(picture, ((width - picture.width) // 2, (height - picture.height) // 2))
+        frame.save(path, format="PNG")
+        return True
+    except Exception as e:
+        print(f"[WARN] Failed to fit slide image: {e}")
+        return False
+
+
 def _create_placeholder_image(path: Path, width: int, height: int, title: str) -> None:
     image = Image.new("RGB", (width, height), color=(15, 23, 42))
     draw = ImageDraw.Draw(image)
@@ -115,11 +157,20 @@ def render_video(
         slide_number = int(slide.get("slideNumber", 1))
         title = str(slide.get("title", ""))
         image_urls = slide.get("imageUrls") or []
+        frame_urls = slide.get("frameUrls") or {}
         image_path = images_dir / f"slide_{slide_number}.png"
 
-        if image_urls:
-            _download_to_path(str(image_urls[0]), image_path)
-        else:
+        # 파싱 시 래스터화된 프레임 우선, 없으면 첫 번째 그림 사용
+        # 모든 프레임이 같은 크기여야 concat이 가능하므로 프레임 크기로 맞춤
+        source_url = frame_urls.get(resolution) or frame_urls.get("1080p")
+        if not source_url and image_urls:
+            source_url = image_urls[0]
+        fitted = False
+        if source_url:
+            fitted = _fit_image_to_frame(
+                _read_bytes_from_url(str(source_url)), image_path, width, height
+            )
+        if not fitted:
             _create_placeholder_image(image_path, width, height, title)
 
         audio_info = audio_map.get(slide_number)
@@ -128,8 +179,10 @@ def render_video(
         slide_items.append((image_path, duration))
 
         if audio_info:
-            audio_path = audio_dir / f"slide_{slide_number}.mp3"
-            _download_to_path(str(audio_info.get("audioUrl", "")), audio_path)
+            audio_url = str(audio_info.get("audioUrl", ""))
+            # 확장자를 실제 형식에 맞춰야 FFmpeg concat이 WAV를 MP3로 잘못 읽지 않음
+            audio_path = audio_dir / f"slide_{slide_number}{_audio_extension(audio_url)}"
+            _download_to_path(audio_url, audio_path)
             audio_items.append((audio_path, duration))
 
     # 이미지 슬라이드 비디오 생성
@@ -0,0 +1,190 @@
+"""
+LLM 클라이언트 연결 풀 벤치마크
+슬라이드마다 새 클라이언트/연결을 만드는 기존 방식과 공유 keep-alive 풀의 호출 지연을 비교
+
+기본적으로 로컬 모의 서버(Ollama /api/generate, OpenAI /v1/chat/completions)를 띄워 측정하며,
+--ollama-url로 실제 Ollama 서버를 지정할 수 있습니다.
+TLS 핸드셰이크 비용은 모의 서버(HTTP)에서는 나타나지 않으므로 실제 OpenAI에서는 차이가 더 큽니다.
+--in-flight를 주면 모의 서버 지연(--delay) 동안 그 수만큼의 요청을 동시에 보내
+대기 중인 요청이 스레드 없이 코루틴으로 처리되는지 확인합니다.
+
+사용법:
+    python benchmarks/llm_client_benchmark.py --calls 40
+    python benchmarks/llm_client_benchmark.py --delay 0.5 --in-flight 200
+    python benchmarks/llm_client_benchmark.py --ollama-url http://localhost:11434 --calls 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Awaitable, Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.services.llm_clients import LLMClientPool
+
+SCRIPT_TEXT = "이 슬라이드는 클라우드 전환 전략의 핵심 단계를 설명합니다."
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    """keep-alive를 지원하는 모의 LLM 서버"""
+
+    protocol_version = "HTTP/1.1"
+    # 헤더/본문을 나눠 쓰므로 keep-alive 연결에서 Nagle 지연(~40ms)이 생기지 않도록
+    disable_nagle_algorithm = True
+    # 모의 생성 지연 (초)
+    delay = 0.0
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        time.sleep(self.delay)
+
+        if self.path.endswith("/api/generate"):
+            body = {"response": SCRIPT_TEXT, "done": True}
+        else:
+            body = {
+                "id": "chatcmpl-bench",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": "gpt-4o-mini",
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": SCRIPT_TEXT},
+                    "finish_reason": "stop",
+                }],
+            }
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    # --in-flight 동시 연결을 받을 수 있도록 listen 대기열 확장
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+async def measure(label: str, call: Callable[[], Awaitable[None]], calls: int) -> List[float]:
+    latencies = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        await call()
+        latencies.append((time.perf_counter() - started) * 1000)
+    print(
+        f"{label:<28} mean {statistics.mean(latencies):7.2f}ms  "
+        f"p50 {statistics.median(latencies):7.2f}ms  max {max(latencies):7.2f}ms"
+    )
+    return latencies
+
+
+async def measure_in_flight(label: str, call: Callable[[], Awaitable[None]], in_flight: int) -> None:
+    """요청 in_flight개를 동시에 보내 전체 소요 시간과 클라이언트 쪽 최대 스레드 수 측정"""
+
+    def client_threads() -> int:
+        # 같은 프로세스의 모의 서버 요청 처리 스레드는 제외
+        return sum(1 for t in threading.enumerate() if "process_request" not in t.name)
+
+    peak_threads = client_threads()
+
+    async def tracked() -> None:
+        nonlocal peak_threads
+        await call()
+        peak_threads = max(peak_threads, client_threads())
+
+    started = time.perf_counter()
+    await asyncio.gather(*(tracked() for _ in range(in_flight)))
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {in_flight} in flight  {elapsed:6.2f}s  client threads {peak_threads}")
+
+
+async def run(args: argparse.Namespace) -> None:
+    MockLLMHandler.delay = args.delay
+    server = MockLLMServer(("127.0.0.1", 0), MockLLMHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    mock_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    ollama_url = (args.ollama_url or mock_url).rstrip("/")
+    payload = {
+        "model": args.ollama_model,
+        "prompt": "슬라이드 제목: 클라우드 전환\n한 문장으로 설명해주세요.",
+        "stream": False,
+    }
+    os.environ["OLLAMA_URL"] = ollama_url
+    os.environ["OPENAI_API_KEY"] = "benchmark"
+    pool = LLMClientPool()
+    pool.start()
+
+    async def ollama_per_slide() -> None:
+        async with httpx.AsyncClient(timeout=120) as client:
+            (await client.post(f"{ollama_url}/api/generate", json=payload)).json()
+
+    async def ollama_shared() -> None:
+        (await pool.ollama.post("/api/generate", json=payload)).json()
+
+    print(f"ollama: {ollama_url} ({args.calls} calls)")
+    before = await measure("new AsyncClient per slide", ollama_per_slide, args.calls)
+    after = await measure("shared AsyncClient pool", ollama_shared, args.calls)
+    print(f"{'speedup':<28} {statistics.mean(before) / statistics.mean(after):.1f}x")
+
+    messages = [{"role": "user", "content": "슬라이드 제목: 클라우드 전환"}]
+
+    async def openai_per_slide() -> None:
+        client = AsyncOpenAI(api_key="benchmark", base_url=f"{mock_url}/v1")
+        await client.chat.completions.create(model="gpt-4o-mini", messages=messages)
+        await client.close()
+
+    shared = pool.openai.with_options(base_url=f"{mock_url}/v1")
+
+    async def openai_shared() -> None:
+        await shared.chat.completions.create(model="gpt-4o-mini", messages=messages)
+
+    print(f"\nopenai (mock): {mock_url} ({args.calls} calls)")
+    before = await measure("new OpenAI client per slide", openai_per_slide, args.calls)
+    after = await measure("shared httpx pool", openai_shared, args.calls)
+    print(f"{'speedup':<28} {statistics.mean(before) / statistics.mean(after):.1f}x")
+
+    if args.in_flight:
+        async with httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=None),
+            timeout=httpx.Timeout(120, pool=None),
+        ) as client:
+            print(f"\nin flight (mock, delay {args.delay}s)")
+            await measure_in_flight(
+                "AsyncClient coroutines",
+                lambda: client.post(f"{mock_url}/api/generate", json=payload),
+                args.in_flight,
+            )
+
+    await pool.aclose()
+    server.shutdown()
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="LLM client pool benchmark")
+    arg_parser.add_argument("--calls", type=int, default=40)
+    arg_parser.add_argument("--delay", type=float, default=0.0, help="모의 서버 생성 지연 (초)")
+    arg_parser.add_argument("--in-flight", type=int, default=0, help="동시 요청 수 (0이면 측정 생략)")
+    arg_parser.add_argument("--ollama-url", default=None, help="실제 Ollama 서버 URL (생략 시 모의 서버)")
+    arg_parser.add_argument("--ollama-model", default=os.getenv("OLLAMA_MODEL", "llama3.1"))
+    asyncio.run(run(arg_parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+PPT 파서 벤치마크
+도형이 많은 대용량 덱을 생성하여 기존 3회 순회 방식과 단일 순회 방문자를 비교
+
+사용법:
+    python benchmarks/parse_benchmark.py --slides 300 --shapes 40
+"""
+
+import argparse
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from PIL import Image
+from pptx import Presentation
+from pptx.util import Inches, Pt
+
+from app.services.ppt_parser import PptParser
+
+
+def build_deck(path: Path, slide_count: int, shapes_per_slide: int) -> None:
+    """텍스트 상자, 그룹, 표, 그림이 섞인 테스트 덱 생성"""
+    prs = Presentation()
+    logo = io.BytesIO()
+    Image.new("RGB", (200, 80), (30, 64, 175)).save(logo, format="PNG")
+
+    for slide_idx in range(slide_count):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = f"Slide {slide_idx + 1} title"
+        slide.placeholders[1].text = "Body paragraph\nSecond line"
+
+        for shape_idx in range(shapes_per_slide):
+            box = slide.shapes.add_textbox(
+                Inches(0.2 + (shape_idx % 8) * 1.2),
+                Inches(1.5 + (shape_idx // 8) * 0.5),
+                Inches(1.1),
+                Inches(0.4),
+            )
+            box.text_frame.text = f"Item {shape_idx}"
+            box.text_frame.paragraphs[0].runs[0].font.size = Pt(10)
+
+        group = slide.shapes.add_group_shape()
+        for group_idx in range(4):
+            member = group.shapes.add_textbox(Inches(group_idx), Inches(6), Inches(1), Inches(0.3))
+            member.text_frame.text = f"Grouped {group_idx}"
+
+        table = slide.shapes.add_table(3, 3, Inches(6), Inches(5), Inches(3), Inches(1)).table
+        for row in range(3):
+            for col in range(3):
+                table.cell(row, col).text = f"r{row}c{col}"
+
+        logo.seek(0)
+        slide.shapes.add_picture(logo, Inches(8), Inches(0.2))
+        slide.notes_slide.notes_text_frame.text = f"Notes for slide {slide_idx + 1}"
+
+    prs.save(str(path))
+
+
+def legacy_extract(prs: Presentation) -> int:
+    """기존 구현: 제목/텍스트/이미지마다 도형을 따로 순회"""
+    total = 0
+    for slide in prs.slides:
+        try:
+            title = slide.shapes.title.text.strip() if slide.shapes.title else ""
+        except Exception:
+            title = ""
+        text_parts = []
+        for shape in slide.shapes:
+            if hasattr(shape, "text") and shape.text.strip():
+                if shape != slide.shapes.title:
+                    text_parts.append(shape.text.strip())
+        images = []
+        for shape in slide.shapes:
+            if shape.shape_type == 13:
+                images.append(shape.image.blob)
+        total += len(title) + len(text_parts) + len(images)
+    return total
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="PPT parser benchmark")
+    arg_parser.add_argument("--slides", type=int, default=300)
+    arg_parser.add_argument("--shapes", type=int, default=40)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        deck_path = Path(temp_dir) / "bench.pptx"
+        started = time.perf_counter()
+        build_deck(deck_path, args.slides, args.shapes)
+        print(f"deck: {args.slides} slides x {args.shapes} shapes "
+              f"({deck_path.stat().st_size / 1024 / 1024:.1f}MB, built in {time.perf_counter() - started:.1f}s)")
+
+        legacy_times = []
+        visitor_times = []
+        for _ in range(args.repeat):
+            prs = Presentation(str(deck_path))
+            started = time.perf_counter()
+            legacy_extract(prs)
+            legacy_times.append(time.perf_counter() - started)
+
+            parser = PptParser()
+            parser.prs = Presentation(str(deck_path))
+            started = time.perf_counter()
+            parser._extract_slides()
+            visitor_times.append(time.perf_counter() - started)
+
+        legacy_best = min(legacy_times)
+        visitor_best = min(visitor_times)
+        print(f"legacy three-pass : {legacy_best:.3f}s")
+        print(f"single-pass visitor: {visitor_best:.3f}s ({legacy_best / visitor_best:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
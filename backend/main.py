@@ -9,9 +9,6 @@ from fastapi.staticfiles import StaticFiles
 import os
 from dotenv import load_dotenv
 from pathlib import Path
-import subprocess
-import time
-import requests
 from contextlib import asynccontextmanager
 
 # 환경 변수 로드 (프로젝트 루트의 .env.local 파일 로드)
@@ -24,76 +21,23 @@ BASE_DIR = Path(__file__).resolve().parent
 MEDIA_DIR = Path(os.getenv("MEDIA_DIR", str(BASE_DIR / "media")))
 MEDIA_DIR.mkdir(parents=True, exist_ok=True)
 
-# ============ Ollama 자동 시작 ============
-ollama_process = None
-
-def start_ollama():
-    """Ollama 서비스 자동 시작"""
-    global ollama_process
-    try:
-        # URL로 Ollama 헬스 체크
-        ollama_url = os.getenv("OLLAMA_URL", "http://localhost:11434")
-        try:
-            response = requests.get(f"{ollama_url}/api/tags", timeout=2)
-            if response.status_code == 200:
-                import sys
-                timestamp = time.strftime("%H:%M:%S")
-                print(f"[{timestamp}] [MINOR] [OLLAMA] OK - Ollama is already running", file=sys.stdout, flush=True)
-                return True
-        except:
-            pass
-        
-        # Ollama 프로세스 시작
-        import sys
-        timestamp = time.strftime("%H:%M:%S")
-        print(f"[{timestamp}] [MINOR] [OLLAMA] Starting Ollama service...", file=sys.stdout, flush=True)
-        ollama_process = subprocess.Popen(
-            ["ollama", "serve"],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
-        
-        # Ollama 시작 대기 (최대 30초)
-        for i in range(30):
-            try:
-                response = requests.get(f"{ollama_url}/api/tags", timeout=2)
-                if response.status_code == 200:
-                    import sys
-                    timestamp = time.strftime("%H:%M:%S")
-                    print(f"[{timestamp}] [MAJOR] [OLLAMA] OK - Ollama started successfully", file=sys.stdout, flush=True)
-                    return True
-            except:
-                pass
-            time.sleep(1)
-        
-        import sys
-        timestamp = time.strftime("%H:%M:%S")
-        print(f"[{timestamp}] [WARNING] [OLLAMA] WARN - Ollama startup timeout - may need manual start", file=sys.stdout, flush=True)
-        return False
-    
-    except FileNotFoundError:
-        import sys
-        timestamp = time.strftime("%H:%M:%S")
-        print(f"[{timestamp}] [CRITICAL] [OLLAMA] ERROR - Ollama not found in PATH - please install Ollama first", file=sys.stdout, flush=True)
-        return False
-    except Exception as e:
-        import sys
-        timestamp = time.strftime("%H:%M:%S")
-        print(f"[{timestamp}] [WARNING] [OLLAMA] WARN - Could not auto-start Ollama: {e}", file=sys.stdout, flush=True)
-        return False
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """FastAPI 라이프사이클 - 앱 시작/종료"""
     # 시작할 때
-    start_ollama()
+    from app.services.parse_engine import get_parse_engine
+    from app.services.llm_clients import get_llm_clients
+    from app.services.ollama_supervisor import get_ollama_supervisor
+    get_parse_engine().start()
+    get_llm_clients().start()
+    # Ollama 시작/모델 로딩은 백그라운드에서 진행 (준비 상태는 /api/status의 ollama)
+    get_ollama_supervisor().start()
     yield
     # 종료할 때
-    if ollama_process:
-        import sys
-        timestamp = time.strftime("%H:%M:%S")
-        print(f"[{timestamp}] [MINOR] [OLLAMA] Stopping Ollama...", file=sys.stdout, flush=True)
-        ollama_process.terminate()
+    await get_ollama_supervisor().stop()
+    get_parse_engine().shutdown()
+    await get_llm_clients().aclose()
 
 # ============ 프로젝트 상태 추적 ============
 # 프로젝트별 진행 상태를 저장하는 글로벌 딕셔너리
@@ -202,6 +146,42 @@ def get_stage_result(project_id: str, stage: str) -> Optional[Dict[str, Any]]:
     progress = project_progress.get(project_id, {})
     return progress.get("results", {}).get(stage)
 
+# 단계별 결과에서 슬라이드 항목 목록이 들어있는 필드
+STAGE_SLIDE_ITEMS = {
+    "scripting": "scripts",
+    "voice-synthesis": "audioUrls",
+}
+
+def get_reusable_slide_results(project_id: str, stage: str) -> Dict[str, Dict[str, Any]]:
+    """
+    증분 재파싱된 프로젝트에서 재사용 가능한 이전 버전의 슬라이드별 결과 조회
+
+    Returns:
+        새 slideId -> 이전 프로젝트의 해당 단계 항목 (변경되지 않은 슬라이드만)
+        항목에는 "_stageData"로 이전 단계 결과의 나머지 필드(톤, 음성 등)가 함께 담김
+    """
+    parsing = get_stage_result(project_id, "parsing") or {}
+    changes = (parsing.get("data") or {}).get("changes") or {}
+    previous_id = changes.get("previousProjectId")
+    reused = changes.get("reused") or {}
+    if not previous_id or not reused:
+        return {}
+
+    previous_result = get_stage_result(previous_id, stage) or {}
+    if previous_result.get("status") != "completed":
+        return {}
+    previous_data = previous_result.get("data") or {}
+    field = STAGE_SLIDE_ITEMS.get(stage, "")
+    previous_items = {item.get("slideId"): item for item in previous_data.get(field, [])}
+    stage_data = {key: value for key, value in previous_data.items() if key != field}
+
+    results = {}
+    for slide_id, previous_slide_id in reused.items():
+        item = previous_items.get(previous_slide_id)
+        if item:
+            results[slide_id] = {**item, "_stageData": stage_data}
+    return results
+
 def get_project_progress(project_id: str):
     """프로젝트 진행 상태 조회"""
     # 메모리에 없으면 파일에서 로드 시도
@@ -218,6 +198,12 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# 업로드 본문 크기 제한 (multipart 파싱 전에 거부, CORS 헤더가 붙도록 CORS보다 안쪽에 등록)
+from app.routes.ppt import MAX_UPLOAD_SIZE as PPT_MAX_UPLOAD_SIZE
+from app.services.upload_spool import UploadSizeLimitMiddleware
+
+app.add_middleware(UploadSizeLimitMiddleware, limits={"/api/parse-ppt": PPT_MAX_UPLOAD_SIZE})
+
 # CORS 설정 (Next.js와의 통신 허용)
 app.add_middleware(
     CORSMiddleware,
@@ -271,6 +257,11 @@ async def health_check():
 @app.get("/api/status")
 async def api_status():
     """API 상태 조회"""
+    from app.services.parse_engine import get_parse_engine
+    from app.services.disk_cache import get_cache_stats
+    from app.services.llm_clients import get_llm_clients
+    from app.services.provider_router import get_provider_router
+    from app.services.ollama_supervisor import get_ollama_supervisor
     return {
         "status": "operational",
         "environment": os.getenv("FASTAPI_ENV", "production"),
@@ -281,6 +272,11 @@ async def api_status():
             "video_renderer": "ready",
             "r2_storage": os.getenv("CLOUDFLARE_R2_ENDPOINT") is not None,
         },
+        "parseEngine": get_parse_engine().status(),
+        "llmClients": get_llm_clients().status(),
+        "llmProviders": get_provider_router().status(),
+        "ollama": get_ollama_supervisor().status(),
+        "caches": get_cache_stats(),
     }
 
 
@@ -0,0 +1,32 @@
+from app.services.keyword_extractor import extract_keywords, tokenize
+
+
+def _stems(text):
+    return [stem for stem, _ in tokenize(text)]
+
+
+def test_nouns_ending_in_verb_like_syllables_survive():
+    stems = _stems("분류기와 생성기를 비교하고 재고 관리 시스템을 설명합니다")
+    assert "분류기" in stems
+    assert "생성기" in stems
+    assert "재고" in stems
+    assert "시스템" in stems
+
+
+def test_verb_stems_are_dropped():
+    stems = _stems("데이터를 분석하기 위해 모델이 사용되고 결과를 확인하는 과정")
+    assert not [stem for stem in stems if stem.endswith(("하", "되", "하기", "되고", "하는"))]
+    assert "데이터" in stems
+    assert "과정" in stems
+
+
+def test_extract_keywords_keeps_slide_nouns():
+    slide_keywords, deck_keywords = extract_keywords(
+        [
+            "이미지 분류기는 입력 이미지를 범주로 나눕니다. 분류기 정확도가 중요합니다.",
+            "텍스트 생성기는 문장을 만듭니다. 생성기 품질을 평가합니다.",
+        ]
+    )
+    assert "분류기" in slide_keywords[0]
+    assert "생성기" in slide_keywords[1]
+    assert {"분류기", "생성기"} <= set(deck_keywords)
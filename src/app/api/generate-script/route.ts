@@ -27,12 +27,16 @@ const ScriptGenerationRequestSchema = z.object({
         title: z.string().optional(),
         content: z.string().optional(),
         imageUrls: z.array(z.string()).optional(),
+        notes: z.string().optional(),
       })
     )
     .min(1, '슬라이드가 필요합니다'),
   toneOfVoice: z.enum(['professional', 'friendly', 'casual']).default('professional'),
   language: z.enum(['ko', 'en']).default('ko'),
   customInstructions: z.string().optional(),
+  bypassCache: z.boolean().default(false),
+  batchSize: z.number().int().min(1).max(20).optional(),
+  scriptSource: z.enum(['llm', 'notes', 'notes-then-llm', 'polish-notes']).optional(),
 });
 
 export async function POST(request: NextRequest) {
@@ -45,7 +49,16 @@ export async function POST(request: NextRequest) {
       throw validationError(validation.error.flatten().fieldErrors as any);
     }
 
-    const { projectId, slides, toneOfVoice, language, customInstructions } = validation.data;
+    const {
+      projectId,
+      slides,
+      toneOfVoice,
+      language,
+      customInstructions,
+      bypassCache,
+      batchSize,
+      scriptSource,
+    } = validation.data;
 
     console.log(`[SCRIPT_GEN] 스크립트 생성 시작: ${projectId} (${slides.length}개 슬라이드)`);
 
@@ -57,6 +70,9 @@ export async function POST(request: NextRequest) {
       toneOfVoice,
       language,
       customInstructions,
+      bypassCache,
+      batchSize,
+      scriptSource,
     });
 
     if (!response.data.success) {
@@ -0,0 +1,44 @@
+/**
+ * POST /api/generate-script/stream
+ * AI 스크립트 생성 스트리밍 엔드포인트 (Server-Sent Events)
+ * FastAPI 백엔드의 이벤트 스트림을 버퍼링 없이 그대로 전달
+ */
+
+import { NextRequest } from 'next/server';
+import { errorResponse, logError, createApiError, ERROR_CODES } from '@/utils/errors';
+
+export async function POST(request: NextRequest) {
+  try {
+    const body = await request.text();
+
+    const backendUrl = process.env.NEXT_PUBLIC_FASTAPI_URL || 'http://localhost:8000';
+    const response = await fetch(`${backendUrl}/api/generate-script/stream`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body,
+      // 클라이언트가 연결을 끊으면 백엔드 요청도 중단
+      signal: request.signal,
+    });
+
+    // 검증 실패 등은 스트림이 아닌 JSON 오류로 반환됨
+    if (!response.ok || !response.body) {
+      const data = await response.json().catch(() => null);
+      throw createApiError(
+        ERROR_CODES.SCRIPT_GENERATION_FAILED,
+        data?.error?.message || '스크립트 생성 실패',
+        response.status >= 400 ? response.status : 500
+      );
+    }
+
+    return new Response(response.body, {
+      headers: {
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        Connection: 'keep-alive',
+      },
+    });
+  } catch (error) {
+    logError(error, { endpoint: '/api/generate-script/stream' });
+    return errorResponse(error);
+  }
+}
@@ -1,7 +1,7 @@
 /**
  * POST /api/generate-tts
  * TTS (음성 합성) 엔드포인트
- * ElevenLabs API를 사용하여 스크립트를 음성으로 변환
+ * 백엔드 TTS 엔진(gTTS, 오프라인 톤 생성기)으로 스크립트를 음성으로 변환
  */
 
 import { NextRequest } from 'next/server';
@@ -25,7 +25,7 @@ const TtsRequestSchema = z.object({
   speed: z.number().min(0.5).max(2).default(1),
 });
 
-// 사전정의된 ElevenLabs 음성 옵션
+// 사전정의된 음성 옵션 (백엔드 /api/tts/voices 와 같은 키)
 const AVAILABLE_VOICES = [
   {
     id: 'male_professional_kr',
@@ -55,6 +55,34 @@ const AVAILABLE_VOICES = [
     accent: 'korean',
     description: '친근한 여성 음성',
   },
+  {
+    id: 'professional_en_us',
+    name: 'Professional (English, US)',
+    gender: 'neutral',
+    accent: 'american',
+    description: '영어 음성 (미국)',
+  },
+  {
+    id: 'professional_en_gb',
+    name: 'Professional (English, UK)',
+    gender: 'neutral',
+    accent: 'british',
+    description: '영어 음성 (영국)',
+  },
+  {
+    id: 'local_tone',
+    name: 'Local Tone (오프라인 테스트용)',
+    gender: 'neutral',
+    accent: 'none',
+    description: '네트워크 없이 생성하는 테스트 톤 (부하 테스트용)',
+  },
+  {
+    id: 'local_tone_high',
+    name: 'Local Tone High (오프라인 테스트용)',
+    gender: 'neutral',
+    accent: 'none',
+    description: '네트워크 없이 생성하는 높은 테스트 톤 (부하 테스트용)',
+  },
 ];
 
 export async function POST(request: NextRequest) {
@@ -33,7 +33,15 @@ export async function POST(request: NextRequest) {
     console.log(`[PARSE_PPT] 파싱 시작: ${file.name}`);
 
     const backendUrl = process.env.NEXT_PUBLIC_FASTAPI_URL || 'http://localhost:8001';
-    const response = await fetch(`${backendUrl}/api/parse-ppt`, {
+    const params = new URLSearchParams();
+    for (const key of ['mode', 'previousProjectId']) {
+      const value = formData.get(key);
+      if (typeof value === 'string' && value) {
+        params.set(key, value);
+      }
+    }
+    const query = params.toString() ? `?${params.toString()}` : '';
+    const response = await fetch(`${backendUrl}/api/parse-ppt${query}`, {
       method: 'POST',
       body: formData,
     });
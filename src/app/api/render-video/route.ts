@@ -19,6 +19,8 @@ const VideoRenderRequestSchema = z.object({
       title: z.string().optional(),
       content: z.string(),
       imageUrls: z.array(z.string()).default([]),
+      // 래스터화된 슬라이드 프레임 - 스키마에 없으면 zod가 제거하여 백엔드가 imageUrls로 대체함
+      frameUrls: z.record(z.string()).optional().default({}),
     })
   ),
   audioUrls: z.array(
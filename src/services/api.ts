@@ -8,6 +8,7 @@ import {
   UploadResponse,
   ParsePptResponse,
   ScriptGenerationResponse,
+  ScriptSource,
   TtsResponse,
   VideoRenderResponse,
   ProjectStatus,
@@ -121,6 +122,9 @@ class ApiClient {
       toneOfVoice?: 'professional' | 'friendly' | 'casual';
       language?: 'ko' | 'en';
       customInstructions?: string;
+      bypassCache?: boolean; // 캐시된 스크립트 대신 새로 생성
+      batchSize?: number; // 한 번의 요청으로 생성할 슬라이드 수
+      scriptSource?: ScriptSource; // 발표자 노트 사용 정책 (기본값: llm)
     }
   ): Promise<ScriptGenerationResponse> {
     const response = await this.axiosInstance.post<ApiResponse<ScriptGenerationResponse>>(
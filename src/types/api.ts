@@ -57,11 +57,22 @@ export interface Slide {
   title?: string;
   content: string;
   imageUrls: string[];
+  frameUrls?: Record<'1080p' | '720p' | 'thumbnail', string>; // 래스터화된 슬라이드 프레임
   notes?: string;
+  contentHash?: string; // 슬라이드 내용 해시 (증분 재파싱 비교용)
 }
 
 export interface ParsePptRequest {
   file: File;
+  mode?: 'full' | 'text'; // 기본값: full (text: 제목/본문/노트만 빠르게 추출)
+  previousProjectId?: string; // 이전 버전 덱의 프로젝트 ID (변경되지 않은 슬라이드 결과 재사용)
+}
+
+export interface DeckChanges {
+  previousProjectId: string;
+  slides: Record<string, 'unchanged' | 'changed' | 'added'>;
+  reused: Record<string, string>; // 새 slideId -> 이전 slideId
+  removed: string[];
 }
 
 export interface ParsePptResponse {
@@ -74,17 +85,29 @@ export interface ParsePptResponse {
     pptAuthor?: string;
     createdAt?: string;
   };
+  changes?: DeckChanges; // previousProjectId로 파싱한 경우에만
+  rasterizeFailed?: number[]; // 프레임 생성에 실패한 슬라이드 번호 (렌더링 시 imageUrls로 대체)
 }
 
 /**
  * ===== AI 스크립트 생성 =====
  */
+/**
+ * 스크립트 출처 정책
+ * - llm: 항상 AI 생성
+ * - notes: 발표자 노트 그대로 사용
+ * - notes-then-llm: 노트가 충분히 길면 그대로, 아니면 AI 생성
+ * - polish-notes: 노트가 충분히 길면 AI로 문장만 다듬기, 아니면 AI 생성
+ */
+export type ScriptSource = 'llm' | 'notes' | 'notes-then-llm' | 'polish-notes';
+
 export interface ScriptGenerationRequest {
   projectId: string;
   slides: Slide[];
   toneOfVoice?: 'professional' | 'friendly' | 'casual'; // 기본값: professional
   language?: 'ko' | 'en'; // 기본값: ko
   customInstructions?: string;
+  scriptSource?: ScriptSource; // 기본값: llm
 }
 
 export interface GeneratedScript {
@@ -93,12 +116,14 @@ export interface GeneratedScript {
   scriptText: string;
   duration?: number; // 예상 음성 길이 (초)
   keywords?: string[];
+  source?: 'notes' | 'polish' | 'llm'; // 실제 스크립트 출처
 }
 
 export interface ScriptGenerationResponse {
   projectId: string;
   scripts: GeneratedScript[];
   totalDuration?: number;
+  deckKeywords?: string[]; // 덱 전체 주요 키워드
   generatedAt: string;
 }
 
@@ -108,7 +133,7 @@ export interface ScriptGenerationResponse {
 export interface TtsRequest {
   projectId: string;
   scripts: GeneratedScript[];
-  voiceId?: string; // ElevenLabs voice ID
+  voiceId?: string; // 음성 키 또는 voice_id (엔진은 음성으로 결정: gtts, local)
   voiceName?: string; // e.g., "Professional Male", "Professional Female"
   speed?: number; // 0.5 - 2.0, 기본값: 1.0
 }
@@ -122,6 +147,9 @@ export interface TtsResponse {
     duration: number; // 초
   }[];
   totalDuration: number;
+  voiceId?: string;
+  engine?: string; // 사용한 TTS 엔진
+  speed?: number;
   generatedAt: string;
 }
 
@@ -0,0 +1,56 @@
+import { test, expect } from '@playwright/test';
+import http from 'node:http';
+import type { AddressInfo } from 'node:net';
+
+// /api/render-video 프록시가 슬라이드 frameUrls를 백엔드로 그대로 전달하는지 확인
+// (백엔드 자리에 요청 본문을 기록하는 서버를 띄움 - 실제 백엔드가 포트를 쓰고 있으면 건너뜀)
+const backendUrl = new URL(process.env.NEXT_PUBLIC_FASTAPI_URL || 'http://localhost:8000');
+
+test('render-video forwards slide frameUrls to the backend', async ({ request }) => {
+  let received: any = null;
+  const backend = http.createServer((req, res) => {
+    let body = '';
+    req.on('data', (chunk) => (body += chunk));
+    req.on('end', () => {
+      if (req.url === '/api/render-video') {
+        received = JSON.parse(body);
+      }
+      res.writeHead(200, { 'Content-Type': 'application/json' });
+      res.end(JSON.stringify({ success: true, data: { projectId: 'p1', videoUrl: '/media/p1.mp4' } }));
+    });
+  });
+
+  const listening = await new Promise<boolean>((resolve) => {
+    backend.once('error', () => resolve(false));
+    backend.listen(Number(backendUrl.port || 80), backendUrl.hostname, () => resolve(true));
+  });
+  test.skip(!listening, `백엔드 포트 ${backendUrl.port} 사용 중`);
+
+  try {
+    const frameUrls = {
+      '1080p': '/media/p1/frames/slide_1_1080p.png',
+      '720p': '/media/p1/frames/slide_1_720p.png',
+      thumbnail: '/media/p1/frames/slide_1_thumb.png',
+    };
+    const response = await request.post('/api/render-video', {
+      data: {
+        projectId: 'p1',
+        slides: [
+          { slideId: 's1', slideNumber: 1, title: '제목', content: '내용', imageUrls: ['/media/p1/logo.png'], frameUrls },
+          { slideId: 's2', slideNumber: 2, content: '프레임 없음', imageUrls: [] },
+        ],
+        audioUrls: [
+          { slideId: 's1', slideNumber: 1, audioUrl: 'data:audio/mpeg;base64,AA==', duration: 3 },
+          { slideId: 's2', slideNumber: 2, audioUrl: 'data:audio/mpeg;base64,AA==', duration: 3 },
+        ],
+      },
+    });
+
+    expect(response.ok()).toBeTruthy();
+    expect(received).not.toBeNull();
+    expect(received.slides[0].frameUrls).toEqual(frameUrls);
+    expect(received.slides[1].frameUrls).toEqual({});
+  } finally {
+    await new Promise((resolve) => backend.close(resolve));
+  }
+});